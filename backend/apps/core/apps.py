@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Núcleo'
+
+    def ready(self):
+        from . import schema  # noqa: F401
+        from . import sqlite
+        sqlite.install()
@@ -0,0 +1,11 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .metrics import timed_phase
+
+
+class TimedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication que registra su duración en la fase ``auth`` de Server-Timing."""
+
+    def authenticate(self, request):
+        with timed_phase('auth'):
+            return super().authenticate(request)
@@ -0,0 +1,277 @@
+"""
+Generador de carga en proceso para medir los endpoints de la API.
+
+Las peticiones se entregan directamente a las aplicaciones de
+``config/wsgi.py`` y ``config/asgi.py``, sin servidor HTTP de por medio, con
+N clientes concurrentes: hilos para WSGI y tareas asyncio para ASGI. Las
+consultas SQL se atribuyen a cada petición con un ``ContextVar``, que Django
+propaga también a los hilos de ``sync_to_async``.
+"""
+
+import asyncio
+import contextvars
+import io
+import itertools
+import json
+import math
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_current_sample = contextvars.ContextVar('benchmark_sample', default=None)
+
+
+class Scenario:
+    """
+    Un endpoint a medir.
+
+    ``build(i)`` devuelve ``(method, path, data, headers)`` para la i-ésima
+    petición, de modo que cada escenario puede rotar páginas, términos de
+    búsqueda o vendedores. ``expected`` son los códigos considerados éxito.
+    """
+
+    def __init__(self, name, build, expected=(200,)):
+        self.name = name
+        self.build = build
+        self.expected = expected
+
+
+def _count_queries(execute, sql, params, many, context):
+    sample = _current_sample.get()
+    if sample is not None:
+        sample['queries'] += 1
+    return execute(sql, params, many, context)
+
+
+def _install_counter(sender=None, connection=None, **kwargs):
+    if _count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_queries)
+
+
+def install_query_counter():
+    """
+    Contar consultas en todas las conexiones, de cualquier hilo.
+
+    Las conexiones son locales a cada hilo, así que el contador se agrega al
+    abrirse cada una (señal ``connection_created``) y a las ya abiertas.
+    """
+    connection_created.connect(_install_counter, dispatch_uid='benchmark_query_counter')
+    for connection in connections.all(initialized_only=True):
+        _install_counter(connection=connection)
+
+
+def _encode(data):
+    return json.dumps(data).encode() if data is not None else b''
+
+
+def _wsgi_environ(method, path, body, headers):
+    url = urlsplit(path)
+    environ = {
+        'REQUEST_METHOD': method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_HOST': 'localhost',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    if body:
+        environ['CONTENT_TYPE'] = 'application/json'
+    for name, value in headers.items():
+        environ['HTTP_' + name.upper().replace('-', '_')] = value
+    return environ
+
+
+def _call_wsgi(application, method, path, data, headers):
+    """Ejecutar una petición WSGI y devolver ``(status, bytes del cuerpo)``."""
+    statuses = []
+
+    def start_response(status, response_headers, exc_info=None):
+        statuses.append(int(status.split()[0]))
+
+    result = application(_wsgi_environ(method, path, _encode(data), headers), start_response)
+    try:
+        # Consumir el cuerpo completo (incluye respuestas en streaming)
+        size = sum(len(chunk) for chunk in result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return statuses[0], size
+
+
+async def _call_asgi(application, method, path, data, headers):
+    """Ejecutar una petición ASGI y devolver ``(status, bytes del cuerpo)``."""
+    url = urlsplit(path)
+    body = _encode(data)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': url.path,
+        'raw_path': url.path.encode(),
+        'query_string': url.query.encode(),
+        'root_path': '',
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+        'headers': [(b'host', b'localhost')] + [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()
+        ] + ([
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ] if body else []),
+    }
+    pending = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    finished = asyncio.Event()
+    response = {'status': None, 'size': 0}
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        # Django espera una desconexión mientras procesa; llega al terminar
+        await finished.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            response['size'] += len(message.get('body', b''))
+            if not message.get('more_body'):
+                finished.set()
+
+    await application(scope, receive, send)
+    finished.set()
+    return response['status'], response['size']
+
+
+def _record(samples, scenario, started, sample, status, size):
+    sample['latency'] = time.perf_counter() - started
+    sample['status'] = status
+    sample['size'] = size
+    sample['ok'] = status in scenario.expected
+    samples.append(sample)
+
+
+def run_wsgi(application, scenario, total, concurrency):
+    """Enviar ``total`` peticiones con ``concurrency`` hilos."""
+    samples = []
+    counter = itertools.count()
+
+    def worker():
+        while (i := next(counter)) < total:
+            method, path, data, headers = scenario.build(i)
+            sample = {'queries': 0, 'method': method}
+            token = _current_sample.set(sample)
+            started = time.perf_counter()
+            try:
+                status, size = _call_wsgi(application, method, path, data, headers)
+            except Exception:
+                status, size = None, 0
+            finally:
+                _current_sample.reset(token)
+            _record(samples, scenario, started, sample, status, size)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return samples, time.perf_counter() - started
+
+
+def run_asgi(application, scenario, total, concurrency):
+    """Enviar ``total`` peticiones con ``concurrency`` tareas asyncio."""
+    samples = []
+    counter = itertools.count()
+
+    async def worker():
+        while (i := next(counter)) < total:
+            method, path, data, headers = scenario.build(i)
+            sample = {'queries': 0, 'method': method}
+            _current_sample.set(sample)
+            started = time.perf_counter()
+            try:
+                status, size = await _call_asgi(application, method, path, data, headers)
+            except Exception:
+                status, size = None, 0
+            _record(samples, scenario, started, sample, status, size)
+
+    async def main():
+        # Cada tarea tiene su propia copia del contexto, así que el
+        # ContextVar no se comparte entre clientes concurrentes.
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    return samples, time.perf_counter() - started
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _latency_summary(samples):
+    latencies = sorted(s['latency'] * 1000 for s in samples)
+
+    def ms(value):
+        return round(value, 3) if value is not None else None
+
+    return {
+        'mean': ms(sum(latencies) / len(latencies)) if latencies else None,
+        'p50': ms(percentile(latencies, 50)),
+        'p95': ms(percentile(latencies, 95)),
+        'p99': ms(percentile(latencies, 99)),
+        'max': ms(latencies[-1]) if latencies else None,
+    }
+
+
+def summarize(samples, elapsed):
+    """
+    Resumen de latencia, throughput y consultas de una serie de muestras.
+
+    Si el escenario mezcla métodos (lecturas y escrituras), ``by_method``
+    separa el throughput y la latencia de cada uno sobre el mismo intervalo.
+    """
+    count = len(samples)
+    summary = {
+        'requests': count,
+        'errors': sum(1 for s in samples if not s['ok']),
+        'status_codes': dict(Counter(str(s['status']) for s in samples)),
+        'elapsed_s': round(elapsed, 3),
+        'requests_per_second': round(count / elapsed, 1) if elapsed else None,
+        'latency_ms': _latency_summary(samples),
+        'queries_per_request': round(sum(s['queries'] for s in samples) / count, 2) if count else None,
+        'bytes_per_request': round(sum(s['size'] for s in samples) / count) if count else None,
+    }
+    methods = sorted({s['method'] for s in samples})
+    if len(methods) > 1:
+        summary['by_method'] = {}
+        for method in methods:
+            subset = [s for s in samples if s['method'] == method]
+            summary['by_method'][method] = {
+                'requests': len(subset),
+                'errors': sum(1 for s in subset if not s['ok']),
+                'requests_per_second': round(len(subset) / elapsed, 1) if elapsed else None,
+                'latency_ms': _latency_summary(subset),
+            }
+    return summary
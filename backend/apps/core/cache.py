@@ -0,0 +1,145 @@
+"""
+Caché versionada para las lecturas públicas del catálogo.
+
+Cada respuesta se guarda bajo una clave que incluye la versión del catálogo
+(global o por vendedor). Las escrituras no borran entradas: solo incrementan
+la versión, de modo que las claves anteriores dejan de consultarse y expiran
+solas. Junto a cada versión se guarda el momento en que cambió, que es el
+``Last-Modified`` de las respuestas (ver ``apps.core.conditional``). Usa el
+framework de caché de Django (CACHES['default']).
+"""
+
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+GLOBAL_VERSION_KEY = 'catalog:v:global'
+VENDOR_VERSION_KEY = 'catalog:v:vendor:{}'
+# La incrementa sync_replicas cuando las réplicas reciben cambios
+REPLICA_VERSION_KEY = 'catalog:v:replica'
+# Momento (epoch) del último cambio de cada versión
+MODIFIED_KEY = '{}:at'
+
+
+def _initial_version():
+    # Basada en el reloj: si la clave se pierde (desalojo, reinicio), la nueva
+    # versión nunca coincide con una anterior y no revive entradas viejas.
+    return time.time_ns()
+
+
+def _current_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_catalog_version(vendor_id=None):
+    """
+    Versión vigente del catálogo global o de un vendedor.
+
+    Con réplicas de lectura incluye además la versión de réplica (ver
+    ``apps.core.replicas.sync_replicas``).
+    """
+    key = GLOBAL_VERSION_KEY if vendor_id is None else VENDOR_VERSION_KEY.format(vendor_id)
+    version = _current_version(key)
+    if settings.DATABASE_REPLICAS:
+        return f'{version}.{_current_version(REPLICA_VERSION_KEY)}'
+    return version
+
+
+def _modified_at(key):
+    modified = cache.get(MODIFIED_KEY.format(key))
+    if modified is None:
+        # Sin registro (primera lectura o clave desalojada): ahora, que es
+        # posterior a cualquier cambio y nunca produce un 304 indebido
+        cache.add(MODIFIED_KEY.format(key), time.time(), timeout=None)
+        modified = cache.get(MODIFIED_KEY.format(key))
+    return modified
+
+
+def get_catalog_modified(vendor_id=None):
+    """Momento del último cambio del catálogo global o de un vendedor (epoch)."""
+    keys = [GLOBAL_VERSION_KEY if vendor_id is None else VENDOR_VERSION_KEY.format(vendor_id)]
+    if settings.DATABASE_REPLICAS:
+        keys.append(REPLICA_VERSION_KEY)
+    return max(_modified_at(key) for key in keys)
+
+
+def bump_version(key):
+    """Incrementar una versión y registrar el momento del cambio."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), timeout=None)
+    # Después de la versión: quien lea entre ambos pasos recibe la versión
+    # nueva con la fecha anterior, lo que a lo sumo provoca una descarga más
+    cache.set(MODIFIED_KEY.format(key), time.time(), timeout=None)
+
+
+def bump_catalog_version(vendor_id=None):
+    """
+    Invalidar las respuestas del catálogo global (y del vendedor indicado).
+
+    Se ejecuta al confirmar la transacción para que ninguna lectura guarde
+    en caché datos aún sin confirmar bajo la versión nueva.
+    """
+    def bump():
+        bump_version(GLOBAL_VERSION_KEY)
+        if vendor_id is not None:
+            bump_version(VENDOR_VERSION_KEY.format(vendor_id))
+
+    transaction.on_commit(bump)
+
+
+def normalized_request_key(request):
+    """Host, ruta y query string con los parámetros ordenados."""
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    )
+    return f'{request.get_host()}|{request.path}|{urlencode(params)}'
+
+
+def build_cache_key(request, version):
+    """Clave a partir de la petición normalizada y la versión del catálogo."""
+    digest = hashlib.sha1(normalized_request_key(request).encode()).hexdigest()
+    return f'catalog:resp:{version}:{digest}'
+
+
+def cache_catalog_response(vendor_kwarg=None, anonymous_only=True):
+    """
+    Cachear ``response.data`` de una acción GET para usuarios anónimos.
+
+    Con ``vendor_kwarg`` la clave usa la versión del vendedor indicado en
+    ese kwarg de la URL; si no, la versión global del catálogo. Con
+    ``anonymous_only=False`` se cachea también para usuarios autenticados
+    (solo para respuestas que no dependen del usuario).
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapped(self, request, *args, **kwargs):
+            if request.method != 'GET' or (anonymous_only and request.user.is_authenticated):
+                return view_method(self, request, *args, **kwargs)
+
+            vendor_id = kwargs.get(vendor_kwarg) if vendor_kwarg else None
+            key = build_cache_key(request, get_catalog_version(vendor_id))
+            data = cache.get(key)
+            if data is not None:
+                return Response(data, headers={'X-Cache': 'HIT'})
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,72 @@
+"""
+GET condicional (ETag / Last-Modified) para los endpoints del catálogo.
+
+Los validadores salen de la caché, sin consultas SQL: el ETag es un hash
+de la petición normalizada y la versión del catálogo (la misma que usa la
+caché de respuestas, que cambia con cada escritura), y ``Last-Modified`` es
+el momento del último cambio de esa versión (``get_catalog_modified``), que
+avanza también cuando una fila sale del resultado o cambia un contador. Su
+resolución es de un segundo; ``If-None-Match`` no tiene esa limitación. Si
+el cliente ya tiene la versión vigente se responde ``304 Not Modified`` sin
+ejecutar la vista.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .cache import get_catalog_modified, get_catalog_version, normalized_request_key
+
+
+def compute_validators(request, version, modified):
+    """Devolver ``(etag, last_modified)`` de la petición con la versión dada."""
+    seed = '|'.join([
+        normalized_request_key(request),
+        request.META.get('HTTP_ACCEPT', ''),
+        str(version),
+    ])
+    etag = '"%s"' % hashlib.sha1(seed.encode()).hexdigest()
+    return etag, int(modified)
+
+
+def _set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Permitir guardar la respuesta, pero revalidar siempre
+    patch_cache_control(response, no_cache=True)
+
+
+def conditional_catalog_response(vendor_kwarg=None):
+    """
+    Agregar ETag y Last-Modified a una acción GET y responder 304 si aplica.
+
+    Con ``vendor_kwarg`` se usa la versión del vendedor indicado en ese kwarg
+    de la URL, como en ``cache_catalog_response``; si no, la global.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapped(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_method(self, request, *args, **kwargs)
+
+            vendor_id = kwargs.get(vendor_kwarg) if vendor_kwarg else None
+            etag, last_modified = compute_validators(
+                request, get_catalog_version(vendor_id), get_catalog_modified(vendor_id)
+            )
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if not_modified is not None:
+                # El 304 lleva los mismos validadores que la respuesta completa
+                if not_modified.status_code == 304:
+                    _set_validators(not_modified, etag, last_modified)
+                return not_modified
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                _set_validators(response, etag, last_modified)
+            return response
+        return wrapped
+    return decorator
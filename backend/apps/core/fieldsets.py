@@ -0,0 +1,189 @@
+"""
+Fieldsets parciales para las lecturas: ``?fields=id,name,price`` devuelve
+solo esos campos y ``?omit=description`` todos menos esos.
+
+Además de quitar los campos del serializer, el queryset se restringe con
+``.only()`` a las columnas que esos campos leen (incluidas las de las
+relaciones anidadas), así que las columnas omitidas no se leen de la base.
+Los nombres desconocidos responden 400 con la lista de campos disponibles.
+"""
+
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+@lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    """Nombres de los campos de lectura del serializer, en su orden."""
+    return tuple(name for name, field in serializer_class().fields.items() if not field.write_only)
+
+
+def _split(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def select_fields(request, available):
+    """
+    Campos pedidos con ``fields``/``omit``, en el orden de ``available``.
+
+    Devuelve ``None`` si la petición no usa ninguno de los dos parámetros.
+    """
+    params = request.query_params
+    if FIELDS_PARAM not in params and OMIT_PARAM not in params:
+        return None
+
+    requested = _split(params.get(FIELDS_PARAM, ''))
+    omitted = _split(params.get(OMIT_PARAM, ''))
+    errors = {}
+    for param, names in ((FIELDS_PARAM, requested), (OMIT_PARAM, omitted)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = (
+                f"Campos desconocidos: {', '.join(unknown)}. "
+                f"Disponibles: {', '.join(available)}."
+            )
+    if errors:
+        raise ValidationError(errors)
+
+    selected = [
+        name for name in available
+        if (not requested or name in requested) and name not in omitted
+    ]
+    if not selected:
+        raise ValidationError({OMIT_PARAM: 'La respuesta debe incluir al menos un campo.'})
+    return selected
+
+
+def fieldset_columns(serializer, names, prefix=''):
+    """
+    Columnas (para ``.only()``) que leen los campos ``names`` del serializer.
+
+    Sigue los ``source`` con puntos y los serializers anidados. Devuelve
+    ``None`` si algún campo no corresponde a una columna (propiedades,
+    métodos, relaciones múltiples): en ese caso no se restringe el queryset.
+    """
+    model = serializer.Meta.model
+    columns = [prefix + model._meta.pk.name]
+    for name in names:
+        field = serializer.fields[name]
+        if isinstance(field, ListSerializer):
+            return None
+        path = _source_path(model, field.source_attrs)
+        if path is None:
+            return None
+        if isinstance(field, BaseSerializer):
+            nested = fieldset_columns(field, readable_fields(type(field)), f'{prefix}{path}__')
+            if nested is None:
+                return None
+            columns.extend(nested)
+        else:
+            columns.append(prefix + path)
+    return columns
+
+
+def _source_path(model, attrs):
+    """``['vendor', 'business_name']`` -> ``'vendor__business_name'`` si son campos del modelo."""
+    for index, attr in enumerate(attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        last = index == len(attrs) - 1
+        if model_field.many_to_many or model_field.one_to_many:
+            return None
+        if model_field.is_relation:
+            # Solo relaciones hacia adelante (FK / OneToOne) se pueden seguir con .only()
+            if not model_field.concrete:
+                return None
+            model = model_field.related_model
+        elif not last or not model_field.concrete:
+            return None
+    return '__'.join(attrs)
+
+
+@lru_cache(maxsize=256)
+def _columns_for(serializer_class, fields):
+    return fieldset_columns(serializer_class(), fields)
+
+
+def restrict_queryset(queryset, columns):
+    """``.only()`` con las columnas y ``select_related`` de las relaciones que recorren."""
+    relations = set()
+    for column in columns:
+        parts = column.split('__')[:-1]
+        for depth in range(1, len(parts) + 1):
+            relations.add('__'.join(parts[:depth]))
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*sorted(relations))
+    return queryset.only(*columns)
+
+
+def fieldset_parameters(serializer_class):
+    """Parámetros ``fields``/``omit`` para ``extend_schema`` de una lectura."""
+    available = ', '.join(readable_fields(serializer_class))
+    return [
+        OpenApiParameter(
+            name=FIELDS_PARAM, type=OpenApiTypes.STR,
+            description=(
+                'Campos a incluir, separados por comas (el resto no se lee ni se '
+                f'devuelve). Disponibles: {available}.'
+            ),
+        ),
+        OpenApiParameter(
+            name=OMIT_PARAM, type=OpenApiTypes.STR,
+            description=f'Campos a omitir, separados por comas. Disponibles: {available}.',
+        ),
+    ]
+
+
+class SparseFieldsetMixin:
+    """
+    Soporte de ``?fields=``/``?omit=`` para las acciones de lectura de un ViewSet.
+
+    ``get_serializer`` quita los campos no pedidos y ``get_queryset`` aplica
+    ``.only()`` en las acciones de ``sparse_fieldset_actions``. Las acciones
+    con su propio queryset usan ``apply_sparse_fieldset()``, y las que no usan
+    ``get_serializer``, ``get_sparse_fields()``.
+    """
+
+    sparse_fieldset_actions = ('list', 'retrieve')
+
+    def get_sparse_fields(self):
+        """Campos pedidos para la acción actual, o ``None`` si no aplica."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None
+            if self.action in self.sparse_fieldset_actions:
+                self._sparse_fields = select_fields(
+                    self.request, readable_fields(self.get_serializer_class())
+                )
+        return self._sparse_fields
+
+    def get_queryset(self):
+        return self.apply_sparse_fieldset(super().get_queryset())
+
+    def apply_sparse_fieldset(self, queryset):
+        """Restringir ``queryset`` a las columnas de los campos pedidos."""
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        columns = _columns_for(self.get_serializer_class(), tuple(fields))
+        return queryset if columns is None else restrict_queryset(queryset, columns)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in fields:
+                    target.fields.pop(name)
+        return serializer
@@ -0,0 +1,284 @@
+import json
+import logging
+import platform
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from apps.core import benchmark
+from apps.core.benchmark import Scenario
+from apps.products.management.commands.gen_dataset import SYNTHETIC_DOMAIN, SYNTHETIC_PASSWORD
+from apps.products.models import Product
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+SEARCH_TERMS = ['cafe', 'mochila artesanal', 'panela', 'hamaca wayuu', 'chocolate huila', 'ruana']
+FILTERS = [
+    'category=Alimentos&ordering=price',
+    'category=Artesan%C3%ADas&ordering=-created_at',
+    'category=Ropa&ordering=name',
+    'vendor={vendor}&ordering=-price',
+]
+# Páginas que recorren los escenarios de listado (menos si el dataset no las tiene)
+MAX_PAGES = 20
+# En products-mixed, una de cada WRITE_EVERY peticiones descuenta stock
+WRITE_EVERY = 4
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide latencia (p50/p95/p99), peticiones por segundo y consultas por '
+        'petición de los endpoints principales, en proceso, sobre WSGI y ASGI. '
+        'Usar una base separada (SQLITE_PATH): el escenario de creación escribe productos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--server', choices=['wsgi', 'asgi', 'all'], default='all',
+            help='Aplicación a medir (por defecto ambas).'
+        )
+        parser.add_argument('--concurrency', type=int, default=8, help='Clientes concurrentes.')
+        parser.add_argument('--requests', type=int, default=200, help='Peticiones por escenario.')
+        parser.add_argument('--warmup', type=int, default=10, help='Peticiones previas no medidas.')
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Limitar a un escenario (repetible). Por defecto todos.'
+        )
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help='Medir sin la caché del catálogo (DummyCache).'
+        )
+        parser.add_argument('--output', help="Archivo JSON de resultados ('-' para stdout).")
+        parser.add_argument('--baseline', help='JSON de una ejecución anterior para comparar.')
+        parser.add_argument(
+            '--generate', action='store_true',
+            help='Aplicar migraciones y generar el dataset si la base no lo tiene.'
+        )
+        parser.add_argument('--users', type=int, default=2000, help='Usuarios para --generate.')
+        parser.add_argument('--vendors', type=int, default=500, help='Vendedores para --generate.')
+        parser.add_argument(
+            '--products-per-vendor', type=int, default=100,
+            help='Productos promedio por vendedor para --generate.'
+        )
+
+    def handle(self, *args, **options):
+        if options['generate']:
+            self.generate(options)
+        if not Product.objects.exists():
+            raise CommandError(
+                'La base no tiene productos. Usa --generate o ejecuta gen_dataset antes.'
+            )
+
+        scenarios = self.build_scenarios()
+        if options['scenarios']:
+            unknown = set(options['scenarios']) - {s.name for s in scenarios}
+            if unknown:
+                raise CommandError(f"Escenarios desconocidos: {', '.join(sorted(unknown))}.")
+            scenarios = [s for s in scenarios if s.name in options['scenarios']]
+
+        servers = ['wsgi', 'asgi'] if options['server'] == 'all' else [options['server']]
+        cache_settings = (
+            {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+            if options['no_cache'] else settings.CACHES
+        )
+
+        benchmark.install_query_counter()
+        # Los 4xx esperados ya se cuentan como errores en el resumen
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        results = []
+        with override_settings(CACHES=cache_settings):
+            for server in servers:
+                application, run = self.load_server(server)
+                for scenario in scenarios:
+                    if options['warmup']:
+                        run(application, scenario, options['warmup'], options['concurrency'])
+                    samples, elapsed = run(
+                        application, scenario, options['requests'], options['concurrency']
+                    )
+                    result = {'server': server, 'scenario': scenario.name}
+                    result.update(benchmark.summarize(samples, elapsed))
+                    results.append(result)
+                    self.print_result(result)
+
+        report = {'meta': self.metadata(options), 'results': results}
+        if options['baseline']:
+            self.compare(results, options['baseline'])
+        if options['output'] == '-':
+            self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+        elif options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['output']}."))
+
+    def generate(self, options):
+        call_command('migrate', verbosity=0)
+        if User.objects.filter(email__endswith=f'@{SYNTHETIC_DOMAIN}').exists():
+            return
+        call_command(
+            'gen_dataset', users=options['users'], vendors=options['vendors'],
+            products_per_vendor=options['products_per_vendor'], stdout=self.stdout,
+        )
+
+    def load_server(self, server):
+        if server == 'wsgi':
+            from config.wsgi import application
+            return application, benchmark.run_wsgi
+        from config.asgi import application
+        return application, benchmark.run_asgi
+
+    def build_scenarios(self):
+        """Escenarios sobre datos reales de la base (vendedores, usuario vendedor)."""
+        vendor_ids = list(
+            Vendor.objects.filter(active_products_count__gt=0)
+            .order_by('-active_products_count').values_list('pk', flat=True)[:50]
+        )
+        user = (
+            User.objects.filter(email__endswith=f'@{SYNTHETIC_DOMAIN}', vendor_profile__isnull=False)
+            .order_by('pk').first()
+        )
+        if user is None or not vendor_ids:
+            raise CommandError('No hay un usuario vendedor sintético; genera el dataset con gen_dataset.')
+        stocked_ids = list(
+            Product.objects.filter(is_active=True, stock__gt=0)
+            .order_by('-stock').values_list('pk', flat=True)[:200]
+        )
+        # Páginas existentes: pedir una más allá de la última responde 404
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        product_pages = _page_count(Product.objects.filter(is_active=True).count(), page_size)
+        vendor_pages = _page_count(Vendor.objects.filter(is_active=True).count(), page_size)
+        # Tokens con los mismos claims que emite el login
+        access = CustomTokenObtainPairSerializer.get_token(user).access_token
+        auth = {'Authorization': f'Bearer {access}'}
+        run_id = int(time.time())
+
+        def get(path):
+            return 'GET', path, None, {}
+
+        def mixed(i):
+            # Lecturas del listado con escrituras de stock intercaladas
+            if i % WRITE_EVERY or not stocked_ids:
+                return get(f'/api/products/?page={i % product_pages + 1}')
+            return 'POST', '/api/products/stock/decrement/', {
+                'items': [{'product': stocked_ids[i // WRITE_EVERY % len(stocked_ids)], 'quantity': 1}],
+            }, auth
+
+        return [
+            Scenario('products-list', lambda i: get(f'/api/products/?page={i % product_pages + 1}')),
+            Scenario('products-search', lambda i: get(
+                f'/api/products/?search={SEARCH_TERMS[i % len(SEARCH_TERMS)]}'
+            )),
+            Scenario('products-filter', lambda i: get(
+                '/api/products/?' + FILTERS[i % len(FILTERS)].format(vendor=vendor_ids[i % len(vendor_ids)])
+            )),
+            Scenario('products-cursor', lambda i: get('/api/products/?pagination=cursor&ordering=price')),
+            Scenario('products-by-vendor', lambda i: get(
+                f'/api/products/by-vendor/{vendor_ids[i % len(vendor_ids)]}/'
+            )),
+            Scenario('vendors-list', lambda i: get(f'/api/vendors/?page={i % vendor_pages + 1}')),
+            Scenario('token-obtain', lambda i: (
+                'POST', '/api/users/token/', {'email': user.email, 'password': SYNTHETIC_PASSWORD}, {}
+            )),
+            # Cada refresh token sirve una vez (se revoca al rotar)
+            Scenario('token-refresh', lambda i: (
+                'POST', '/api/users/token/refresh/',
+                {'refresh': str(CustomTokenObtainPairSerializer.get_token(user))}, {}
+            )),
+            Scenario('product-create', lambda i: ('POST', '/api/products/', {
+                'name': f'Producto benchmark {run_id}-{i}',
+                'description': 'Producto creado por el benchmark.',
+                'price': '25000.00',
+                'stock': 10,
+                'category': 'Alimentos',
+            }, auth), expected=(201,)),
+            # 409 = sin stock suficiente: la escritura se resolvió igual
+            Scenario('products-mixed', mixed, expected=(200, 409)),
+        ]
+
+    def metadata(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'cache': 'disabled' if options['no_cache'] else settings.CACHES['default']['BACKEND'],
+            'concurrency': options['concurrency'],
+            'requests_per_scenario': options['requests'],
+            'dataset': {
+                'users': User.objects.count(),
+                'vendors': Vendor.objects.count(),
+                'products': Product.objects.count(),
+                'active_products': Product.objects.filter(is_active=True).count(),
+            },
+        }
+
+    def print_result(self, result):
+        latency = result['latency_ms']
+        self.stdout.write(
+            f"{result['server']:<5} {result['scenario']:<20} "
+            f"{result['requests_per_second']:>8.1f} req/s  "
+            f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+            f"p99 {latency['p99']:>8.2f} ms  {result['queries_per_request']:>5.1f} q/req  "
+            f"{result['errors']} errores"
+        )
+        for method, detail in result.get('by_method', {}).items():
+            self.stdout.write(
+                f"{'':<5} {'  ' + method:<20} "
+                f"{detail['requests_per_second']:>8.1f} req/s  "
+                f"p50 {detail['latency_ms']['p50']:>8.2f} ms  p95 {detail['latency_ms']['p95']:>8.2f} ms  "
+                f"p99 {detail['latency_ms']['p99']:>8.2f} ms"
+            )
+
+    def compare(self, results, path):
+        """Comparar req/s y p95 con una ejecución anterior (mismo servidor y escenario)."""
+        with open(path) as fh:
+            baseline = {
+                (r['server'], r['scenario']): r for r in json.load(fh)['results']
+            }
+        self.stdout.write(f'\nComparación con {path}:')
+        for result in results:
+            before = baseline.get((result['server'], result['scenario']))
+            if before is None:
+                continue
+            rps = _change(before['requests_per_second'], result['requests_per_second'])
+            p95 = _change(before['latency_ms']['p95'], result['latency_ms']['p95'])
+            self.stdout.write(
+                f"{result['server']:<5} {result['scenario']:<20} req/s {rps:>+7.1f}%  p95 {p95:>+7.1f}%  "
+                f"q/req {before['queries_per_request']} -> {result['queries_per_request']}"
+            )
+            for method, detail in result.get('by_method', {}).items():
+                previous = before.get('by_method', {}).get(method)
+                if previous is None:
+                    continue
+                rps = _change(previous['requests_per_second'], detail['requests_per_second'])
+                p95 = _change(previous['latency_ms']['p95'], detail['latency_ms']['p95'])
+                self.stdout.write(
+                    f"{'':<5} {'  ' + method:<20} req/s {rps:>+7.1f}%  p95 {p95:>+7.1f}%"
+                )
+
+
+def _page_count(total, page_size):
+    """Páginas a recorrer: las que hay, entre 1 y ``MAX_PAGES``."""
+    return max(1, min(MAX_PAGES, -(-total // page_size)))
+
+
+def _change(before, after):
+    if not before or after is None:
+        return 0.0
+    return (after - before) * 100 / before
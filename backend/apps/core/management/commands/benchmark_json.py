@@ -0,0 +1,116 @@
+import io
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.parsers import ORJSONParser
+from apps.core.renderers import ORJSONRenderer, orjson
+from apps.products.listing import product_list
+from apps.products.models import Category, Product
+from apps.products.serializers import ProductListSerializer
+from apps.vendors.models import Vendor
+
+NAMES = ['Café de Huila', 'Mochila Wayuu', 'Panela orgánica', 'Hamaca de San Jacinto', 'Ruana boyacense']
+CATEGORIES = ['Alimentos', 'Artesanías', 'Ropa', 'Hogar']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara ProductListSerializer con la ruta rápida de listados y JSONRenderer/JSONParser '
+        'de DRF con los de orjson sobre un listado de productos (sin base de datos), y '
+        'verifica que la salida sea idéntica.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=1000, help='Productos en el listado.')
+        parser.add_argument('--repeat', type=int, default=50, help='Repeticiones por medición.')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del listado.')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson no está instalado; el renderer usa el JSON estándar.')
+
+        products = self.build_products(options['items'], options['seed'])
+        data = ProductListSerializer(products, many=True).data
+        # Las mismas filas como las entrega .values() en la ruta rápida de listados
+        rows = [
+            {
+                **{name: getattr(p, name) for name in product_list.columns},
+                'vendor_name': p.vendor.business_name,
+                'category_value': p.category.name if p.category else None,
+            }
+            for p in products
+        ]
+        if product_list.to_representation(rows) != data:
+            raise CommandError('La ruta rápida de listados difiere de ProductListSerializer.')
+        payload = {'count': len(data), 'next': None, 'previous': None, 'results': data}
+
+        expected = JSONRenderer().render(payload)
+        rendered = ORJSONRenderer().render(payload)
+        if rendered != expected:
+            raise CommandError('La salida de ORJSONRenderer difiere de la de JSONRenderer.')
+
+        self.stdout.write(
+            f"{options['items']} productos, {len(expected) / 1024:.1f} KiB, "
+            f"{options['repeat']} repeticiones (ms por operación):"
+        )
+        self.report('serialize', [
+            ('Serializer', lambda: ProductListSerializer(products, many=True).data),
+            ('ValuesSerializer', lambda: product_list.to_representation(rows)),
+        ], options['repeat'])
+        self.report('render', [
+            ('JSONRenderer', lambda: JSONRenderer().render(payload)),
+            ('ORJSONRenderer', lambda: ORJSONRenderer().render(payload)),
+        ], options['repeat'])
+        self.report('parse', [
+            ('JSONParser', lambda: _parse(JSONParser(), expected)),
+            ('ORJSONParser', lambda: _parse(ORJSONParser(), expected)),
+        ], options['repeat'])
+
+    def build_products(self, count, seed):
+        """Productos sin guardar, con precios ``Decimal`` y fechas en UTC con microsegundos."""
+        rng = random.Random(seed)
+        vendors = [Vendor(pk=n, business_name=f'Tienda {n} de Colombia') for n in range(1, 21)]
+        categories = [Category(pk=n, name=name) for n, name in enumerate(CATEGORIES, 1)] + [None]
+        base = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        return [
+            Product(
+                pk=n, vendor=rng.choice(vendors),
+                name=f'{rng.choice(NAMES)} {n}',
+                description='Producto colombiano auténtico, hecho a mano. ' * rng.randint(1, 4),
+                price=Decimal(rng.randint(1000, 9_999_999)) / 100,
+                stock=rng.randint(0, 500),
+                image=f'https://cdn.example.com/productos/{n}.jpg' if n % 3 else '',
+                category=rng.choice(categories),
+                created_at=base + timedelta(seconds=rng.randint(0, 30_000_000), microseconds=rng.randint(0, 999_999)),
+            )
+            for n in range(1, count + 1)
+        ]
+
+    def report(self, label, candidates, repeat):
+        results = []
+        for name, func in candidates:
+            func()
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                func()
+                samples.append((time.perf_counter() - started) * 1000)
+            results.append((name, min(samples), statistics.median(samples)))
+
+        baseline = results[0][2]
+        for name, best, median in results:
+            self.stdout.write(
+                f'  {label:<9} {name:<16} mejor {best:>8.3f}  mediana {median:>8.3f}  '
+                f'x{baseline / median:.1f}'
+            )
+
+
+def _parse(parser, body):
+    return parser.parse(io.BytesIO(body), parser_context={'encoding': 'utf-8'})
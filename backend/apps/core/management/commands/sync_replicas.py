@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.replicas import sync_replicas
+
+
+class Command(BaseCommand):
+    help = (
+        'Copia la base principal sobre las réplicas de lectura (SQLITE_REPLICA_PATHS) '
+        'con la API de backup de SQLite. Sin --interval sincroniza una vez (para cron); '
+        'con --interval queda sincronizando cada N segundos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Segundos entre sincronizaciones (0 = una sola vez).'
+        )
+        parser.add_argument(
+            '--database', action='append', dest='aliases',
+            help='Limitar a una réplica (repetible). Por defecto todas.'
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or settings.DATABASE_REPLICAS
+        unknown = set(aliases) - set(settings.DATABASE_REPLICAS)
+        if unknown:
+            raise CommandError(f"No son réplicas configuradas: {', '.join(sorted(unknown))}.")
+        if not aliases:
+            raise CommandError('No hay réplicas configuradas (SQLITE_REPLICA_PATHS).')
+
+        while True:
+            timings = sync_replicas(aliases)
+            self.stdout.write(self.style.SUCCESS(', '.join(
+                f'{alias} sincronizada en {seconds * 1000:.0f} ms' for alias, seconds in timings.items()
+            ) + '.'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
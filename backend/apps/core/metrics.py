@@ -0,0 +1,236 @@
+"""
+Instrumentación de rendimiento por petición.
+
+``RequestTimer`` mide las fases de una petición (SQL, autenticación JWT,
+serialización, renderizado y el resto de la aplicación) con tiempos
+exclusivos: el SQL ejecutado durante la autenticación cuenta en ``db`` y no
+en ``auth``, y el de las relaciones que se leen al serializar, tampoco en
+``serialize``.
+``MetricsRegistry`` acumula en memoria del proceso histogramas por ruta con
+buckets fijos, de modo que registrar una petición cuesta una búsqueda
+binaria y unas pocas sumas bajo un lock; los acumulados se calculan solo al
+exportar en formato de texto de Prometheus.
+"""
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+_current_timer = contextvars.ContextVar('request_timer', default=None)
+
+# Límites superiores de los buckets (le=...)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+PHASE_DESCRIPTIONS = {
+    'db': 'SQL',
+    'auth': 'Autenticación JWT',
+    'app': 'Vista',
+    'serialize': 'Serialización',
+    'render': 'Renderizado',
+    'total': 'Total',
+}
+
+
+def get_current_timer():
+    """``RequestTimer`` de la petición en curso (o ``None`` fuera de una)."""
+    return _current_timer.get()
+
+
+@contextmanager
+def timed_phase(name):
+    """Medir un bloque como la fase ``name`` de la petición en curso, si hay una."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
+
+
+class RequestTimer:
+    """Tiempos exclusivos por fase y número de consultas de una petición."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.queries = 0
+        self.total = None
+        # Fases abiertas: [nombre, inicio, tiempo de fases anidadas]
+        self._stack = []
+
+    def activate(self):
+        return _current_timer.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current_timer.reset(token)
+
+    def begin(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def end(self):
+        name, started, nested = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed - nested
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    @contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """Para ``connection.execute_wrapper``: cuenta y mide cada consulta."""
+        self.queries += 1
+        with self.phase('db'):
+            return execute(sql, params, many, context)
+
+    def finish(self):
+        while self._stack:
+            self.end()
+        self.total = time.perf_counter() - self.started
+        self.phases['app'] = max(0.0, self.total - sum(self.phases.values()))
+
+    def server_timing(self):
+        """Valor de la cabecera ``Server-Timing`` (duraciones en ms)."""
+        entries = []
+        for name in ('db', 'auth', 'app', 'serialize', 'render'):
+            if name in self.phases:
+                description = PHASE_DESCRIPTIONS[name]
+                if name == 'db':
+                    description = f'{description} ({self.queries})'
+                entries.append(f'{name};dur={self.phases[name] * 1000:.2f};desc="{description}"')
+        entries.append(f'total;dur={self.total * 1000:.2f}')
+        return ', '.join(entries)
+
+
+class Histogram:
+    """Histograma de buckets fijos (conteos no acumulados hasta exportar)."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        return list(self.counts), self.sum, self.count
+
+
+class RouteMetrics:
+    __slots__ = ('latency', 'queries', 'size', 'statuses', 'phases')
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statuses = {}
+        self.phases = {}
+
+
+class MetricsRegistry:
+    """
+    Métricas por ``(ruta, método)`` del proceso actual.
+
+    La ruta es el nombre de la URL resuelta (``product-list``), no el path,
+    para que la cardinalidad no crezca con los ids. Con varios workers cada
+    proceso tiene su propio registro.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, route, method, status, timer, size=None):
+        with self._lock:
+            metrics = self._routes.get((route, method))
+            if metrics is None:
+                metrics = self._routes[(route, method)] = RouteMetrics()
+            metrics.latency.observe(timer.total)
+            metrics.queries.observe(timer.queries)
+            if size is not None:
+                metrics.size.observe(size)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            for phase, seconds in timer.phases.items():
+                metrics.phases[phase] = metrics.phases.get(phase, 0.0) + seconds
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: (
+                    metrics.latency.snapshot(), metrics.queries.snapshot(),
+                    metrics.size.snapshot(), dict(metrics.statuses), dict(metrics.phases),
+                )
+                for key, metrics in self._routes.items()
+            }
+
+    def render_prometheus(self):
+        """Exportar en el formato de texto de Prometheus (versión 0.0.4)."""
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+
+        def histogram(name, help_text, buckets, index):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for (route, method), values in snapshot:
+                counts, total, count = values[index]
+                labels = f'route="{_escape(route)}",method="{method}"'
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f'{name}_sum{{{labels}}} {total:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {count}')
+
+        histogram(
+            'api_request_duration_seconds', 'Latencia de las peticiones por ruta.',
+            LATENCY_BUCKETS, 0
+        )
+        histogram('api_request_queries', 'Consultas SQL por petición.', QUERY_BUCKETS, 1)
+        histogram('api_response_size_bytes', 'Tamaño del cuerpo de la respuesta.', SIZE_BUCKETS, 2)
+
+        lines.append('# HELP api_requests_total Peticiones por ruta y código de estado.')
+        lines.append('# TYPE api_requests_total counter')
+        for (route, method), values in snapshot:
+            for status, count in sorted(values[3].items()):
+                lines.append(
+                    f'api_requests_total{{route="{_escape(route)}",method="{method}",'
+                    f'status="{status}"}} {count}'
+                )
+
+        lines.append('# HELP api_request_phase_seconds_total Tiempo acumulado por fase de la petición.')
+        lines.append('# TYPE api_request_phase_seconds_total counter')
+        for (route, method), values in snapshot:
+            for phase, seconds in sorted(values[4].items()):
+                lines.append(
+                    f'api_request_phase_seconds_total{{route="{_escape(route)}",method="{method}",'
+                    f'phase="{phase}"}} {seconds:.6f}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
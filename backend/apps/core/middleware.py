@@ -0,0 +1,49 @@
+from contextlib import ExitStack
+
+from django.db import connections
+
+from .metrics import RequestTimer, get_current_timer, registry
+
+
+class ServerTimingMiddleware:
+    """
+    Medir cada petición por fases y publicar ``Server-Timing``.
+
+    Debe ir primero en MIDDLEWARE para que ``total`` incluya al resto. Las
+    consultas se cuentan con ``execute_wrapper`` en todas las conexiones; la
+    autenticación la mide ``TimedJWTAuthentication`` y el renderizado, los
+    callbacks de la respuesta. Al terminar, la petición se registra en las
+    métricas de ``/api/metrics/``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = RequestTimer()
+        token = timer.activate()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(timer.execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            RequestTimer.deactivate(token)
+        timer.finish()
+
+        response['Server-Timing'] = timer.server_timing()
+        match = request.resolver_match
+        size = None if response.streaming else len(response.content)
+        registry.observe(
+            match.view_name if match else 'unmatched',
+            request.method, response.status_code, timer, size,
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # Las respuestas de DRF se renderizan después de este hook
+        timer = get_current_timer()
+        if timer is not None:
+            timer.begin('render')
+            response.add_post_render_callback(lambda rendered: timer.end())
+        return response
@@ -0,0 +1,210 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from operator import attrgetter
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre el ordenamiento del queryset.
+
+    El cursor guarda los valores de las columnas de ordenamiento del último
+    elemento de la página; la página siguiente se obtiene con
+    ``WHERE (a, id) > (:a, :id)`` en lugar de ``OFFSET``, sin ``COUNT(*)``.
+    El ``id`` se agrega siempre como desempate, así que los empates en
+    precio, nombre o stock no duplican ni saltan elementos.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        self.pk_name = queryset.model._meta.pk.name
+
+        values, reverse = self.decode_cursor(request)
+        self.has_cursor = values is not None
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [self._flip(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.build_filter(ordering, values))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.has_cursor
+
+        self.page = results
+        return results
+
+    def get_ordering(self, queryset):
+        """Ordenamiento efectivo, truncado en el primer campo único (pk)."""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        pk_names = {'pk', queryset.model._meta.pk.name}
+        for index, field in enumerate(ordering):
+            if field.lstrip('-') in pk_names:
+                return ordering[:index + 1]
+        # El desempate sigue la dirección del último campo para que
+        # ORDER BY pueda resolverse recorriendo un índice (a, id).
+        last = ordering[-1] if ordering else ''
+        return ordering + ['-pk' if last.startswith('-') else 'pk']
+
+    def build_filter(self, ordering, values):
+        """Expandir la comparación de tuplas en una disyunción de Q()."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def encode_cursor(self, obj, reverse):
+        values = [self._to_json(self.get_position(obj, field.lstrip('-'))) for field in self.ordering]
+        payload = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload['v']
+            reverse = bool(payload.get('r'))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def get_position(self, obj, name):
+        """Valor de una columna de ordenamiento en una instancia o en una fila de ``.values()``."""
+        if isinstance(obj, dict):
+            return obj[self.pk_name if name == 'pk' else name]
+        return attrgetter(name.replace('__', '.'))(obj)
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _to_json(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+
+class CatalogPagination(PageNumberPagination):
+    """
+    Paginación por número de página con modo keyset opcional.
+
+    Por defecto se comporta como PageNumberPagination. Con
+    ``?pagination=cursor`` (o cuando llega un ``?cursor=``) usa
+    KeysetPagination, cuyo costo por página no depende de la profundidad.
+    """
+
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def use_keyset(self, request):
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in params
+        )
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Usar "cursor" para paginación keyset (sin conteo total).',
+                'schema': {'type': 'string', 'enum': ['page', 'cursor']},
+            },
+            {
+                'name': self.keyset_class.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor de paginación keyset.',
+                'schema': {'type': 'string'},
+            },
+        ]
@@ -0,0 +1,33 @@
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer, orjson
+
+
+class ORJSONParser(JSONParser):
+    """
+    ``JSONParser`` sobre orjson para cuerpos UTF-8.
+
+    Si orjson rechaza el cuerpo, se reintenta con el parser estándar: acepta
+    lo que orjson no (enteros de más de 64 bits) y produce el mismo
+    ``ParseError`` que antes para el JSON inválido. Con otra codificación, o
+    con ``STRICT_JSON`` desactivado (orjson no acepta ``NaN``), se usa el
+    parser estándar directamente.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
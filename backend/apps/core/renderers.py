@@ -0,0 +1,53 @@
+"""
+Renderer JSON sobre orjson con la misma salida que ``JSONRenderer`` de DRF.
+
+Los serializers ya entregan ``Decimal`` y fechas como texto
+(``COERCE_DECIMAL_TO_STRING`` y ``DateTimeField`` en la zona horaria local);
+los valores que no son JSON nativo (``Decimal`` o fechas sueltas, textos
+perezosos, sets...) pasan por el encoder de DRF, igual que con ``json.dumps``.
+Si orjson no está instalado, si se pide indentación (API navegable,
+``application/json; indent=4``) o si orjson no puede con el dato (enteros de
+más de 64 bits), se usa el renderer estándar.
+
+Diferencias conocidas con ``json.dumps``: los floats con exponente se
+escriben ``1e16`` en lugar de ``1e+16`` y ``NaN``/``Infinity`` salen como
+``null`` en lugar de error. La API no emite floats (los precios son texto).
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia de requirements.txt
+    orjson = None
+
+ORJSON_OPTIONS = (
+    # Fechas por el encoder de DRF: milisegundos y 'Z' para UTC
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+# U+2028 y U+2029 en UTF-8; DRF los escapa para que el JSON sea JavaScript válido
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` que serializa con orjson cuando la salida es idéntica."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # El renderer estándar serializa lo que orjson no puede o lanza
+            # el mismo error que antes
+            return super().render(data, accepted_media_type, renderer_context)
+
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
@@ -0,0 +1,173 @@
+"""
+Lecturas del catálogo desde réplicas de solo lectura.
+
+Las réplicas son copias de la base principal (``DATABASE_REPLICAS``, ver
+``config/settings/base.py``) que ``sync_replicas`` actualiza con la API de
+backup de SQLite. El enrutamiento es por petición:
+
+- ``DatabaseRoutingMiddleware`` abre un estado de enrutamiento por petición.
+- ``ReplicaReadMixin`` elige una réplica para los métodos seguros de un
+  ViewSet, salvo que el usuario esté fijado a la principal.
+- ``PrimaryReplicaRouter`` manda las lecturas a la réplica elegida y todas
+  las escrituras a ``default``. Tras la primera escritura, el resto de la
+  petición lee de ``default``, y el usuario queda fijado a ``default``
+  ``DATABASE_REPLICA_PIN_SECONDS`` segundos para que vea lo que escribió
+  aunque la réplica aún no lo tenga.
+
+Fuera de una petición (comandos, shell) todo va a ``default``.
+"""
+
+import contextvars
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .cache import GLOBAL_VERSION_KEY, REPLICA_VERSION_KEY, bump_version
+
+PIN_KEY = 'db:pin:user:{}'
+# Versión global del catálogo incluida en la última sincronización
+SYNCED_VERSION_KEY = 'db:replicas:synced'
+
+_state = contextvars.ContextVar('db_routing', default=None)
+
+
+class RoutingState:
+    """Réplica elegida para la petición y si ya escribió en la principal."""
+
+    __slots__ = ('read_alias', 'wrote')
+
+    def __init__(self):
+        self.read_alias = None
+        self.wrote = False
+
+
+def pin_to_primary(user_id):
+    """Leer de ``default`` las próximas peticiones de este usuario."""
+    cache.set(PIN_KEY.format(user_id), 1, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return bool(cache.get(PIN_KEY.format(user_id)))
+
+
+def replica_aliases():
+    """
+    Réplicas configuradas que no son la misma base que ``default``.
+
+    En las pruebas cada réplica es un espejo de la base de pruebas: leerla
+    por otra conexión no vería los datos de la transacción de la prueba.
+    """
+    primary = connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+    return [
+        alias for alias in settings.DATABASE_REPLICAS
+        if connections[alias].settings_dict['NAME'] != primary
+    ]
+
+
+def read_from_replica(user):
+    """Elegir una réplica para las lecturas del resto de la petición, si corresponde."""
+    state = _state.get()
+    if state is None or state.wrote:
+        return
+    aliases = replica_aliases()
+    if not aliases or (user.is_authenticated and is_pinned(user.pk)):
+        return
+    state.read_alias = random.choice(aliases)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.wrote:
+            return None
+        return state.read_alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        # Explícito: un objeto leído de una réplica también se guarda en default
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema con la copia, no con migrate
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class DatabaseRoutingMiddleware:
+    """
+    Estado de enrutamiento por petición y fijación a la principal tras escribir.
+
+    La fijación usa el id del usuario autenticado por DRF, que se conoce
+    recién al volver de la vista.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        user = getattr(request, 'user', None)
+        if state.wrote and user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
+        return response
+
+
+class ReplicaReadMixin:
+    """Servir los métodos seguros de un ViewSet desde una réplica."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            read_from_replica(request.user)
+
+
+def sync_replica(alias):
+    """
+    Copiar ``default`` sobre la réplica ``alias`` y devolver los segundos que tomó.
+
+    La API de backup de SQLite escribe la copia en una sola transacción: los
+    lectores de la réplica (en WAL) siguen viendo la versión anterior hasta
+    que termina.
+    """
+    source, target = connections[DEFAULT_DB_ALIAS], connections[alias]
+    source.ensure_connection()
+    target.ensure_connection()
+    started = time.perf_counter()
+    source.connection.backup(target.connection)
+    return time.perf_counter() - started
+
+
+def sync_replicas(aliases=None):
+    """
+    Sincronizar las réplicas y devolver ``{alias: segundos}``.
+
+    Si el catálogo cambió desde la sincronización anterior se incrementa la
+    versión de réplica de la caché: una respuesta que se guardó leyendo una
+    réplica atrasada deja de usarse en cuanto la réplica se pone al día.
+    """
+    aliases = settings.DATABASE_REPLICAS if aliases is None else aliases
+    # Antes de copiar: una escritura durante la copia se detecta la próxima vez
+    version = cache.get(GLOBAL_VERSION_KEY)
+    timings = {alias: sync_replica(alias) for alias in aliases}
+    if version is None or version != cache.get(SYNCED_VERSION_KEY):
+        bump_version(REPLICA_VERSION_KEY)
+        cache.set(SYNCED_VERSION_KEY, version, timeout=None)
+    return timings
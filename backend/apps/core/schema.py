@@ -0,0 +1,8 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class TimedJWTScheme(SimpleJWTScheme):
+    """Documentar TimedJWTAuthentication como el esquema Bearer de Simple JWT."""
+
+    target_class = 'apps.core.authentication.TimedJWTAuthentication'
+    match_subclasses = True
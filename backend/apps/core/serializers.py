@@ -0,0 +1,31 @@
+"""
+Serializers base con la serialización medida en la fase ``serialize`` de
+Server-Timing (ver ``apps.core.metrics``).
+"""
+
+from rest_framework import serializers
+
+from .metrics import timed_phase
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """``ListSerializer`` que mide ``.data``; usar como ``Meta.list_serializer_class``."""
+
+    @property
+    def data(self):
+        with timed_phase('serialize'):
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Medir ``.data`` (la conversión a tipos nativos) como fase ``serialize``.
+
+    Con ``many=True`` DRF no pasa por el ``.data`` del hijo: el serializer
+    debe declarar ``list_serializer_class = TimedListSerializer`` en ``Meta``.
+    """
+
+    @property
+    def data(self):
+        with timed_phase('serialize'):
+            return super().data
@@ -0,0 +1,27 @@
+"""
+PRAGMA de ``SQLITE_PRAGMAS`` (ver ``config/settings/sqlite.py``) en cada
+conexión nueva de SQLite, con la señal ``connection_created``.
+
+Se ejecutan sobre la conexión de ``sqlite3`` directamente: no pasan por los
+``execute_wrappers`` de Django ni cuentan como consultas de la petición que
+abrió la conexión.
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def pragma_statements(pragmas):
+    """``PRAGMA nombre = valor`` por cada ajuste, en orden (journal_mode primero)."""
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    for statement in pragma_statements(settings.SQLITE_PRAGMAS):
+        connection.connection.execute(statement)
+
+
+def install():
+    connection_created.connect(configure_connection, dispatch_uid='sqlite_pragmas')
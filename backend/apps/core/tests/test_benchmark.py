@@ -0,0 +1,73 @@
+"""
+Comando ``benchmark``: una corrida mínima sobre un dataset sintético pequeño,
+el formato del JSON de resultados y la comparación con una corrida anterior.
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TransactionTestCase, override_settings
+
+RESULT_KEYS = {
+    'server', 'scenario', 'requests', 'errors', 'requests_per_second',
+    'latency_ms', 'queries_per_request',
+}
+
+
+# Los clientes del benchmark corren en otros hilos: los datos deben estar confirmados
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BenchmarkCommandTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        call_command('gen_dataset', users=3, vendors=2, products_per_vendor=15, no_demo=True, stdout=StringIO())
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def benchmark(self, **options):
+        options = {
+            'server': 'wsgi', 'scenarios': ['products-list'], 'requests': 6, 'warmup': 1,
+            'concurrency': 2, **options,
+        }
+        out = StringIO()
+        call_command('benchmark', stdout=out, **options)
+        return out.getvalue()
+
+    def report(self, out):
+        """El JSON de ``--output -`` va después de las líneas de resumen."""
+        return json.loads(out[out.index('\n{') + 1:])
+
+    def test_json_report(self):
+        report = self.report(self.benchmark(output='-'))
+        self.assertEqual(set(report), {'meta', 'results'})
+        self.assertEqual(report['meta']['requests_per_scenario'], 6)
+        self.assertEqual(report['meta']['dataset']['vendors'], 2)
+
+        [result] = report['results']
+        self.assertLessEqual(RESULT_KEYS, set(result))
+        self.assertEqual((result['server'], result['scenario']), ('wsgi', 'products-list'))
+        self.assertEqual((result['requests'], result['errors']), (6, 0))
+        self.assertEqual(result['status_codes'], {'200': 6})
+        self.assertLessEqual({'p50', 'p95', 'p99'}, set(result['latency_ms']))
+        self.assertGreater(result['requests_per_second'], 0)
+
+    def test_baseline_comparison(self):
+        path = os.path.join(self.tmp.name, 'baseline.json')
+        out = self.benchmark(output=path)
+        self.assertIn('Resultados guardados', out)
+        with open(path) as fh:
+            baseline = json.load(fh)
+
+        out = self.benchmark(baseline=path)
+        self.assertIn(f'Comparación con {path}:', out)
+        comparison = out.split('Comparación con', 1)[1]
+        self.assertRegex(comparison, r'wsgi\s+products-list\s+req/s\s+[+-]\d+\.\d%\s+p95')
+        self.assertIn(f"q/req {baseline['results'][0]['queries_per_request']} -> ", comparison)
+
+    def test_unknown_scenario(self):
+        with self.assertRaisesMessage(CommandError, 'Escenarios desconocidos: nada'):
+            self.benchmark(scenarios=['nada'])
@@ -0,0 +1,111 @@
+"""
+Caché versionada del catálogo: aciertos para anónimos, invalidación por
+versión al confirmar las escrituras y alcance por vendedor.
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.cache import GLOBAL_VERSION_KEY
+from apps.products.models import Product
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+def _vendor(name):
+    user = User.objects.create_user(
+        email=f'{name}@example.com', username=name, password='x',
+        first_name=name.title(), last_name='R'
+    )
+    return Vendor.objects.create(user=user, business_name=name.title())
+
+
+class CatalogCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = _vendor('cafetera')
+        cls.other = _vendor('tejedora')
+        cls.product = Product.objects.create(
+            vendor=cls.vendor, name='Café de Huila', description='Tostión media',
+            price=Decimal('45000'), stock=3
+        )
+        Product.objects.create(
+            vendor=cls.other, name='Mochila Wayuu', description='Tejida a mano',
+            price=Decimal('180000')
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def status(self, url):
+        return self.client.get(url).get('X-Cache')
+
+    def test_anonymous_reads_hit_the_cache(self):
+        for url in [
+            '/api/products/', f'/api/products/{self.product.pk}/',
+            f'/api/products/by-vendor/{self.vendor.pk}/', '/api/vendors/',
+            f'/api/vendors/{self.vendor.pk}/',
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(self.status(url), 'MISS')
+                self.assertEqual(self.status(url), 'HIT')
+
+    def test_query_parameter_order_does_not_matter(self):
+        self.assertEqual(self.status('/api/products/?ordering=price&page=1'), 'MISS')
+        self.assertEqual(self.status('/api/products/?page=1&ordering=price'), 'HIT')
+
+    def test_authenticated_reads_skip_the_cache(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.vendor.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertIsNone(self.status('/api/products/'))
+        self.assertIsNone(self.status('/api/products/'))
+
+    def test_writes_invalidate_on_commit(self):
+        url = f'/api/products/{self.product.pk}/'
+        self.status(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.price = Decimal('50000')
+            self.product.save()
+            # Hasta confirmar sigue vigente la versión anterior
+            self.assertEqual(self.status(url), 'HIT')
+
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['price'], '50000.00')
+
+    def test_vendor_writes_keep_other_vendors_cached(self):
+        own = f'/api/products/by-vendor/{self.vendor.pk}/'
+        other = f'/api/products/by-vendor/{self.other.pk}/'
+        self.status(own)
+        self.status(other)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.stock = 9
+            self.product.save()
+
+        self.assertEqual(self.status(own), 'MISS')
+        self.assertEqual(self.status(other), 'HIT')
+        self.assertEqual(self.status('/api/products/'), 'MISS')
+
+    def test_user_changes_invalidate_vendor(self):
+        url = f'/api/vendors/{self.vendor.pk}/'
+        self.status(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vendor.user.first_name = 'Ana'
+            self.vendor.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['user']['first_name'], 'Ana')
+
+    def test_lost_version_does_not_revive_old_entries(self):
+        self.status('/api/products/')
+        cache.delete(GLOBAL_VERSION_KEY)
+        self.assertEqual(self.status('/api/products/'), 'MISS')
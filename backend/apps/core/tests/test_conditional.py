@@ -0,0 +1,135 @@
+"""
+GET condicional del catálogo: ETag / Last-Modified y ids inválidos en la URL.
+"""
+
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date, parse_http_date
+from rest_framework.test import APIClient
+
+from apps.products.models import Category, Product
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+class ConditionalResponseTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='x',
+            first_name='María', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(user=user, business_name='Café del Eje', city='Armenia')
+        cls.product = Product.objects.create(
+            vendor=cls.vendor, name='Café de Huila', description='Tostión media',
+            price=Decimal('45000'), stock=3, category=Category.objects.create(name='Alimentos', slug='alimentos')
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_non_numeric_ids_are_not_found(self):
+        for url in ['/api/products/abc/', '/api/vendors/abc/', '/api/products/by-vendor/abc/']:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_if_none_match(self):
+        for url in [
+            '/api/products/', f'/api/products/{self.product.pk}/',
+            f'/api/products/by-vendor/{self.vendor.pk}/', '/api/vendors/',
+            f'/api/vendors/{self.vendor.pk}/',
+        ]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('no-cache', response['Cache-Control'])
+                etag = response['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(response.content, b'')
+
+    def later(self, seconds):
+        """Escribir "segundos después": Last-Modified tiene resolución de un segundo."""
+        return mock.patch('apps.core.cache.time.time', return_value=time.time() + seconds)
+
+    def test_if_modified_since(self):
+        url = f'/api/products/{self.product.pk}/'
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        earlier = http_date(parse_http_date(last_modified) - 300)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=earlier).status_code, 200)
+
+    def test_last_modified_advances_when_rows_leave(self):
+        others = [
+            Product.objects.create(
+                vendor=self.vendor, name=f'Panela {i}', description='Orgánica', price=Decimal('8000')
+            )
+            for i in range(2)
+        ]
+        urls = [f'/api/products/by-vendor/{self.vendor.pk}/', '/api/vendors/']
+        cache.clear()
+        last_modified = {url: self.client.get(url)['Last-Modified'] for url in urls}
+
+        # MAX(updated_at) de las filas restantes no cambia al desactivar ni
+        # al borrar, y el contador del vendedor no toca vendor.updated_at
+        with self.later(5), self.captureOnCommitCallbacks(execute=True):
+            others[0].is_active = False
+            others[0].save()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified[url])
+                self.assertEqual(response.status_code, 200)
+                last_modified[url] = response['Last-Modified']
+
+        with self.later(10), self.captureOnCommitCallbacks(execute=True):
+            others[1].delete()
+        response = self.client.get(urls[0], HTTP_IF_MODIFIED_SINCE=last_modified[urls[0]])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        response = self.client.get(urls[1], HTTP_IF_MODIFIED_SINCE=last_modified[urls[1]])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['products_count'], 1)
+
+    def test_etag_changes_after_write(self):
+        url = '/api/products/'
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.stock = 9
+            self.product.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_query(self):
+        self.assertNotEqual(
+            self.client.get('/api/products/?ordering=price')['ETag'],
+            self.client.get('/api/products/?ordering=-price')['ETag'],
+        )
+
+    def test_cache_hits_and_not_modified_run_no_sql(self):
+        for url in [
+            '/api/products/', f'/api/products/{self.product.pk}/',
+            f'/api/products/by-vendor/{self.vendor.pk}/', '/api/vendors/',
+            f'/api/vendors/{self.vendor.pk}/',
+        ]:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                    self.assertEqual(response['X-Cache'], 'HIT')
+                    self.assertEqual(response['ETag'], etag)
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                    self.assertEqual(response.status_code, 304)
+                self.assertEqual(len(queries), 0, [q['sql'] for q in queries])
@@ -0,0 +1,164 @@
+"""
+Fieldsets parciales (``?fields=``/``?omit=``): la respuesta solo trae los
+campos pedidos y la consulta solo lee sus columnas.
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.products.models import Category, Product
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+class SparseFieldsetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='x',
+            first_name='María', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(
+            user=user, business_name='Café del Eje', description='Tienda de café', city='Armenia'
+        )
+        cls.product = Product.objects.create(
+            vendor=cls.vendor, name='Café de Huila', description='Tostión media',
+            price=Decimal('45000'), stock=3, category=Category.objects.create(name='Alimentos', slug='alimentos'),
+            image='https://cdn.example.com/cafe.jpg'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, url):
+        """Devolver ``(respuesta, SQL de las consultas)``."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [q['sql'] for q in queries]
+
+    def data_query(self, queries, table):
+        """La consulta que lee las filas (no los COUNT/MAX de paginación y ETag)."""
+        selects = [sql for sql in queries if f'FROM "{table}"' in sql and 'COUNT(' not in sql]
+        self.assertEqual(len(selects), 1, queries)
+        return selects[0]
+
+    def test_product_list_fields(self):
+        response, queries = self.get('/api/products/?fields=id,name,price,image')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [{
+            'id': self.product.pk, 'name': 'Café de Huila',
+            'price': '45000.00', 'image': 'https://cdn.example.com/cafe.jpg',
+        }])
+        sql = self.data_query(queries, 'products_product')
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('JOIN', sql)
+
+    def test_product_list_omit(self):
+        response, queries = self.get('/api/products/?omit=description,created_at')
+        self.assertEqual(
+            list(response.data['results'][0]),
+            ['id', 'name', 'price', 'stock', 'image', 'category', 'vendor_name']
+        )
+        sql = self.data_query(queries, 'products_product')
+        self.assertNotIn('"description"', sql)
+        self.assertIn('"business_name"', sql)
+
+    def test_product_detail_fields(self):
+        response, queries = self.get(f'/api/products/{self.product.pk}/?fields=id,name')
+        self.assertEqual(response.data, {'id': self.product.pk, 'name': 'Café de Huila'})
+        sql = self.data_query(queries, 'products_product')
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('JOIN', sql)
+
+        response, queries = self.get(f'/api/products/{self.product.pk}/?fields=id,vendor')
+        self.assertEqual(response.data['vendor']['user']['email'], 'maria@example.com')
+        self.assertIn('JOIN "users_user"', self.data_query(queries, 'products_product'))
+
+    def test_product_vendor_endpoints(self):
+        response, _ = self.get(f'/api/products/by-vendor/{self.vendor.pk}/?fields=id,stock')
+        self.assertEqual(response.data['results'], [{'id': self.product.pk, 'stock': 3}])
+
+        token = CustomTokenObtainPairSerializer.get_token(self.vendor.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response, _ = self.get('/api/products/my_products/?omit=description')
+        self.assertNotIn('description', response.data[0])
+
+    def test_cursor_pagination_with_fields(self):
+        # Más de una página: el cursor necesita el id aunque no se pida
+        Product.objects.bulk_create([
+            Product(
+                vendor=self.vendor, name=f'Panela {i}', description='Bloque',
+                price=Decimal('45000'), stock=i
+            )
+            for i in range(12)
+        ])
+        for url in [
+            '/api/products/?pagination=cursor&fields=name',
+            '/api/products/?pagination=cursor&fields=name&ordering=price',
+            f'/api/products/by-vendor/{self.vendor.pk}/?pagination=cursor&fields=name',
+        ]:
+            with self.subTest(url=url):
+                response, _ = self.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual({key for row in response.data['results'] for key in row}, {'name'})
+
+                names = [row['name'] for row in response.data['results']]
+                response, _ = self.get(response.data['next'])
+                self.assertEqual(response.status_code, 200)
+                names += [row['name'] for row in response.data['results']]
+                self.assertEqual(len(names), 13)
+                self.assertEqual(len(set(names)), 13)
+
+    def test_vendor_fields(self):
+        response, queries = self.get('/api/vendors/?fields=id,business_name,products_count')
+        self.assertEqual(
+            response.data['results'],
+            [{'id': self.vendor.pk, 'business_name': 'Café del Eje', 'products_count': 1}]
+        )
+        sql = self.data_query(queries, 'vendors_vendor')
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('JOIN', sql)
+
+        response, _ = self.get(f'/api/vendors/{self.vendor.pk}/?omit=user,description')
+        self.assertNotIn('user', response.data)
+        self.assertEqual(response.data['city'], 'Armenia')
+
+        token = CustomTokenObtainPairSerializer.get_token(self.vendor.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response, _ = self.get('/api/vendors/me/?fields=id,city')
+        self.assertEqual(response.data, {'id': self.vendor.pk, 'city': 'Armenia'})
+
+    def test_cached_responses_vary_by_fieldset(self):
+        self.assertIn('description', self.client.get('/api/products/').data['results'][0])
+        self.assertEqual(
+            list(self.client.get('/api/products/?fields=id').data['results'][0]), ['id']
+        )
+
+    def test_invalid_fieldsets(self):
+        response = self.client.get('/api/products/?fields=id,precio')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('precio', response.data['fields'])
+        response = self.client.get('/api/vendors/?omit=id,nombre')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('nombre', response.data['omit'])
+        response = self.client.get('/api/products/?fields=id&omit=id')
+        self.assertEqual(response.status_code, 400)
+
+    def test_writes_ignore_fieldsets(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.vendor.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.patch(
+            f'/api/products/{self.product.pk}/?fields=id', {'stock': 9}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('stock', response.data)
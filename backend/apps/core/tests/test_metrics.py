@@ -0,0 +1,101 @@
+"""
+Cabecera Server-Timing y endpoint de métricas en formato Prometheus.
+"""
+
+import re
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.metrics import RequestTimer, registry
+from apps.products.models import Category, Product
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+class ServerTimingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='vendor@example.com', username='vendor', password='x',
+            first_name='V', last_name='V'
+        )
+        vendor = Vendor.objects.create(user=cls.user, business_name='Tienda')
+        cls.product = Product.objects.create(
+            vendor=vendor, name='Café', description='Café de origen',
+            price=Decimal('1000'), category=Category.objects.create(name='Alimentos', slug='alimentos')
+        )
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.client = APIClient()
+
+    def phases(self, response):
+        return {
+            match.group(1): match.group(2)
+            for match in re.finditer(r'(\w+);dur=([\d.]+)', response['Server-Timing'])
+        }
+
+    def test_server_timing_phases(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.get('/api/products/my_products/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(self.phases(response)), {'db', 'auth', 'app', 'serialize', 'render', 'total'})
+        self.assertIn('desc="SQL (3)"', response['Server-Timing'])
+
+    def test_serialize_phase(self):
+        # Listado (ValuesSerializer), detalle y listado con many=True de DRF
+        for url in ['/api/products/', f'/api/products/{self.product.pk}/', '/api/vendors/']:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn('serialize', self.phases(response))
+                self.assertIn('desc="Serialización"', response['Server-Timing'])
+                # Un acierto de la caché no vuelve a serializar
+                response = self.client.get(url)
+                self.assertEqual(response['X-Cache'], 'HIT')
+                self.assertNotIn('serialize', self.phases(response))
+
+    def test_phases_are_exclusive(self):
+        # El SQL ejecutado al serializar cuenta en db y no en serialize
+        timer = RequestTimer()
+        with timer.phase('serialize'):
+            timer.execute_wrapper(lambda *args: time.sleep(0.02), 'SELECT 1', (), False, {})
+        timer.finish()
+        self.assertEqual(timer.queries, 1)
+        self.assertGreaterEqual(timer.phases['db'], 0.02)
+        self.assertLess(timer.phases['serialize'], 0.02)
+
+    @override_settings(DEBUG=True, METRICS_TOKEN='')
+    def test_metrics_endpoint(self):
+        self.client.get('/api/products/')
+        self.client.get('/api/products/')
+        response = self.client.get('/api/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn(
+            'api_request_duration_seconds_count{route="product-list",method="GET"} 2', body
+        )
+        self.assertIn('api_requests_total{route="product-list",method="GET",status="200"} 2', body)
+        self.assertIn('api_request_queries_bucket{route="product-list",method="GET",le="+Inf"} 2', body)
+
+    @override_settings(METRICS_TOKEN='secreto')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 401)
+        response = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer secreto')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='')
+    def test_metrics_without_token_in_production(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 404)
@@ -0,0 +1,117 @@
+"""
+Paginación keyset (``?pagination=cursor``): recorrido completo sin
+duplicados, desempate por id en la dirección del ordenamiento y cursores
+inválidos.
+"""
+
+import base64
+import json
+from decimal import Decimal
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core.pagination import KeysetPagination
+from apps.products.models import Product
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+def _cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class KeysetPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='x',
+            first_name='María', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(user=user, business_name='Café del Eje')
+        # 25 productos con solo tres precios: casi todo son empates
+        Product.objects.bulk_create([
+            Product(
+                vendor=cls.vendor, name=f'Café {i:02d}', description='Tostión media',
+                price=Decimal(10000 * (i % 3 + 1)), stock=i
+            )
+            for i in range(25)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def walk(self, url):
+        """Seguir ``next`` hasta el final; devuelve las páginas de resultados."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data['results'])
+            url = response.data['next']
+        return pages
+
+    def test_round_trip_without_duplicates(self):
+        pages = self.walk('/api/products/?pagination=cursor&ordering=price')
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        ids = [item['id'] for page in pages for item in page]
+        self.assertCountEqual(ids, Product.objects.values_list('pk', flat=True))
+        self.assertEqual(
+            ids, list(Product.objects.order_by('price', 'pk').values_list('pk', flat=True))
+        )
+
+    def test_previous_returns_the_same_page(self):
+        first = self.client.get('/api/products/?pagination=cursor&ordering=price')
+        self.assertNotIn('count', first.data)
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertEqual(back.data['next'], first.data['next'])
+
+    def test_descending_ties_break_by_descending_id(self):
+        pages = self.walk('/api/products/?pagination=cursor&ordering=-price')
+        ids = [item['id'] for page in pages for item in page]
+        self.assertEqual(
+            ids, list(Product.objects.order_by('-price', '-pk').values_list('pk', flat=True))
+        )
+
+    def test_ordering_always_ends_in_pk(self):
+        paginator = KeysetPagination()
+        self.assertEqual(paginator.get_ordering(Product.objects.order_by('price')), ['price', 'pk'])
+        self.assertEqual(paginator.get_ordering(Product.objects.order_by('-price')), ['-price', '-pk'])
+        self.assertEqual(paginator.get_ordering(Product.objects.order_by('-id', 'name')), ['-id'])
+
+    def test_vendor_listing(self):
+        for i in range(11):
+            user = User.objects.create_user(
+                email=f'v{i}@example.com', username=f'v{i}', password='x',
+                first_name='V', last_name=str(i)
+            )
+            Vendor.objects.create(user=user, business_name=f'Tienda {i}')
+        pages = self.walk('/api/vendors/?pagination=cursor')
+        self.assertEqual([len(page) for page in pages], [10, 2])
+
+    def test_cursor_param_alone_enables_keyset(self):
+        first = self.client.get('/api/products/?pagination=cursor&ordering=price')
+        token = parse_qs(urlsplit(first.data['next']).query)['cursor'][0]
+        response = self.client.get(f'/api/products/?ordering=price&cursor={token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('count', response.data)
+
+    def test_invalid_cursors(self):
+        for token in [
+            'no-es-base64!', _cursor('texto'), _cursor({'x': 1}),
+            _cursor({'v': [10000], 'r': 0}), _cursor({'v': 'abc', 'r': 0}),
+        ]:
+            with self.subTest(token=token):
+                response = self.client.get(f'/api/products/?ordering=price&cursor={token}')
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.data['detail'], 'Cursor inválido.')
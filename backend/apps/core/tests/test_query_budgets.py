@@ -0,0 +1,320 @@
+"""
+Presupuesto de consultas SQL por endpoint.
+
+Recorre todas las rutas de ``config/urls.py`` (salvo el admin y los archivos
+estáticos) y ejecuta cada método con dos tamaños de dataset. Falla si una
+ruta no tiene presupuesto declarado, si lo supera o si el número de consultas
+crece con el tamaño de la página (síntoma de N+1). La tabla por vista se
+escribe en ``QUERY_BUDGET_REPORT`` (por defecto ``<tmp>/query_budgets.md``).
+"""
+
+import os
+import tempfile
+import time
+from decimal import Decimal
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+from apps.products.categories import category_map
+from apps.products.models import Category, Product
+from apps.products.stock import reserve_stock
+from apps.users.authentication import get_user_state
+from apps.users.revocation import store as revocation_store
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+PASSWORD = 'Colombia2024!'
+
+# (nombre de la ruta, método) -> consultas máximas por petición
+BUDGETS = {
+    ('schema', 'GET'): 0,
+    ('swagger-ui', 'GET'): 0,
+    ('redoc', 'GET'): 0,
+    ('metrics', 'GET'): 0,
+    ('token_obtain_pair', 'POST'): 2,
+    ('token_refresh', 'POST'): 2,
+    ('register', 'POST'): 3,
+    ('user_profile', 'GET'): 1,
+    ('user_profile', 'PATCH'): 3,
+    ('vendor-list', 'GET'): 3,
+    ('vendor-list', 'POST'): 2,
+    ('vendor-me', 'GET'): 1,
+    ('vendor-detail', 'GET'): 2,
+    ('vendor-detail', 'PUT'): 2,
+    ('vendor-detail', 'PATCH'): 2,
+    ('vendor-detail', 'DELETE'): 2,
+    ('product-list', 'GET'): 3,
+    ('product-list', 'POST'): 6,
+    ('product-bulk', 'POST'): 9,
+    ('product-by-vendor', 'GET'): 4,
+    ('product-export', 'GET'): 1,
+    ('product-facets', 'GET'): 3,
+    ('product-stock-decrement', 'POST'): 4,
+    ('product-stock-reserve', 'POST'): 6,
+    ('product-stock-release', 'POST'): 7,
+    ('product-stock-commit', 'POST'): 3,
+    ('product-my-products', 'GET'): 1,
+    ('product-detail', 'GET'): 2,
+    ('product-detail', 'PUT'): 4,
+    ('product-detail', 'PATCH'): 4,
+    ('product-detail', 'DELETE'): 4,
+}
+
+# Las raíces de los routers quedan ocultas por las rutas de listado (prefijo '')
+EXCLUDED_ROUTES = {'api-root'}
+
+# Tamaños de dataset: (vendedores, productos por vendedor). El pequeño no
+# llena una página (PAGE_SIZE = 10); el grande llena varias.
+SMALL = (2, 3)
+LARGE = (8, 20)
+
+
+def api_routes():
+    """Conjunto de ``(nombre, método)`` de las rutas ``api/`` del proyecto."""
+    routes = set()
+
+    def walk(patterns, prefix=''):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, route)
+                continue
+            if not route.startswith('api/') or pattern.name in EXCLUDED_ROUTES:
+                continue
+            # DRF agrega 'head' a las acciones del viewset en la primera petición
+            methods = getattr(pattern.callback, 'actions', None)
+            if not methods:
+                view = pattern.callback.view_class
+                methods = [m for m in view.http_method_names if hasattr(view, m)]
+            routes.update(
+                (pattern.name, method.upper()) for method in methods
+                if method not in ('head', 'options')
+            )
+
+    walk(get_resolver().url_patterns)
+    return routes
+
+
+# DEBUG: /api/metrics/ sin METRICS_TOKEN solo responde en desarrollo
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'], DEBUG=True, METRICS_TOKEN=''
+)
+class QueryBudgetTests(TestCase):
+
+    sequence = count()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Alimentos', slug='alimentos')
+        cls.owner = cls.create_vendor().user
+        cls.vendors = [cls.owner.vendor_profile]
+        cls.grow(cls.vendors, SMALL)
+
+    @classmethod
+    def create_user(cls):
+        n = next(cls.sequence)
+        return User.objects.create_user(
+            email=f'user{n}@example.com', username=f'user{n}', password=PASSWORD,
+            first_name='Usuario', last_name=str(n)
+        )
+
+    @classmethod
+    def create_vendor(cls):
+        user = cls.create_user()
+        return Vendor.objects.create(user=user, business_name=f'Tienda {user.pk}', city='Cali')
+
+    @classmethod
+    def create_product(cls, vendor):
+        n = next(cls.sequence)
+        return Product.objects.create(
+            vendor=vendor, name=f'Café especial {n}', description='Café de origen',
+            price=Decimal(1000 + n), stock=5, category=cls.category
+        )
+
+    @classmethod
+    def grow(cls, vendors, size):
+        """Llevar el dataset a ``size`` vendedores con ``n`` productos cada uno."""
+        vendor_count, per_vendor = size
+        while len(vendors) < vendor_count:
+            vendors.append(cls.create_vendor())
+        for vendor in vendors:
+            for _ in range(per_vendor - vendor.products.count()):
+                cls.create_product(vendor)
+
+    def build_request(self, name, method):
+        """Devolver ``(path, data, usuario, status esperado)`` para una ruta."""
+        owner, vendor = self.owner, self.owner.vendor_profile
+        n = next(self.sequence)
+        product = vendor.products.filter(is_active=True).first()
+        product_data = {
+            'name': 'Panela orgánica', 'description': 'Panela del Valle',
+            'price': '8000.00', 'stock': 3, 'category': 'Alimentos',
+        }
+        vendor_data = {'business_name': 'Tienda nueva', 'city': 'Pasto'}
+        stock_items = {'items': [{'product': product.pk, 'quantity': 1}]}
+        requests = {
+            ('schema', 'GET'): ('/api/schema/', None, None, 200),
+            ('swagger-ui', 'GET'): ('/api/docs/', None, None, 200),
+            ('redoc', 'GET'): ('/api/redoc/', None, None, 200),
+            ('metrics', 'GET'): ('/api/metrics/', None, None, 200),
+            ('token_obtain_pair', 'POST'): (
+                '/api/users/token/', {'email': owner.email, 'password': PASSWORD}, None, 200
+            ),
+            ('token_refresh', 'POST'): (
+                '/api/users/token/refresh/', {'refresh': str(CustomTokenObtainPairSerializer.get_token(owner))}, None, 200
+            ),
+            ('register', 'POST'): ('/api/users/register/', {
+                'email': f'nuevo{n}@example.com', 'username': f'nuevo{n}',
+                'password': PASSWORD, 'password_confirm': PASSWORD,
+                'first_name': 'Nuevo', 'last_name': 'Usuario',
+            }, None, 201),
+            ('user_profile', 'GET'): ('/api/users/profile/', None, owner, 200),
+            ('user_profile', 'PATCH'): ('/api/users/profile/', {'first_name': 'Ana'}, owner, 200),
+            ('vendor-list', 'GET'): ('/api/vendors/', None, None, 200),
+            ('vendor-me', 'GET'): ('/api/vendors/me/', None, owner, 200),
+            ('vendor-detail', 'GET'): (f'/api/vendors/{vendor.pk}/', None, None, 200),
+            ('vendor-detail', 'PUT'): (f'/api/vendors/{vendor.pk}/', vendor_data, owner, 200),
+            ('vendor-detail', 'PATCH'): (f'/api/vendors/{vendor.pk}/', {'city': 'Cali'}, owner, 200),
+            ('product-list', 'GET'): ('/api/products/', None, None, 200),
+            ('product-list', 'POST'): ('/api/products/', product_data, owner, 201),
+            ('product-bulk', 'POST'): ('/api/products/bulk/', {'items': [
+                product_data,
+                {**product_data, 'name': 'Panela en polvo'},
+                {'id': product.pk, 'stock': 9},
+            ]}, owner, 200),
+            ('product-by-vendor', 'GET'): (f'/api/products/by-vendor/{vendor.pk}/', None, None, 200),
+            ('product-export', 'GET'): ('/api/products/export/', None, None, 200),
+            ('product-facets', 'GET'): ('/api/products/facets/', None, None, 200),
+            ('product-stock-decrement', 'POST'): (
+                '/api/products/stock/decrement/', stock_items, owner, 200
+            ),
+            ('product-stock-reserve', 'POST'): (
+                '/api/products/stock/reservations/', stock_items, owner, 201
+            ),
+            ('product-my-products', 'GET'): ('/api/products/my_products/', None, owner, 200),
+            ('product-detail', 'GET'): (f'/api/products/{product.pk}/', None, None, 200),
+            ('product-detail', 'PUT'): (f'/api/products/{product.pk}/', product_data, owner, 200),
+            ('product-detail', 'PATCH'): (f'/api/products/{product.pk}/', {'stock': 7}, owner, 200),
+        }
+        # Altas y bajas sobre objetos nuevos en cada medición
+        if (name, method) == ('vendor-list', 'POST'):
+            return '/api/vendors/', vendor_data, self.create_user(), 201
+        if (name, method) == ('vendor-detail', 'DELETE'):
+            disposable = self.create_vendor()
+            return f'/api/vendors/{disposable.pk}/', None, disposable.user, 204
+        if name in ('product-stock-release', 'product-stock-commit'):
+            reservation = reserve_stock(owner.pk, {product.pk: 1}, ttl=60)
+            action = name.rsplit('-', 1)[1]
+            return f'/api/products/stock/reservations/{reservation.pk}/{action}/', None, owner, 200
+        if (name, method) == ('product-detail', 'DELETE'):
+            disposable = self.create_product(vendor)
+            return f'/api/products/{disposable.pk}/', None, owner, 204
+        return requests[(name, method)]
+
+    def measure(self, name, method):
+        """Ejecutar la petición y devolver ``(consultas, ms de SQL)``."""
+        path, data, user, expected_status = self.build_request(name, method)
+        client = APIClient()
+        # Las respuestas cacheadas no ejecutan SQL
+        cache.clear()
+        if user is not None:
+            # Token como el del login (con claims) y estado del usuario ya
+            # cacheado, como en una sesión en curso
+            token = CustomTokenObtainPairSerializer.get_token(user).access_token
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            get_user_state(user.pk)
+        # Revocaciones ya sincronizadas: la relectura es periódica, no por petición
+        revocation_store.is_revoked('')
+        # Mapa de categorías ya cacheado, como tras la primera escritura
+        category_map()
+        send = getattr(client, method.lower())
+        stats = {'queries': 0, 'seconds': 0.0}
+
+        def record(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats['queries'] += 1
+                stats['seconds'] += time.perf_counter() - started
+
+        with connection.execute_wrapper(record):
+            if method == 'GET':
+                response = send(path, data)
+            else:
+                response = send(path, data, format='json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(
+            response.status_code, expected_status,
+            f'{method} {path}: {getattr(response, "data", "")}'
+        )
+        return stats['queries'], stats['seconds'] * 1000
+
+    def test_every_route_has_a_budget(self):
+        routes = api_routes()
+        self.assertEqual(
+            sorted(routes - set(BUDGETS)), [],
+            'Rutas sin presupuesto de consultas: declarar en BUDGETS'
+        )
+        self.assertEqual(sorted(set(BUDGETS) - routes), [], 'Presupuestos de rutas inexistentes')
+
+    def test_query_budgets(self):
+        routes = sorted(api_routes() & set(BUDGETS))
+        small = {route: self.measure(*route) for route in routes}
+        self.grow(self.vendors, LARGE)
+        large = {route: self.measure(*route) for route in routes}
+
+        rows = []
+        for route in routes:
+            budget = BUDGETS[route]
+            (small_count, small_ms), (large_count, large_ms) = small[route], large[route]
+            if large_count > small_count:
+                status = 'CRECE'
+            elif max(small_count, large_count) > budget:
+                status = 'EXCEDE'
+            else:
+                status = 'ok'
+            rows.append((*route, budget, small_count, large_count, small_ms, large_ms, status))
+        write_report(rows)
+
+        for name, method, budget, small_count, large_count, *_, status in rows:
+            with self.subTest(route=name, method=method):
+                self.assertLessEqual(
+                    large_count, small_count,
+                    f'{method} {name}: las consultas crecen con el dataset '
+                    f'({small_count} -> {large_count})'
+                )
+                self.assertLessEqual(
+                    max(small_count, large_count), budget,
+                    f'{method} {name}: {max(small_count, large_count)} consultas, presupuesto {budget}'
+                )
+
+
+def write_report(rows):
+    path = os.environ.get('QUERY_BUDGET_REPORT') or os.path.join(
+        tempfile.gettempdir(), 'query_budgets.md'
+    )
+    lines = [
+        f'Dataset pequeño: {SMALL[0]} vendedores x {SMALL[1]} productos; '
+        f'grande: {LARGE[0]} x {LARGE[1]}.',
+        '',
+        '| Ruta | Método | Presupuesto | Consultas (pequeño) | Consultas (grande) '
+        '| SQL ms (pequeño) | SQL ms (grande) | Estado |',
+        '|---|---|---|---|---|---|---|---|',
+    ]
+    for name, method, budget, small_count, large_count, small_ms, large_ms, status in rows:
+        lines.append(
+            f'| {name} | {method} | {budget} | {small_count} | {large_count} '
+            f'| {small_ms:.2f} | {large_ms:.2f} | {status} |'
+        )
+    with open(path, 'w') as fh:
+        fh.write('\n'.join(lines) + '\n')
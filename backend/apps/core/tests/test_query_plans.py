@@ -0,0 +1,138 @@
+"""
+Verifica con EXPLAIN QUERY PLAN que las consultas de los endpoints del
+catálogo usan índices y nunca recorren completas las tablas principales.
+"""
+
+import re
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.products.models import Category, Product
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+WATCHED_TABLES = {'products_product', 'vendors_vendor', 'users_user'}
+
+# "SCAN products_product" (SQLite >= 3.36) o "SCAN TABLE products_product"
+FULL_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+
+class QueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendors = []
+        for i in range(3):
+            user = User.objects.create_user(
+                email=f'vendor{i}@example.com', username=f'vendor{i}',
+                password='x', first_name='V', last_name=str(i)
+            )
+            cls.vendors.append(Vendor.objects.create(user=user, business_name=f'Tienda {i}'))
+
+        categories = [
+            Category.objects.create(name=name, slug=slug)
+            for name, slug in [('Alimentos', 'alimentos'), ('Artesanías', 'artesanias'), ('Ropa', 'ropa')]
+        ] + [None]
+        Product.objects.bulk_create([
+            Product(
+                vendor=cls.vendors[i % 3],
+                name=f'Café especial {i}',
+                description='Café de origen colombiano',
+                price=Decimal(1000 + (i % 7) * 500),
+                stock=i % 5,
+                category=categories[i % 4],
+                is_active=i % 6 != 0,
+            )
+            for i in range(60)
+        ])
+        cls.vendors[2].is_active = False
+        cls.vendors[2].save()
+
+    def setUp(self):
+        # Las respuestas cacheadas no ejecutan SQL
+        cache.clear()
+        self.client = APIClient()
+
+    def assertNoFullScan(self, url, params=None, user=None):
+        if user is not None:
+            self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200, response.content)
+
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        with connection.cursor() as cursor:
+            for sql in selects:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                for row in cursor.fetchall():
+                    match = FULL_SCAN_RE.match(row[-1])
+                    if match and match.group(1) in WATCHED_TABLES:
+                        self.fail(f'{url} {params or ""}: {row[-1]}\n{sql}')
+        return response
+
+    def test_product_list(self):
+        self.assertNoFullScan('/api/products/')
+
+    def test_product_list_filters(self):
+        self.assertNoFullScan('/api/products/', {'category': 'Alimentos'})
+        self.assertNoFullScan('/api/products/', {'vendor': self.vendors[0].pk})
+        self.assertNoFullScan('/api/products/', {'search': 'cafe'})
+
+    def test_product_list_range_filters(self):
+        for params in [
+            {'min_price': '1500', 'max_price': '3000'},
+            {'in_stock': 'true'},
+            {'in_stock': 'false'},
+            {'created_after': '2020-01-01'},
+            {'updated_since': '2020-01-01T00:00:00Z'},
+            {'category__in': 'Alimentos,Ropa'},
+            {'category__in': 'Alimentos,Ropa', 'max_price': '3000', 'in_stock': 'true'},
+            {'max_price': '3000', 'in_stock': 'true', 'created_after': '2020-01-01'},
+            {'min_price': '1500', 'ordering': 'price'},
+            {'in_stock': 'true', 'pagination': 'cursor'},
+        ]:
+            with self.subTest(params=params):
+                self.assertNoFullScan('/api/products/', params)
+                self.assertNoFullScan('/api/products/facets/', params)
+
+    def test_product_list_orderings(self):
+        for ordering in ['price', '-price', 'name', '-name', 'stock', '-stock', 'created_at']:
+            self.assertNoFullScan('/api/products/', {'ordering': ordering})
+            self.assertNoFullScan('/api/products/', {'ordering': ordering, 'pagination': 'cursor'})
+
+    def test_product_list_cursor_pages(self):
+        response = self.assertNoFullScan('/api/products/', {'pagination': 'cursor'})
+        self.assertNoFullScan(response.data['next'])
+
+    def test_product_retrieve(self):
+        product = Product.objects.filter(is_active=True).first()
+        self.assertNoFullScan(f'/api/products/{product.pk}/')
+
+    def test_product_facets(self):
+        self.assertNoFullScan('/api/products/facets/')
+        self.assertNoFullScan('/api/products/facets/', {'category': 'Alimentos'})
+        self.assertNoFullScan('/api/products/facets/', {'search': 'cafe'})
+
+    def test_products_by_vendor(self):
+        url = f'/api/products/by-vendor/{self.vendors[0].pk}/'
+        self.assertNoFullScan(url)
+        self.assertNoFullScan(url, {'ordering': 'price'})
+        self.assertNoFullScan(url, {'pagination': 'cursor'})
+
+    def test_my_products(self):
+        self.assertNoFullScan('/api/products/my_products/', user=self.vendors[0].user)
+
+    def test_vendor_list(self):
+        self.assertNoFullScan('/api/vendors/')
+        self.assertNoFullScan('/api/vendors/', {'pagination': 'cursor'})
+
+    def test_vendor_retrieve(self):
+        self.assertNoFullScan(f'/api/vendors/{self.vendors[0].pk}/')
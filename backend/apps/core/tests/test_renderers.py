@@ -0,0 +1,108 @@
+"""
+ORJSONRenderer y ORJSONParser: la salida y los errores deben ser idénticos
+a los de JSONRenderer y JSONParser de DRF.
+"""
+
+import io
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.parsers import ORJSONParser
+from apps.core.renderers import ORJSONRenderer
+from apps.products.models import Category, Product
+from apps.products.serializers import ProductListSerializer
+from apps.vendors.models import Vendor
+
+
+class ORJSONRendererTests(SimpleTestCase):
+
+    def assertSameOutput(self, data, accepted_media_type=None, renderer_context=None):
+        expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+        self.assertEqual(ORJSONRenderer().render(data, accepted_media_type, renderer_context), expected)
+
+    def test_product_list_payload(self):
+        vendor = Vendor(pk=1, business_name='Café del Eje')
+        products = [
+            Product(
+                pk=n, vendor=vendor, name=f'Café {n}', description='Tostión media\u2028molido',
+                price=Decimal('45000.50') + n, stock=n, category=Category(pk=1, name='Alimentos'),
+                created_at=datetime(2025, 3, 1, 4, 5, 6, 123456 * n % 1_000_000, tzinfo=dt_timezone.utc),
+            )
+            for n in range(1, 4)
+        ]
+        data = ProductListSerializer(products, many=True).data
+        self.assertSameOutput({'count': 3, 'results': data})
+
+        rendered = ORJSONRenderer().render(data)
+        self.assertIn(b'"price":"45001.50"', rendered)
+        # Hora de Bogotá, como DateTimeField de DRF
+        self.assertIn(b'"created_at":"2025-02-28T23:05:06.123456-05:00"', rendered)
+
+    def test_values_handled_by_drf_encoder(self):
+        self.assertSameOutput({
+            'precio': Decimal('19.90'),
+            'utc': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'ingenua': datetime(2025, 1, 2, 3, 4, 5),
+            'texto': gettext_lazy('Productos'),
+            'conjunto': {1},
+            1: 'clave numérica',
+            'separadores': 'a\u2028b\u2029c',
+        })
+
+    def test_falls_back_for_indent_and_big_integers(self):
+        self.assertSameOutput({'a': [1, 2]}, 'application/json; indent=4')
+        self.assertSameOutput({'a': [1, 2]}, None, {'indent': 2})
+        self.assertSameOutput({'grande': 2 ** 70})
+
+    def test_unserializable_data_raises_like_drf(self):
+        with self.assertRaises(TypeError):
+            ORJSONRenderer().render({'objeto': object()})
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class ORJSONParserTests(SimpleTestCase):
+
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), parser_context={'encoding': 'utf-8'})
+
+    def test_parses_like_drf(self):
+        body = '{"nombre": "Panela orgánica", "precio": "8000.00", "stock": 3, "ids": [1, 2]}'.encode()
+        self.assertEqual(self.parse(ORJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_big_integers_fall_back(self):
+        self.assertEqual(self.parse(ORJSONParser(), b'{"n": 1180591620717411303424}'), {'n': 2 ** 70})
+
+    def test_invalid_json_raises_same_error(self):
+        for body in (b'{"nombre": ', b'{"n": NaN}', b''):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as expected:
+                    self.parse(JSONParser(), body)
+                with self.assertRaises(ParseError) as error:
+                    self.parse(ORJSONParser(), body)
+                self.assertEqual(str(error.exception.detail), str(expected.exception.detail))
+
+
+class ORJSONSettingsTests(TestCase):
+
+    def test_api_uses_orjson_renderer_and_parser(self):
+        response = self.client.get('/api/products/')
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        response = self.client.post(
+            '/api/users/register/', '{"email": ', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()['detail'].startswith('JSON parse error'))
+
+    def test_benchmark_command_checks_identical_output(self):
+        out = io.StringIO()
+        call_command('benchmark_json', items=20, repeat=2, stdout=out)
+        self.assertIn('ORJSONRenderer', out.getvalue())
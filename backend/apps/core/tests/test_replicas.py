@@ -0,0 +1,126 @@
+"""
+Lecturas desde réplicas: enrutamiento por método, fijación a la principal
+después de escribir y sincronización con ``sync_replicas``.
+
+La réplica es un archivo temporal con una conexión creada al vuelo; la
+copia se hace desde la base de pruebas con la misma API de backup que usa el
+comando.
+"""
+
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core.cache import get_catalog_version
+from apps.core.replicas import PrimaryReplicaRouter, RoutingState, _state
+from apps.products.models import Product
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+REPLICA = 'replica_test'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        # Conexión creada al vuelo (fuera de DATABASES) para este hilo
+        replica = connection.copy(REPLICA)
+        replica.settings_dict['NAME'] = os.path.join(directory, 'replica.sqlite3')
+        connections[REPLICA] = replica
+        self.addCleanup(connections.__delitem__, REPLICA)
+        self.addCleanup(replica.close)
+
+        vendor_user = User.objects.create_user(
+            email='vendor@example.com', username='vendor',
+            password='x', first_name='V', last_name='R'
+        )
+        self.vendor = Vendor.objects.create(user=vendor_user, business_name='Café del Eje')
+        self.product = Product.objects.create(
+            vendor=self.vendor, name='Café', description='Hecho en Colombia',
+            price=Decimal('10000'), stock=5
+        )
+        self.vendor_client = APIClient()
+        token = CustomTokenObtainPairSerializer.get_token(vendor_user).access_token
+        self.vendor_client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        call_command('sync_replicas', stdout=open(os.devnull, 'w'))
+
+    def product_name(self, client):
+        response = client.get(f'/api/products/{self.product.pk}/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['name']
+
+    def test_anonymous_reads_use_replica(self):
+        # Cambios en la principal sin sincronizar: la réplica aún no los tiene
+        Product.objects.filter(pk=self.product.pk).update(name='Café de origen')
+        Vendor.objects.filter(pk=self.vendor.pk).update(business_name='Café del Quindío')
+
+        self.assertEqual(self.product_name(self.client), 'Café')
+        response = self.client.get(f'/api/vendors/{self.vendor.pk}/')
+        self.assertEqual(response.data['business_name'], 'Café del Eje')
+
+        call_command('sync_replicas', stdout=open(os.devnull, 'w'))
+        # update() no invalida la caché del catálogo por sí solo
+        cache.clear()
+        self.assertEqual(self.product_name(self.client), 'Café de origen')
+
+    def test_writer_reads_own_writes_from_primary(self):
+        response = self.vendor_client.patch(
+            f'/api/products/{self.product.pk}/', {'name': 'Café de origen'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        # Quien escribió queda fijado a la principal; los demás leen la réplica
+        self.assertEqual(self.product_name(self.vendor_client), 'Café de origen')
+        self.assertEqual(self.product_name(self.client), 'Café')
+
+        # Al sincronizar, la respuesta atrasada guardada en caché deja de usarse
+        call_command('sync_replicas', stdout=open(os.devnull, 'w'))
+        self.assertEqual(self.product_name(self.client), 'Café de origen')
+
+    def test_sync_without_changes_keeps_cache(self):
+        version = get_catalog_version()
+        call_command('sync_replicas', stdout=open(os.devnull, 'w'))
+        self.assertEqual(get_catalog_version(), version)
+
+    def test_unknown_replica(self):
+        with self.assertRaises(CommandError):
+            call_command('sync_replicas', database=['replica9'])
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        state = RoutingState()
+        state.read_alias = REPLICA
+        token = _state.set(state)
+        self.addCleanup(_state.reset, token)
+        self.state = state
+
+    def test_reads_stay_on_primary_after_write(self):
+        self.assertEqual(self.router.db_for_read(Product), REPLICA)
+        self.assertEqual(self.router.db_for_write(Product), DEFAULT_DB_ALIAS)
+        self.assertIsNone(self.router.db_for_read(Product))
+
+    def test_no_routing_outside_requests(self):
+        _state.set(None)
+        self.assertIsNone(self.router.db_for_read(Product))
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate(REPLICA, 'products'))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'products'))
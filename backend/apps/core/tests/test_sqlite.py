@@ -0,0 +1,138 @@
+"""
+Modo SQLite de producción: PRAGMA por conexión y cola de un solo escritor.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.sqlite import pragma_statements
+from apps.core.writes import WriteQueue, write_queue, write_turn
+
+
+class SQLitePragmaTests(SimpleTestCase):
+    """Los PRAGMA se aplican en cada conexión nueva a un archivo."""
+
+    # Conexiones propias a un archivo temporal, no a la base de pruebas
+    databases = {'default'}
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'pragmas.sqlite3')
+
+    def open_connection(self):
+        # Copia del wrapper de Django (mismas OPTIONS) apuntando al archivo
+        wrapper = connection.copy()
+        wrapper.settings_dict['NAME'] = self.path
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_statements_keep_order(self):
+        self.assertEqual(
+            pragma_statements({'journal_mode': 'WAL', 'busy_timeout': 5000}),
+            ['PRAGMA journal_mode = WAL', 'PRAGMA busy_timeout = 5000'],
+        )
+
+    @override_settings(SQLITE_PRAGMAS={
+        'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -32768, 'busy_timeout': 1234,
+    })
+    def test_new_connection_gets_pragmas(self):
+        wrapper = self.open_connection()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -32768)
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 1234)
+
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'WAL', 'busy_timeout': 100})
+    def test_reads_do_not_wait_for_open_write(self):
+        writer, reader = self.open_connection(), self.open_connection()
+        with writer.cursor() as cursor:
+            cursor.execute('CREATE TABLE t (id INTEGER PRIMARY KEY)')
+            cursor.execute('INSERT INTO t VALUES (1)')
+        with writer.cursor() as cursor:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('INSERT INTO t VALUES (2)')
+            try:
+                with reader.cursor() as other:
+                    other.execute('SELECT COUNT(*) FROM t')
+                    # Ve la última versión confirmada, sin esperar el bloqueo
+                    self.assertEqual(other.fetchone()[0], 1)
+            finally:
+                cursor.execute('ROLLBACK')
+
+
+class WriteQueueTests(SimpleTestCase):
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail('Tiempo de espera agotado.')
+            time.sleep(0.001)
+
+    def test_waiters_take_turns_in_arrival_order(self):
+        queue = WriteQueue()
+        order = []
+
+        def writer(n):
+            queue.acquire()
+            order.append(n)
+            queue.release()
+
+        queue.acquire()
+        threads = []
+        for n in range(5):
+            thread = threading.Thread(target=writer, args=(n,))
+            thread.start()
+            threads.append(thread)
+            # Encolar de a uno para fijar el orden de llegada
+            self.wait_for(lambda: len(queue._waiters) == n + 1)
+        queue.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, [0, 1, 2, 3, 4])
+
+    def test_reentrant_for_the_same_thread(self):
+        queue = WriteQueue()
+        acquired = threading.Event()
+
+        def other():
+            queue.acquire()
+            acquired.set()
+            queue.release()
+
+        queue.acquire()
+        queue.acquire()
+        thread = threading.Thread(target=other)
+        thread.start()
+        queue.release()
+        self.assertFalse(acquired.wait(0.05))
+        queue.release()
+        thread.join()
+        self.assertTrue(acquired.is_set())
+
+    def test_release_without_turn_fails(self):
+        with self.assertRaises(RuntimeError):
+            WriteQueue().release()
+
+    @override_settings(DB_SERIALIZE_WRITES=False)
+    def test_write_turn_disabled(self):
+        with write_turn():
+            self.assertIsNone(write_queue._owner)
+
+    @override_settings(DB_SERIALIZE_WRITES=True)
+    def test_write_turn_enabled(self):
+        with write_turn():
+            self.assertEqual(write_queue._owner, threading.get_ident())
+        self.assertIsNone(write_queue._owner)
@@ -0,0 +1,30 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views import View
+
+from .metrics import registry
+
+
+class MetricsView(View):
+    """
+    Métricas del proceso en formato de texto de Prometheus.
+
+    Si ``METRICS_TOKEN`` está configurado se exige
+    ``Authorization: Bearer <token>``. Sin token solo responde con
+    ``DEBUG`` activo: en producción el endpoint no existe (404).
+    """
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if not token and not settings.DEBUG:
+            raise Http404
+        if token:
+            header = request.headers.get('Authorization', '')
+            if not hmac.compare_digest(header.encode(), f'Bearer {token}'.encode()):
+                return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+        return HttpResponse(
+            registry.render_prometheus(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
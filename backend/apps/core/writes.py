@@ -0,0 +1,86 @@
+"""
+Cola de un solo escritor por proceso para las escrituras pesadas.
+
+SQLite admite un escritor a la vez. Cuando varios hilos del mismo worker
+escriben juntos, los que no consiguen el bloqueo lo reintentan con esperas
+crecientes (``busy_timeout``) y pueden quedarse sin turno mientras llegan
+otros. ``write_queue`` los atiende en orden de llegada: cada hilo espera en
+una cola en memoria y entra a la base cuando el anterior confirmó. Entre
+procesos el turno lo sigue dando ``busy_timeout``.
+
+Se activa con ``DB_SERIALIZE_WRITES``. Es reentrante: una escritura en cola
+puede llamar a otra sin bloquearse a sí misma.
+"""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+
+
+class WriteQueue:
+    """Cerrojo FIFO y reentrante por hilo."""
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._waiters = deque()
+        self._owner = None
+        self._depth = 0
+
+    def acquire(self):
+        me = threading.get_ident()
+        with self._mutex:
+            if self._owner == me:
+                self._depth += 1
+                return
+            if self._owner is None and not self._waiters:
+                self._owner, self._depth = me, 1
+                return
+            turn = threading.Event()
+            self._waiters.append(turn)
+        # release() entrega el turno directamente a este hilo
+        turn.wait()
+        with self._mutex:
+            self._owner, self._depth = me, 1
+
+    def release(self):
+        with self._mutex:
+            if self._owner != threading.get_ident():
+                raise RuntimeError('release() de un hilo que no tiene el turno de escritura.')
+            self._depth -= 1
+            if self._depth:
+                return
+            if self._waiters:
+                # Turno reservado hasta que el siguiente despierte: quien
+                # llegue entretanto se encola detrás
+                self._owner = 'next'
+                self._waiters.popleft().set()
+            else:
+                self._owner = None
+
+
+write_queue = WriteQueue()
+
+
+@contextmanager
+def write_turn():
+    """Esperar el turno de ``write_queue`` (si ``DB_SERIALIZE_WRITES``) durante el bloque."""
+    if not settings.DB_SERIALIZE_WRITES:
+        yield
+        return
+    write_queue.acquire()
+    try:
+        yield
+    finally:
+        write_queue.release()
+
+
+def serialized_write(func):
+    """Decorador: ejecutar ``func`` dentro de ``write_turn()``."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with write_turn():
+            return func(*args, **kwargs)
+    return wrapper
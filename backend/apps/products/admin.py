@@ -1,5 +1,15 @@
-from django.contrib import admin
-from .models import Product
+from django.contrib import admin, messages
+from .archive import restore_products
+from .models import ArchivedProduct, Category, Product, StockReservation, StockReservationItem
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    """Admin para el modelo Category."""
+
+    list_display = ['name', 'slug']
+    search_fields = ['name', 'slug']
+    prepopulated_fields = {'slug': ('name',)}
 
 
 @admin.register(Product)
@@ -8,7 +18,7 @@ class ProductAdmin(admin.ModelAdmin):
 
     list_display = ['name', 'vendor', 'price', 'stock', 'category', 'is_active', 'created_at']
     list_filter = ['is_active', 'category', 'vendor', 'created_at']
-    search_fields = ['name', 'description', 'vendor__business_name', 'category']
+    search_fields = ['name', 'description', 'vendor__business_name', 'category__name']
     ordering = ['-created_at']
     readonly_fields = ['created_at', 'updated_at']
     list_editable = ['price', 'stock', 'is_active']
@@ -28,3 +38,58 @@ class ProductAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+class StockReservationItemInline(admin.TabularInline):
+    model = StockReservationItem
+    extra = 0
+    can_delete = False
+    readonly_fields = ['product', 'quantity']
+
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    """
+    Admin de solo lectura para las reservas de stock: cambiar su estado aquí
+    no devolvería las unidades (ver ``apps.products.stock``).
+    """
+
+    list_display = ['id', 'user', 'status', 'expires_at', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['user__email']
+    ordering = ['-created_at']
+    readonly_fields = ['user', 'status', 'expires_at', 'created_at', 'updated_at']
+    inlines = [StockReservationItemInline]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ArchivedProduct)
+class ArchivedProductAdmin(admin.ModelAdmin):
+    """
+    Admin de solo lectura para los productos archivados; la acción
+    "Restaurar" los devuelve al catálogo (ver ``apps.products.archive``).
+    """
+
+    list_display = ['id', 'name', 'vendor', 'price', 'is_active', 'updated_at', 'archived_at']
+    list_filter = ['archived_at', 'is_active']
+    search_fields = ['name', 'vendor__business_name']
+    ordering = ['-archived_at']
+    actions = ['restore', 'restore_and_activate']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description='Restaurar los productos seleccionados')
+    def restore(self, request, queryset):
+        restored = restore_products(queryset)
+        self.message_user(request, f'{restored} productos restaurados.', messages.SUCCESS)
+
+    @admin.action(description='Restaurar y reactivar los productos seleccionados')
+    def restore_and_activate(self, request, queryset):
+        restored = restore_products(queryset, activate=True)
+        self.message_user(request, f'{restored} productos restaurados y reactivados.', messages.SUCCESS)
@@ -0,0 +1,215 @@
+"""
+Archivo de productos retirados del catálogo.
+
+``destroy`` solo desactiva productos y vendedores, así que las filas
+desactivadas se quedan en ``products_product``: cada consulta las salta y
+agrandan los índices y el archivo de SQLite. ``archive_products`` mueve a
+``ArchivedProduct`` los productos desactivados (o de vendedores
+desactivados) hace más de N días, junto con sus líneas de reserva, en
+transacciones por bloque; ``restore_products`` los devuelve con el mismo id.
+
+Las operaciones son masivas y no disparan señales: aquí se actualizan
+explícitamente el contador de productos activos, el índice de búsqueda y la
+versión del catálogo (solo cambian si se mueve un producto activo, p. ej. el
+de un vendedor desactivado).
+"""
+
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import search
+from .models import ArchivedProduct, Product, StockReservation, StockReservationItem
+from .signals import update_vendor_products_count
+from apps.core.cache import bump_catalog_version
+from apps.core.writes import write_turn
+
+# Columnas de Product que se copian tal cual al archivo
+ARCHIVED_FIELDS = (
+    'id', 'vendor_id', 'name', 'description', 'price', 'stock', 'image',
+    'category_id', 'is_active', 'created_at', 'updated_at',
+)
+
+
+def archivable_products(cutoff):
+    """
+    Productos desactivados antes de ``cutoff``, o de un vendedor desactivado
+    antes de ``cutoff``. Los que tienen unidades en una reserva activa
+    esperan a que se cierre.
+    """
+    return (
+        Product.objects.filter(
+            Q(is_active=False, updated_at__lt=cutoff)
+            | Q(vendor__is_active=False, vendor__updated_at__lt=cutoff)
+        )
+        .exclude(reservation_items__reservation__status=StockReservation.Status.ACTIVE)
+        .order_by('pk')
+    )
+
+
+def _update_catalog(vendor_counts, delta):
+    for vendor_id, count in vendor_counts.items():
+        update_vendor_products_count(vendor_id, delta * count, DEFAULT_DB_ALIAS)
+        bump_catalog_version(vendor_id)
+
+
+def _delete_products(ids):
+    # Sin QuerySet.delete(): enviaría las señales de Product fila por fila
+    # (contador, índice, caché), que aquí se resuelven por bloque
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {Product._meta.db_table} WHERE id IN ({placeholders})', ids)
+
+
+def _archive_chunk(ids, now):
+    rows = list(Product.objects.filter(pk__in=ids).values(*ARCHIVED_FIELDS))
+    items = StockReservationItem.objects.filter(product_id__in=ids)
+    reserved = defaultdict(list)
+    for product_id, reservation_id, quantity in items.values_list('product_id', 'reservation_id', 'quantity'):
+        reserved[product_id].append({'reservation': reservation_id, 'quantity': quantity})
+
+    ArchivedProduct.objects.bulk_create([
+        ArchivedProduct(archived_at=now, reservation_items=reserved[row['id']], **row) for row in rows
+    ])
+    item_count, _ = items.delete()
+    _delete_products(ids)
+
+    active = [row for row in rows if row['is_active']]
+    if active:
+        _update_catalog(Counter(row['vendor_id'] for row in active), -1)
+        if search.is_supported():
+            search.remove_products([row['id'] for row in active])
+    return len(rows), item_count
+
+
+def archive_products(cutoff, chunk_size=None):
+    """
+    Archivar ``archivable_products(cutoff)`` en bloques de ``chunk_size``.
+
+    Cada bloque es una transacción en la cola de escritura: se vuelve a
+    seleccionar dentro de ella, así que un producto reactivado o reservado
+    mientras tanto no se archiva. Devuelve ``(productos, líneas de reserva)``.
+    """
+    chunk_size = chunk_size or settings.PRODUCT_ARCHIVE_CHUNK_SIZE
+    now = timezone.now()
+    products = items = last_pk = 0
+    while True:
+        with write_turn(), transaction.atomic():
+            ids = list(
+                archivable_products(cutoff).filter(pk__gt=last_pk)
+                .values_list('pk', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            archived, item_count = _archive_chunk(ids, now)
+        last_pk = ids[-1]
+        products += archived
+        items += item_count
+    return products, items
+
+
+def _restore_chunk(archived, activate):
+    products = [
+        Product(
+            id=entry.id, vendor_id=entry.vendor_id, name=entry.name,
+            description=entry.description, price=entry.price, stock=entry.stock,
+            image=entry.image, category_id=entry.category_id,
+            is_active=entry.is_active or activate,
+        )
+        for entry in archived
+    ]
+    # bulk_create fija created_at/updated_at al momento actual: updated_at
+    # debe quedar así (reinicia el plazo de archivo), created_at no
+    Product.objects.bulk_create(products)
+    for product, entry in zip(products, archived):
+        product.created_at = entry.created_at
+    Product.objects.bulk_update(products, ['created_at'])
+
+    # Solo las líneas de reservas que no se purgaron mientras tanto
+    reservation_ids = {item['reservation'] for entry in archived for item in entry.reservation_items}
+    existing = set(
+        StockReservation.objects.filter(pk__in=reservation_ids).values_list('pk', flat=True)
+    ) if reservation_ids else set()
+    StockReservationItem.objects.bulk_create([
+        StockReservationItem(reservation_id=item['reservation'], product_id=entry.id, quantity=item['quantity'])
+        for entry in archived for item in entry.reservation_items
+        if item['reservation'] in existing
+    ])
+    ArchivedProduct.objects.filter(pk__in=[entry.pk for entry in archived]).delete()
+
+    active = [product for product in products if product.is_active]
+    if active:
+        _update_catalog(Counter(product.vendor_id for product in active), 1)
+        if search.is_supported():
+            # Con la categoría: el índice de búsqueda guarda su nombre
+            search.index_products(
+                Product.objects.filter(pk__in=[p.pk for p in active]).select_related('category')
+            )
+    return len(products)
+
+
+def restore_products(queryset, activate=False, chunk_size=None):
+    """
+    Devolver a ``products_product`` los productos archivados de ``queryset``.
+
+    Vuelven con su id, fecha de creación y estado (``activate`` los
+    reactiva). Devuelve cuántos se restauraron.
+    """
+    chunk_size = chunk_size or settings.PRODUCT_ARCHIVE_CHUNK_SIZE
+    restored = last_pk = 0
+    while True:
+        with write_turn(), transaction.atomic():
+            archived = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:chunk_size])
+            if not archived:
+                break
+            restored += _restore_chunk(archived, activate)
+        last_pk = archived[-1].pk
+    return restored
+
+
+def database_size():
+    """``(bytes en uso, bytes libres)`` del archivo SQLite, según sus páginas."""
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA page_size')
+        page_size = cursor.fetchone()[0]
+        cursor.execute('PRAGMA page_count')
+        page_count = cursor.fetchone()[0]
+        cursor.execute('PRAGMA freelist_count')
+        free_pages = cursor.fetchone()[0]
+    return page_size * page_count, page_size * free_pages
+
+
+def table_size(model=Product):
+    """
+    Bytes que ocupan la tabla de ``model`` y sus índices, o ``None`` si
+    SQLite se compiló sin la tabla virtual ``dbstat``.
+    """
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                'SELECT SUM(pgsize) FROM dbstat WHERE name IN '
+                '(SELECT name FROM sqlite_master WHERE tbl_name = %s)',
+                [model._meta.db_table]
+            )
+        except DatabaseError:
+            return None
+        return cursor.fetchone()[0] or 0
+
+
+def compact_database(vacuum=True, analyze=True):
+    """
+    ``VACUUM`` (reescribe el archivo sin las páginas libres) y/o ``ANALYZE``
+    (actualiza las estadísticas del planificador). Devuelve el tamaño en
+    bytes antes y después.
+    """
+    before, _ = database_size()
+    with write_turn(), connection.cursor() as cursor:
+        if vacuum:
+            cursor.execute('VACUUM')
+        if analyze:
+            cursor.execute('ANALYZE')
+    after, _ = database_size()
+    return before, after
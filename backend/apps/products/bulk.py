@@ -0,0 +1,166 @@
+"""
+Carga masiva de productos de un vendedor.
+
+Valida cada elemento con las reglas de ProductCreateSerializer y escribe con
+``bulk_create``/``bulk_update`` en transacciones por bloque. Como las
+operaciones masivas no disparan señales, aquí se actualizan explícitamente
+el contador de productos activos, el índice de búsqueda y la versión del
+catálogo.
+"""
+
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import search
+from .categories import category_slug, get_or_create_category
+from .models import Product
+from .serializers import ProductBulkItemSerializer
+from .signals import update_vendor_products_count
+from apps.core.cache import bump_catalog_version
+from apps.core.writes import write_turn
+
+NOT_FOUND_ERROR = {'id': ['Producto no encontrado o no pertenece a tu tienda.']}
+DUPLICATE_ERROR = {'id': ['Producto repetido en la misma carga.']}
+
+
+def _validate(items):
+    """
+    Validar todos los elementos reutilizando dos instancias de serializer
+    (creación y actualización parcial) en lugar de una por elemento.
+    """
+    create_serializer = ProductBulkItemSerializer()
+    update_serializer = ProductBulkItemSerializer(partial=True)
+    valid, errors = [], {}
+    for index, item in enumerate(items):
+        serializer = update_serializer if 'id' in item else create_serializer
+        try:
+            valid.append((index, serializer.run_validation(item)))
+        except serializers.ValidationError as exc:
+            errors[index] = exc.detail
+    return valid, errors
+
+
+def bulk_upsert(vendor, items, chunk_size=None):
+    """
+    Crear, actualizar o desactivar productos de ``vendor`` en bloque.
+
+    Devuelve un resumen con el resultado de cada elemento (en el orden de
+    entrada) y el rendimiento en elementos por segundo.
+    """
+    started = time.perf_counter()
+    chunk_size = chunk_size or settings.PRODUCT_BULK_CHUNK_SIZE
+    results = [None] * len(items)
+
+    valid, errors = _validate(items)
+    for index, detail in errors.items():
+        results[index] = {'index': index, 'status': 'error', 'errors': detail}
+
+    # Propiedad: solo productos del vendedor (misma regla que IsProductVendorOwner)
+    ids = {data['id'] for _, data in valid if 'id' in data}
+    # Con la categoría: el índice de búsqueda guarda su nombre
+    existing = (
+        Product.objects.filter(vendor=vendor, pk__in=ids).select_related('category').in_bulk()
+        if ids else {}
+    )
+
+    operations = []
+    seen_ids = set()
+    for index, data in valid:
+        pk = data.pop('id', None)
+        if pk is None:
+            operations.append((index, Product(vendor=vendor), None, data))
+            continue
+        if pk not in existing:
+            results[index] = {'index': index, 'status': 'error', 'errors': NOT_FOUND_ERROR}
+            continue
+        if pk in seen_ids:
+            results[index] = {'index': index, 'status': 'error', 'errors': DUPLICATE_ERROR}
+            continue
+        seen_ids.add(pk)
+        product = existing[pk]
+        operations.append((index, product, product.is_active, data))
+
+    for start in range(0, len(operations), chunk_size):
+        chunk = operations[start:start + chunk_size]
+        try:
+            _write_chunk(vendor, chunk)
+        except DatabaseError as exc:
+            for index, *_ in chunk:
+                results[index] = {
+                    'index': index, 'status': 'error',
+                    'errors': {'non_field_errors': [str(exc)]}
+                }
+            continue
+        for index, product, was_active, data in chunk:
+            results[index] = {
+                'index': index,
+                'status': 'created' if was_active is None else 'updated',
+                'id': product.pk,
+            }
+
+    if any(r['status'] != 'error' for r in results):
+        bump_catalog_version(vendor.pk)
+
+    elapsed = time.perf_counter() - started
+    created = sum(1 for r in results if r['status'] == 'created')
+    updated = sum(1 for r in results if r['status'] == 'updated')
+    return {
+        'total': len(items),
+        'created': created,
+        'updated': updated,
+        'errors': len(items) - created - updated,
+        'elapsed_ms': round(elapsed * 1000, 2),
+        'items_per_second': round(len(items) / elapsed, 1) if elapsed else None,
+        'results': results,
+    }
+
+
+def _resolve_categories(chunk):
+    """
+    Cambiar los nombres de categoría validados por la categoría, creando las
+    nuevas una sola vez por bloque.
+    """
+    categories = {}
+    for _, _, _, data in chunk:
+        name = data.get('category')
+        if name:
+            slug = category_slug(name)
+            if slug not in categories:
+                categories[slug] = get_or_create_category(name)
+            data['category'] = categories[slug]
+
+
+def _write_chunk(vendor, chunk):
+    to_create, to_update = [], []
+    update_fields = {'updated_at'}
+    delta = 0
+
+    # Las categorías nuevas se crean en la transacción del bloque: si falla,
+    # no quedan categorías sin productos
+    with write_turn(), transaction.atomic():
+        _resolve_categories(chunk)
+        now = timezone.now()
+        for _, product, was_active, data in chunk:
+            for field, value in data.items():
+                setattr(product, field, value)
+            if was_active is None:
+                to_create.append(product)
+                delta += int(product.is_active)
+                continue
+            product.updated_at = now
+            update_fields.update(data)
+            delta += int(product.is_active) - int(was_active)
+            to_update.append(product)
+
+        if to_create:
+            Product.objects.bulk_create(to_create)
+        if to_update:
+            Product.objects.bulk_update(to_update, sorted(update_fields))
+        if delta:
+            update_vendor_products_count(vendor.pk, delta, using='default')
+        if search.is_supported():
+            search.index_products(to_create + to_update)
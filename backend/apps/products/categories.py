@@ -0,0 +1,68 @@
+"""
+Normalización de categorías y mapa cacheado slug -> categoría.
+
+Los nombres se comparan por su slug (``slugify``: sin tildes, mayúsculas ni
+signos), así que "Artesanías", "artesanias" y " ARTESANÍAS " son la misma
+categoría. El mapa de todas las categorías (son pocas) se guarda en la caché
+de Django, de modo que ``?category=`` y las escrituras resuelven el nombre a
+un id sin consultar la tabla; las señales de ``Category`` lo invalidan.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.text import slugify
+
+from .models import Category
+
+CATEGORY_MAP_KEY = 'catalog:categories'
+
+
+def category_slug(name):
+    """Clave de comparación de un nombre de categoría (vacía si no tiene letras ni dígitos)."""
+    return slugify(name or '')[:100]
+
+
+def category_map():
+    """Diccionario ``slug -> (id, nombre)`` de todas las categorías."""
+    mapping = cache.get(CATEGORY_MAP_KEY)
+    if mapping is None:
+        mapping = {
+            slug: (pk, name)
+            for pk, slug, name in Category.objects.values_list('pk', 'slug', 'name')
+        }
+        cache.set(CATEGORY_MAP_KEY, mapping, settings.CATALOG_CACHE_TIMEOUT)
+    return mapping
+
+
+def invalidate_category_map():
+    cache.delete(CATEGORY_MAP_KEY)
+
+
+def _from_map(slug, entry):
+    pk, name = entry
+    return Category.from_db(None, ['id', 'name', 'slug'], [pk, name, slug])
+
+
+def find_category(name):
+    """Categoría existente con el slug de ``name``, o ``None``."""
+    slug = category_slug(name)
+    if not slug:
+        return None
+    entry = category_map().get(slug)
+    if entry is not None:
+        return _from_map(slug, entry)
+    # Creada después de cargar el mapa (por ejemplo, en otro proceso)
+    category = Category.objects.filter(slug=slug).first()
+    if category is not None:
+        invalidate_category_map()
+    return category
+
+
+def get_or_create_category(name):
+    """Categoría con el slug de ``name``, creándola con ese nombre si no existe."""
+    category = find_category(name)
+    if category is None and category_slug(name):
+        category, _ = Category.objects.get_or_create(
+            slug=category_slug(name), defaults={'name': name.strip()}
+        )
+    return category
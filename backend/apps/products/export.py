@@ -0,0 +1,65 @@
+"""
+Exportación en streaming del catálogo de productos (NDJSON o CSV).
+
+Las filas se leen con ``.values()`` e ``iterator(chunk_size=...)``, con los
+nombres del vendedor y de la categoría en la misma consulta, y se escriben a medida que se
+leen: la memoria usada no depende del tamaño del catálogo.
+"""
+
+import csv
+import json
+
+from django.db.models import F
+from django.utils import timezone
+
+EXPORT_FIELDS = [
+    'id', 'name', 'description', 'price', 'stock', 'image', 'category',
+    'vendor_id', 'vendor_name', 'created_at', 'updated_at',
+]
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _datetime(value):
+    # Mismo formato que DateTimeField de DRF (zona horaria local)
+    return timezone.localtime(value).isoformat()
+
+
+CONVERTERS = {
+    'price': str,
+    'created_at': _datetime,
+    'updated_at': _datetime,
+}
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Iterar las filas de exportación ya convertidas a tipos JSON/CSV."""
+    fields = [f for f in EXPORT_FIELDS if f not in ('category', 'vendor_name')]
+    rows = queryset.values(
+        *fields, category_name=F('category__name'), vendor_name=F('vendor__business_name')
+    )
+    converters = [(field, CONVERTERS[field]) for field in EXPORT_FIELDS if field in CONVERTERS]
+    for row in rows.iterator(chunk_size=chunk_size):
+        row['category'] = row.pop('category_name')
+        for field, convert in converters:
+            row[field] = convert(row[field])
+        yield row
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+class _Echo:
+    """Buffer de una sola línea para csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
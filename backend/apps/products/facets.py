@@ -0,0 +1,85 @@
+"""
+Facetas del catálogo: conteos por categoría y por vendedor e histograma de
+precios sobre el queryset filtrado del listado.
+
+Todo se calcula con agregaciones en la base de datos: una consulta para el
+total, el rango de precios y todas las franjas del histograma (``COUNT`` con
+``FILTER`` por franja) y una consulta agrupada por cada faceta. Las franjas
+tienen límites fijos (``PRODUCT_PRICE_HISTOGRAM_EDGES``), de modo que se
+comparan como ``Decimal`` sin redondeos y la respuesta se puede cachear.
+"""
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Min, Q
+
+# Vendedores con más productos que se devuelven en la faceta
+VENDOR_FACET_LIMIT = 20
+
+
+def price_buckets(edges=None):
+    """Franjas ``(mínimo, máximo)`` del histograma; ``None`` = sin límite."""
+    edges = sorted(set(settings.PRODUCT_PRICE_HISTOGRAM_EDGES if edges is None else edges))
+    return list(zip([None, *edges], [*edges, None]))
+
+
+def _bucket_filter(low, high):
+    condition = Q()
+    if low is not None:
+        condition &= Q(price__gte=low)
+    if high is not None:
+        condition &= Q(price__lt=high)
+    return condition
+
+
+def compute_facets(queryset, edges=None):
+    """
+    Facetas del ``queryset`` de productos (con sus filtros y búsqueda).
+
+    Devuelve un diccionario con la forma de ``ProductFacetsSerializer``.
+    """
+    # Los productos filtrados como subconsulta de ids: las agregaciones no
+    # arrastran el ORDER BY ni las anotaciones del listado (ranking de búsqueda)
+    queryset = queryset.model._default_manager.using(queryset.db).filter(
+        pk__in=queryset.order_by().values('pk')
+    )
+
+    buckets = price_buckets(edges)
+    stats = queryset.aggregate(
+        total=Count('pk'),
+        min_price=Min('price'),
+        max_price=Max('price'),
+        **{
+            f'bucket_{index}': Count('pk', filter=_bucket_filter(low, high))
+            for index, (low, high) in enumerate(buckets)
+        }
+    )
+
+    # Agrupado por el id de la categoría; el nombre viene de la misma fila
+    categories = (
+        queryset.values('category_id', category_name=F('category__name'))
+        .annotate(count=Count('pk'))
+        .order_by('-count', 'category_name', 'category_id')
+    )
+    vendors = (
+        queryset.values('vendor_id', business_name=F('vendor__business_name'))
+        .annotate(count=Count('pk'))
+        .order_by('-count', 'business_name', 'vendor_id')[:VENDOR_FACET_LIMIT]
+    )
+    return {
+        'total': stats['total'],
+        'categories': [
+            {'value': row['category_name'], 'count': row['count']} for row in categories
+        ],
+        'vendors': [
+            {'id': row['vendor_id'], 'business_name': row['business_name'], 'count': row['count']}
+            for row in vendors
+        ],
+        'price': {
+            'min': stats['min_price'],
+            'max': stats['max_price'],
+            'histogram': [
+                {'min': low, 'max': high, 'count': stats[f'bucket_{index}']}
+                for index, (low, high) in enumerate(buckets)
+            ],
+        },
+    }
@@ -0,0 +1,92 @@
+import django_filters
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from . import search
+from .categories import find_category
+from .models import Product
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """Lista de textos separados por comas."""
+
+
+class ProductFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de productos.
+
+    ``category`` y ``category__in`` aceptan nombres de categoría (sin
+    distinguir mayúsculas ni tildes) y se resuelven a ids con el mapa
+    cacheado de categorías, de modo que el filtro compara enteros sobre
+    ``product_category_created_idx``. Los rangos de precio y fechas e
+    ``in_stock`` se evalúan sobre los índices parciales de ``Product``, que
+    incluyen las columnas de todos estos filtros.
+    """
+
+    category = django_filters.CharFilter(method='filter_category', label='Categoría')
+    category__in = CharInFilter(
+        method='filter_category_in', label='Categorías separadas por comas'
+    )
+    min_price = django_filters.NumberFilter(
+        field_name='price', lookup_expr='gte', label='Precio mínimo (incluido)'
+    )
+    max_price = django_filters.NumberFilter(
+        field_name='price', lookup_expr='lte', label='Precio máximo (incluido)'
+    )
+    in_stock = django_filters.BooleanFilter(
+        method='filter_in_stock', label='true: con stock; false: agotados'
+    )
+    created_after = django_filters.DateTimeFilter(
+        field_name='created_at', lookup_expr='gte',
+        label='Creados desde (fecha o fecha y hora ISO 8601)'
+    )
+    updated_since = django_filters.DateTimeFilter(
+        field_name='updated_at', lookup_expr='gte',
+        label='Actualizados desde (fecha o fecha y hora ISO 8601)'
+    )
+
+    class Meta:
+        model = Product
+        fields = ['category', 'vendor']
+
+    def filter_category(self, queryset, name, value):
+        category = find_category(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category_id=category.pk)
+
+    def filter_category_in(self, queryset, name, value):
+        ids = {category.pk for category in map(find_category, value) if category is not None}
+        if not ids:
+            return queryset.none()
+        return queryset.filter(category_id__in=sorted(ids))
+
+    def filter_in_stock(self, queryset, name, value):
+        # "stock <> 0" en lugar de "stock > 0": el rango casi no descarta filas
+        # y haría que el planificador prefiriera el índice de stock sobre el
+        # del ordenamiento o el de un filtro más selectivo
+        return queryset.exclude(stock=0) if value else queryset.filter(stock=0)
+
+
+class ProductSearchFilter(filters.SearchFilter):
+    """
+    Búsqueda de productos sobre el índice de texto completo.
+
+    Los resultados se ordenan por relevancia salvo que el cliente pida un
+    ``ordering`` explícito. En bases de datos sin FTS5 se usa la búsqueda
+    ``icontains`` de SearchFilter. Debe ir después de OrderingFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not search.is_supported(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        text = request.query_params.get(self.search_param, '')
+        results = search.search(queryset, text)
+        if results is queryset:
+            return queryset
+
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            ordering = getattr(view, 'ordering', None) or []
+            results = results.order_by('search_rank', *ordering, 'id')
+        return results
@@ -0,0 +1,181 @@
+"""
+Ruta rápida de solo lectura para los listados de productos.
+
+``ProductListSerializer`` instancia un ``Product`` (y su ``Vendor``) por fila
+y pasa cada atributo por un campo de DRF. Para los listados basta con las
+columnas: ``ValuesSerializer`` lee filas de ``.values()`` con los nombres del
+vendedor y de la categoría en la misma consulta y las convierte en diccionarios con un
+conversor precalculado por campo, equivalente a ``to_representation`` del
+campo de DRF. La salida es idéntica a la del serializer (ver
+``apps/products/tests/test_listing.py``).
+"""
+
+import decimal
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F
+from rest_framework import ISO_8601, fields as drf_fields
+from rest_framework.relations import RelatedField
+from rest_framework.serializers import BaseSerializer
+from rest_framework.settings import api_settings
+
+from apps.core.metrics import timed_phase
+
+from .serializers import ProductListSerializer
+
+# Campos cuyo to_representation no cambia los valores que entrega .values()
+# (str, int o bool según la columna)
+PASSTHROUGH_FIELDS = (
+    drf_fields.CharField, drf_fields.IntegerField, drf_fields.BooleanField,
+)
+
+# Necesitan el objeto completo o más de una columna
+UNSUPPORTED_FIELDS = (
+    BaseSerializer, RelatedField, drf_fields.ListField, drf_fields.DictField,
+    drf_fields.HiddenField,
+)
+
+
+def _identity(value):
+    return value
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.decimal_places is None or field.normalize_output or field.localize or not coerce_to_string:
+        return field.to_representation
+
+    # Lo mismo que DecimalField.quantize, con el contexto creado una vez
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    rounding = field.rounding
+
+    def convert(value):
+        return f'{value.quantize(exponent, rounding=rounding, context=context):f}'
+    return convert
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        # Las columnas DateTimeField llegan como datetime con zona (USE_TZ)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+class ValuesSerializer:
+    """
+    Versión de solo lectura de un ``ModelSerializer`` sobre filas de ``.values()``.
+
+    Acepta campos del modelo y campos de solo lectura con ``source`` a través
+    de relaciones (``vendor.business_name``), que se leen con ``F()`` en la
+    misma consulta. Cualquier otro tipo de campo se convierte con su propio
+    ``to_representation``.
+    """
+
+    def __init__(self, serializer_class):
+        model_fields = {
+            key for field in serializer_class.Meta.model._meta.concrete_fields
+            for key in (field.name, field.attname)
+        }
+        self.fields = {}
+        self.columns = []
+        self.expressions = {}
+        # Clave de cada campo en las filas: un alias si el nombre del campo
+        # coincide con un campo del modelo distinto de su source
+        self.keys = {}
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if field.source == '*' or isinstance(field, UNSUPPORTED_FIELDS):
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{name}: campo no soportado por ValuesSerializer.'
+                )
+            self.fields[name] = field
+            if field.source == name:
+                self.columns.append(name)
+                self.keys[name] = name
+            else:
+                key = f'{name}_value' if name in model_fields else name
+                self.expressions[key] = F(field.source.replace('.', '__'))
+                self.keys[name] = key
+
+    def values(self, queryset, fields=None):
+        """
+        Queryset de diccionarios con las columnas de ``fields`` (por defecto
+        todos los campos del serializer).
+
+        Incluye además las columnas y anotaciones del ordenamiento, que la
+        paginación keyset usa para construir el cursor. No se debe encadenar
+        más filtros sobre el resultado (el conteo usa el queryset original).
+        """
+        selected = self.fields if fields is None else fields
+        columns = [name for name in self.columns if name in selected]
+        expressions = {
+            self.keys[name]: self.expressions[self.keys[name]]
+            for name in selected if self.keys[name] in self.expressions
+        }
+        # La pk siempre: es el desempate del cursor aunque no esté en el
+        # ordenamiento ni en ``fields`` (los conversores ignoran lo no pedido)
+        pk_name = queryset.model._meta.pk.attname
+        ordering = [
+            field.lstrip('-') for field in queryset.query.order_by or queryset.model._meta.ordering
+            if isinstance(field, str)
+        ]
+        for name in ordering + [pk_name]:
+            name = pk_name if name == 'pk' else name
+            if name not in columns and name not in expressions:
+                columns.append(name)
+        rows = queryset.values(*columns, **expressions)
+        # El COUNT(*) de la paginación sobre el queryset original: en el de
+        # .values() conservaría el JOIN de las columnas relacionadas
+        rows.count = queryset.count
+        return rows
+
+    def converters(self, fields=None):
+        """
+        ``(nombre, clave en la fila, conversor)`` por campo; la zona horaria es
+        la activa al llamar.
+        """
+        converters = []
+        for name, field in self.fields.items():
+            if fields is not None and name not in fields:
+                continue
+            if type(field) is drf_fields.DecimalField:
+                convert = _decimal_converter(field)
+            elif type(field) is drf_fields.DateTimeField:
+                convert = _datetime_converter(field)
+            elif isinstance(field, PASSTHROUGH_FIELDS):
+                convert = _identity
+            else:
+                convert = field.to_representation
+            converters.append((name, self.keys[name], convert))
+        return converters
+
+    def to_representation(self, rows, fields=None):
+        """
+        Lista de diccionarios igual a ``serializer_class(objs, many=True).data``.
+
+        Se mide en la fase ``serialize``; el SQL de evaluar ``rows`` cuenta en ``db``.
+        """
+        converters = self.converters(fields)
+        with timed_phase('serialize'):
+            return [
+                {
+                    name: None if row[key] is None else convert(row[key])
+                    for name, key, convert in converters
+                }
+                for row in rows
+            ]
+
+
+product_list = ValuesSerializer(ProductListSerializer)
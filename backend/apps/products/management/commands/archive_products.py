@@ -0,0 +1,83 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.products.archive import (
+    archivable_products, archive_products, compact_database, database_size, table_size,
+)
+
+MIB = 1024 * 1024
+
+
+class Command(BaseCommand):
+    help = (
+        'Mueve a la tabla de archivo los productos desactivados (o de vendedores desactivados) '
+        'hace más de PRODUCT_ARCHIVE_AFTER_DAYS días, con sus líneas de reserva, en '
+        'transacciones por bloque. Con --vacuum/--analyze compacta la base al terminar e '
+        'informa el espacio recuperado. Pensado para cron (por ejemplo, cada noche).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.PRODUCT_ARCHIVE_AFTER_DAYS,
+            help='Días desde la desactivación (por defecto PRODUCT_ARCHIVE_AFTER_DAYS).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.PRODUCT_ARCHIVE_CHUNK_SIZE,
+            help='Productos por transacción.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo contar los productos que se archivarían.'
+        )
+        parser.add_argument(
+            '--vacuum', action='store_true',
+            help='Ejecutar VACUUM al terminar (reescribe el archivo; bloquea las escrituras mientras dura).'
+        )
+        parser.add_argument('--analyze', action='store_true', help='Ejecutar ANALYZE al terminar.')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['chunk_size'] < 1:
+            raise CommandError('--days no puede ser negativo y --chunk-size debe ser positivo.')
+        if (options['vacuum'] or options['analyze']) and connection.vendor != 'sqlite':
+            raise CommandError('--vacuum y --analyze solo están disponibles con SQLite.')
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        if options['dry_run']:
+            count = archivable_products(cutoff).count()
+            self.stdout.write(f'{count} productos se archivarían (inactivos desde antes de {cutoff:%Y-%m-%d}).')
+            return
+
+        sqlite = connection.vendor == 'sqlite'
+        hot_before = table_size() if sqlite else None
+        started = time.perf_counter()
+        products, items = archive_products(cutoff, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{products} productos archivados ({items} líneas de reserva) '
+            f'en {time.perf_counter() - started:.1f} s.'
+        ))
+
+        if not sqlite:
+            return
+        if options['vacuum'] or options['analyze']:
+            before, after = compact_database(vacuum=options['vacuum'], analyze=options['analyze'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Base: {before / MIB:.1f} MiB -> {after / MIB:.1f} MiB '
+                f'({(before - after) / MIB:.1f} MiB recuperados).'
+            ))
+        else:
+            _, free = database_size()
+            self.stdout.write(
+                f'{free / MIB:.1f} MiB libres dentro del archivo: se reutilizan en las próximas '
+                'escrituras; --vacuum los devuelve al disco.'
+            )
+        # Sin VACUUM las páginas a medio vaciar siguen contando para la tabla
+        if hot_before is not None:
+            hot_after = table_size()
+            self.stdout.write(
+                f'products_product e índices: {hot_before / MIB:.1f} MiB -> {hot_after / MIB:.1f} MiB.'
+            )
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.products.stock import expire_reservations, purge_reservations
+
+
+class Command(BaseCommand):
+    help = (
+        'Devuelve al stock las unidades de las reservas vencidas y borra las reservas '
+        'cerradas hace más de STOCK_RESERVATION_RETENTION_DAYS días. Pensado para cron '
+        '(por ejemplo, cada minuto).'
+    )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = expire_reservations(now)
+        purged = purge_reservations(now - timedelta(days=settings.STOCK_RESERVATION_RETENTION_DAYS))
+        self.stdout.write(self.style.SUCCESS(
+            f'{expired} reservas vencidas liberadas, {purged} reservas cerradas eliminadas.'
+        ))
@@ -0,0 +1,342 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.cache import bump_catalog_version
+from apps.products import search
+from apps.products.categories import get_or_create_category
+from apps.products.models import Product
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+SYNTHETIC_DOMAIN = 'dataset.fullcolombiano.test'
+SYNTHETIC_PASSWORD = 'Colombia2024!'
+
+# Datos de demostración (credenciales documentadas en el README)
+DEMO_ACCOUNTS = [
+    {
+        'user': {
+            'email': 'maria@fullcolombiano.com', 'username': 'maria',
+            'first_name': 'María', 'last_name': 'Rodríguez',
+        },
+        'vendor': {
+            'business_name': 'Café del Eje',
+            'description': 'Café premium del Eje Cafetero, cultivado artesanalmente en las montañas de Quindío',
+            'city': 'Armenia', 'phone': '+57 300 123 4567',
+        },
+        'products': [
+            {
+                'name': 'Café Especial Colombia 500g',
+                'description': 'Café 100% arábica cultivado a 1800 metros de altura. Notas de chocolate, caramelo y frutas rojas. Tostado medio.',
+                'price': 45000, 'stock': 50, 'category': 'Alimentos',
+                'image': 'https://images.unsplash.com/photo-1447933601403-0c6688de566e?w=500',
+            },
+            {
+                'name': 'Café Orgánico Premium 250g',
+                'description': 'Café orgánico certificado, proceso de fermentación controlada. Perfil dulce y balanceado.',
+                'price': 35000, 'stock': 30, 'category': 'Alimentos',
+                'image': 'https://images.unsplash.com/photo-1559056199-641a0ac8b55e?w=500',
+            },
+            {
+                'name': 'Café Descafeinado 250g',
+                'description': 'Café descafeinado por método suizo. Mantiene todo el sabor sin la cafeína.',
+                'price': 38000, 'stock': 25, 'category': 'Alimentos',
+                'image': 'https://images.unsplash.com/photo-1509042239860-f550ce710b93?w=500',
+            },
+        ],
+    },
+    {
+        'user': {
+            'email': 'carlos@fullcolombiano.com', 'username': 'carlos',
+            'first_name': 'Carlos', 'last_name': 'Sánchez',
+        },
+        'vendor': {
+            'business_name': 'Artesanías Wayuu',
+            'description': 'Mochilas y artesanías auténticas hechas a mano por comunidades indígenas Wayuu',
+            'city': 'Riohacha', 'phone': '+57 311 234 5678',
+        },
+        'products': [
+            {
+                'name': 'Mochila Wayuu Grande',
+                'description': 'Mochila tejida a mano con diseños tradicionales. 100% algodón. Tiempo de elaboración: 20 días.',
+                'price': 180000, 'stock': 10, 'category': 'Artesanías',
+                'image': 'https://images.unsplash.com/photo-1590874103328-eac38a683ce7?w=500',
+            },
+            {
+                'name': 'Mochila Wayuu Mediana',
+                'description': 'Mochila versátil con colores vibrantes. Perfecta para el día a día. Hecha por artesanas Wayuu.',
+                'price': 120000, 'stock': 15, 'category': 'Artesanías',
+                'image': 'https://images.unsplash.com/photo-1547949003-9792a18a2601?w=500',
+            },
+            {
+                'name': 'Pulsera Wayuu - Set de 3',
+                'description': 'Set de 3 pulseras tejidas a mano con hilos de colores. Diseño tradicional Wayuu.',
+                'price': 35000, 'stock': 40, 'category': 'Artesanías',
+                'image': 'https://images.unsplash.com/photo-1611591437281-460bfbe1220a?w=500',
+            },
+        ],
+    },
+]
+
+FIRST_NAMES = [
+    'María', 'José', 'Luis', 'Ana', 'Carlos', 'Juan', 'Laura', 'Andrés', 'Camila',
+    'Valentina', 'Santiago', 'Daniela', 'Felipe', 'Sofía', 'Alejandro', 'Mariana',
+]
+LAST_NAMES = [
+    'Rodríguez', 'Gómez', 'González', 'Martínez', 'García', 'López', 'Hernández',
+    'Sánchez', 'Ramírez', 'Pérez', 'Díaz', 'Muñoz', 'Rojas', 'Moreno', 'Jiménez',
+]
+CITIES = [
+    'Bogotá', 'Medellín', 'Cali', 'Barranquilla', 'Cartagena', 'Bucaramanga',
+    'Pereira', 'Manizales', 'Armenia', 'Santa Marta', 'Pasto', 'Riohacha', 'Popayán',
+]
+BUSINESS_PREFIXES = ['Tienda', 'Artesanías', 'Sabores', 'Café', 'Taller', 'Casa', 'Raíces', 'Tejidos']
+BUSINESS_SUFFIXES = ['del Eje', 'de la Sierra', 'del Caribe', 'Andina', 'del Pacífico', 'Llanera', 'Paisa', 'Wayuu']
+
+# Categoría -> (peso, productos, rango de precios en COP)
+CATEGORIES = {
+    'Alimentos': (35, ['Café', 'Panela', 'Chocolate', 'Arequipe', 'Bocadillo', 'Miel', 'Cacao'], (8000, 90000)),
+    'Artesanías': (25, ['Mochila', 'Sombrero vueltiao', 'Hamaca', 'Canasto', 'Pulsera', 'Chinchorro'], (20000, 450000)),
+    'Ropa': (15, ['Ruana', 'Camisa', 'Poncho', 'Guayabera', 'Alpargatas', 'Bolso'], (30000, 250000)),
+    'Hogar': (10, ['Vajilla', 'Cojín', 'Tapete', 'Lámpara', 'Jarrón'], (25000, 300000)),
+    'Bebidas': (8, ['Aguardiente', 'Ron', 'Aromática', 'Té de coca'], (15000, 120000)),
+    '': (7, ['Kit', 'Regalo', 'Combo'], (10000, 200000)),
+}
+ADJECTIVES = ['artesanal', 'orgánico', 'premium', 'tradicional', 'hecho a mano', 'especial', 'clásico', 'de origen']
+ORIGINS = ['del Huila', 'de Nariño', 'del Cauca', 'de la Guajira', 'de Boyacá', 'del Quindío', 'de Santander', 'del Tolima']
+SIZES = ['250g', '500g', '1kg', 'pequeño', 'mediano', 'grande', 'x2', 'x6']
+SENTENCES = [
+    'Elaborado por productores locales con técnicas tradicionales.',
+    'Ideal para regalar o para disfrutar en casa.',
+    'Materiales seleccionados y proceso 100% colombiano.',
+    'Envío a todo el país en empaque protector.',
+    'Cada pieza es única y puede variar ligeramente.',
+    'Cultivado en pequeñas fincas familiares.',
+    'Comercio justo con comunidades campesinas e indígenas.',
+    'Notas de chocolate, caramelo y frutas rojas.',
+    'Tejido a mano con hilos de colores vibrantes.',
+]
+
+# Columnas de las filas que arma build_product_row
+PRODUCT_COLUMNS = [
+    'vendor', 'name', 'description', 'price', 'stock', 'image', 'category',
+    'is_active', 'created_at', 'updated_at',
+]
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Permitir asignar created_at/updated_at a mano durante bulk_create."""
+    fields = [model._meta.get_field('created_at'), model._meta.get_field('updated_at')]
+    saved = [(f.auto_now, f.auto_now_add) for f in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera un dataset sintético reproducible (usuarios, vendedores y productos) '
+        'para pruebas de carga y benchmarks. Incluye las cuentas de demostración.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Usuarios sintéticos (>= vendors).')
+        parser.add_argument('--vendors', type=int, default=5, help='Vendedores sintéticos.')
+        parser.add_argument(
+            '--products-per-vendor', type=int, default=20,
+            help='Promedio de productos por vendedor (la distribución es sesgada).'
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Semilla para resultados reproducibles.')
+        parser.add_argument('--inactive-ratio', type=float, default=0.05, help='Fracción de productos inactivos.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Filas por bulk_create.')
+        parser.add_argument('--no-demo', action='store_true', help='No crear las cuentas de demostración.')
+
+    def handle(self, *args, **options):
+        if options['vendors'] > options['users']:
+            raise CommandError('--users debe ser mayor o igual que --vendors.')
+        if options['users'] and User.objects.filter(email__endswith=f'@{SYNTHETIC_DOMAIN}').exists():
+            raise CommandError(
+                'Ya existe un dataset sintético en esta base de datos; usa una base nueva '
+                '(por ejemplo: borrar db.sqlite3 y ejecutar migrate).'
+            )
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        started = time.perf_counter()
+
+        if not options['no_demo']:
+            self.create_demo_data()
+
+        vendors = self.create_vendors(options['users'], options['vendors'])
+        total = self.create_products(
+            vendors, options['products_per_vendor'], options['inactive_ratio']
+        )
+
+        if search.is_supported():
+            search.rebuild_index()
+        bump_catalog_version()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Dataset generado en {elapsed:.1f}s: {options['users']} usuarios, "
+            f"{len(vendors)} vendedores, {total} productos "
+            f"({total / elapsed:,.0f} productos/s)."
+        ))
+        if not options['no_demo']:
+            self.stdout.write(
+                'Cuentas de demostración: maria@fullcolombiano.com y '
+                f'carlos@fullcolombiano.com (password: {SYNTHETIC_PASSWORD}).'
+            )
+
+    def create_demo_data(self):
+        """Crear (si no existen) las cuentas, tiendas y productos de demostración."""
+        for account in DEMO_ACCOUNTS:
+            user, created = User.objects.get_or_create(
+                email=account['user']['email'], defaults=account['user']
+            )
+            if created:
+                user.set_password(SYNTHETIC_PASSWORD)
+                user.save(update_fields=['password'])
+            vendor, _ = Vendor.objects.get_or_create(user=user, defaults=account['vendor'])
+            existing = set(vendor.products.values_list('name', flat=True))
+            for product in account['products']:
+                if product['name'] not in existing:
+                    Product.objects.create(
+                        vendor=vendor,
+                        **{**product, 'category': get_or_create_category(product['category'])}
+                    )
+
+    def create_vendors(self, user_count, vendor_count):
+        """Crear usuarios (un solo hash de contraseña para todos) y vendedores."""
+        if not user_count:
+            return []
+        # Hashear una vez: PBKDF2 por usuario dominaría el tiempo total
+        password = make_password(SYNTHETIC_PASSWORD)
+        rng = self.rng
+        users = [
+            User(
+                email=f'user{i}@{SYNTHETIC_DOMAIN}',
+                username=f'dataset_user_{i}',
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                password=password,
+                date_joined=self.now - timedelta(days=rng.uniform(30, 1095)),
+            )
+            for i in range(user_count)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=self.batch_size)
+
+        vendors = []
+        for i, user in enumerate(users[:vendor_count]):
+            created_at = user.date_joined + timedelta(days=rng.uniform(0, 30))
+            vendors.append(Vendor(
+                user=user,
+                business_name=f'{rng.choice(BUSINESS_PREFIXES)} {rng.choice(BUSINESS_SUFFIXES)} {i}',
+                description=' '.join(rng.sample(SENTENCES, 2)),
+                city=rng.choice(CITIES),
+                phone=f'+57 3{rng.randint(0, 29):02d} {rng.randint(100, 999)} {rng.randint(1000, 9999)}',
+                is_verified=rng.random() < 0.3,
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+        with explicit_timestamps(Vendor), transaction.atomic():
+            Vendor.objects.bulk_create(vendors, batch_size=self.batch_size)
+        return vendors
+
+    def vendor_sizes(self, vendor_count, per_vendor):
+        """Tamaños con cola larga (Pareto): pocos vendedores con muchos productos."""
+        weights = [self.rng.paretovariate(1.2) for _ in range(vendor_count)]
+        scale = vendor_count * per_vendor / sum(weights)
+        return [max(1, round(w * scale)) for w in weights]
+
+    def create_products(self, vendors, per_vendor, inactive_ratio):
+        if not vendors or per_vendor <= 0:
+            return 0
+        sizes = self.vendor_sizes(len(vendors), per_vendor)
+        total = sum(sizes)
+        categories = list(CATEGORIES)
+        category_weights = [CATEGORIES[c][0] for c in categories]
+        self.category_ids = {}
+        for name in categories:
+            category = get_or_create_category(name)
+            self.category_ids[name] = category.pk if category else None
+        is_active = PRODUCT_COLUMNS.index('is_active')
+
+        batch, created = [], 0
+        for vendor, size in zip(vendors, sizes):
+            active = 0
+            for _ in range(size):
+                row = self.build_product_row(vendor, categories, category_weights, inactive_ratio)
+                active += row[is_active]
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    created += self.write_batch(batch)
+                    batch = []
+                    self.stdout.write(f'  {created}/{total} productos')
+            vendor.active_products_count = active
+        if batch:
+            created += self.write_batch(batch)
+
+        with transaction.atomic():
+            Vendor.objects.bulk_update(vendors, ['active_products_count'], batch_size=self.batch_size)
+        return created
+
+    def build_product_row(self, vendor, categories, category_weights, inactive_ratio):
+        """Fila lista para INSERT, en el orden de PRODUCT_COLUMNS."""
+        rng = self.rng
+        ops = connection.ops
+        category = rng.choices(categories, category_weights)[0]
+        _, nouns, (low, high) = CATEGORIES[category]
+        noun = rng.choice(nouns)
+        # Precios log-uniformes redondeados a centenas de pesos
+        price = round(low * (high / low) ** rng.random(), -2)
+        created_at = vendor.created_at + (self.now - vendor.created_at) * rng.random()
+        updated_at = created_at + (self.now - created_at) * rng.random() ** 4
+        return (
+            vendor.pk,
+            f'{noun} {rng.choice(ADJECTIVES)} {rng.choice(ORIGINS)} {rng.choice(SIZES)}',
+            f'{noun} {rng.choice(ADJECTIVES)}. ' + ' '.join(rng.sample(SENTENCES, 3)),
+            ops.adapt_decimalfield_value(Decimal(price), 10, 2),
+            0 if rng.random() < 0.1 else int(rng.expovariate(1 / 40)),
+            '',
+            self.category_ids[category],
+            rng.random() >= inactive_ratio,
+            ops.adapt_datetimefield_value(created_at),
+            ops.adapt_datetimefield_value(updated_at),
+        )
+
+    def write_batch(self, rows):
+        """
+        Insertar un bloque con ``executemany``.
+
+        Se evita ``bulk_create`` porque compilar el SQL y preparar cada campo
+        de millones de instancias domina el tiempo; el índice de búsqueda, el
+        contador de productos y la versión del catálogo se actualizan al final.
+        """
+        table = connection.ops.quote_name(Product._meta.db_table)
+        columns = ', '.join(
+            connection.ops.quote_name(Product._meta.get_field(name).column)
+            for name in PRODUCT_COLUMNS
+        )
+        placeholders = ', '.join(['%s'] * len(PRODUCT_COLUMNS))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', rows
+            )
+        return len(rows)
@@ -0,0 +1,243 @@
+import csv
+import json
+import os
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework import serializers
+
+from apps.core.cache import bump_catalog_version
+from apps.core.writes import write_turn
+from apps.products import search
+from apps.products.categories import category_slug, get_or_create_category
+from apps.products.models import Product
+from apps.products.serializers import ProductCreateSerializer
+from apps.products.signals import update_vendor_products_count
+from apps.vendors.models import Vendor
+
+
+class OffsetLines:
+    """
+    Itera las líneas de un archivo binario llevando el offset en bytes.
+
+    csv.reader solo consume las líneas que necesita para cada fila, así que
+    después de cada fila ``offset`` apunta justo al inicio de la siguiente.
+    """
+
+    def __init__(self, fh, start=0):
+        self.fh = fh
+        self.offset = start
+        fh.seek(start)
+
+    def __iter__(self):
+        for raw in iter(self.fh.readline, b''):
+            self.offset += len(raw)
+            yield raw.decode('utf-8')
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa productos desde un archivo CSV o NDJSON en bloques con bulk_create. '
+        'Omite los productos ya existentes (mismo vendedor y nombre) y permite '
+        'reanudar desde el último bloque confirmado.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Archivo .csv o .ndjson a importar.')
+        parser.add_argument(
+            '--format', choices=['csv', 'ndjson'],
+            help='Formato del archivo (por defecto según la extensión).'
+        )
+        parser.add_argument(
+            '--vendor', type=int,
+            help='vendor_id para las filas que no lo indiquen.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Filas por bloque/transacción (por defecto 1000).'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Archivo de checkpoint (por defecto <path>.checkpoint.json).'
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Continuar desde el checkpoint de una ejecución interrumpida.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'No existe el archivo {path}.')
+
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson')
+        self.default_vendor = options['vendor']
+        self.batch_size = options['batch_size']
+        self.checkpoint_path = options['checkpoint'] or f'{path}.checkpoint.json'
+        self.file_size = os.path.getsize(path)
+
+        state = self.load_checkpoint(path) if options['resume'] else None
+        self.stats = Counter(state['stats'] if state else {})
+        self.row_number = state['rows'] if state else 0
+        self.known_vendors = set()
+        self.missing_vendors = set()
+        self.validator = ProductCreateSerializer()
+        self.started = time.perf_counter()
+        self.rows_at_start = self.row_number
+
+        if state:
+            self.stdout.write(f'Reanudando desde la fila {self.row_number}.')
+
+        with open(path, 'rb') as fh:
+            lines, rows = self.open_rows(fh, file_format, state['offset'] if state else 0)
+            batch = []
+            for row in rows:
+                self.row_number += 1
+                batch.append((self.row_number, row))
+                if len(batch) >= self.batch_size:
+                    self.flush(batch, path, lines.offset)
+                    batch = []
+            if batch:
+                self.flush(batch, path, lines.offset)
+
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Importación terminada: {self.stats['created']} creados, "
+            f"{self.stats['duplicates']} duplicados omitidos, {self.stats['errors']} con errores."
+        ))
+
+    def open_rows(self, fh, file_format, offset):
+        """Devolver (lector con offset, iterador de filas dict)."""
+        if file_format == 'ndjson':
+            lines = OffsetLines(fh, offset)
+            return lines, (line for line in lines if line.strip())
+
+        header_lines = OffsetLines(fh, 0)
+        header = next(csv.reader(header_lines), None)
+        if header is None:
+            raise CommandError('El archivo CSV está vacío.')
+        header[0] = header[0].lstrip('\ufeff')
+        lines = OffsetLines(fh, max(offset, header_lines.offset))
+        return lines, csv.DictReader(lines, fieldnames=header)
+
+    def flush(self, batch, path, offset):
+        """Validar, deduplicar y escribir un bloque; luego guardar el checkpoint."""
+        candidates = []
+        for number, row in batch:
+            try:
+                candidates.append(self.validate_row(row))
+            except serializers.ValidationError as exc:
+                self.stats['errors'] += 1
+                self.stderr.write(f'Fila {number}: {json.dumps(exc.detail, ensure_ascii=False)}')
+
+        self.check_vendors(candidates)
+        valid = [c for c in candidates if c[0] in self.known_vendors]
+        self.stats['errors'] += len(candidates) - len(valid)
+
+        # Deduplicación por (vendor, name) con una consulta por bloque
+        existing = set(
+            Product.objects.filter(
+                vendor_id__in={vendor_id for vendor_id, _ in valid},
+                name__in={data['name'] for _, data in valid},
+            ).values_list('vendor_id', 'name')
+        )
+        products, category_names = [], []
+        for vendor_id, data in valid:
+            key = (vendor_id, data['name'])
+            if key in existing:
+                self.stats['duplicates'] += 1
+                continue
+            existing.add(key)
+            # La validación deja el nombre de la categoría; se resuelve al escribir
+            category_names.append(data.pop('category', None))
+            products.append(Product(vendor_id=vendor_id, **data))
+
+        with write_turn(), transaction.atomic():
+            # Categorías nuevas en la transacción del bloque, una vez por slug
+            categories = {}
+            for product, name in zip(products, category_names):
+                if name:
+                    slug = category_slug(name)
+                    if slug not in categories:
+                        categories[slug] = get_or_create_category(name)
+                    product.category = categories[slug]
+            Product.objects.bulk_create(products)
+            active = Counter(p.vendor_id for p in products if p.is_active)
+            for vendor_id, delta in active.items():
+                update_vendor_products_count(vendor_id, delta, using='default')
+            if search.is_supported():
+                search.index_products(products)
+            # Por bloque, al confirmar: si la importación se interrumpe, los
+            # bloques ya escritos no quedan tapados por la caché
+            for vendor_id in {p.vendor_id for p in products}:
+                bump_catalog_version(vendor_id)
+
+        self.stats['created'] += len(products)
+        self.save_checkpoint(path, offset)
+        self.report_progress(offset)
+
+    def validate_row(self, row):
+        """Validar una fila con las reglas de ProductCreateSerializer."""
+        if isinstance(row, str):
+            try:
+                row = json.loads(row)
+            except ValueError:
+                raise serializers.ValidationError('JSON inválido.')
+        if not isinstance(row, dict):
+            raise serializers.ValidationError('La fila no es un objeto.')
+        # En CSV las columnas vacías equivalen a campos omitidos
+        data = {k: v for k, v in row.items() if k and v not in ('', None)}
+        vendor_id = data.pop('vendor_id', self.default_vendor)
+        try:
+            vendor_id = int(vendor_id)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({'vendor_id': 'Se requiere un vendor_id válido.'})
+        return vendor_id, self.validator.run_validation(data)
+
+    def check_vendors(self, candidates):
+        unknown = (
+            {vendor_id for vendor_id, _ in candidates}
+            - self.known_vendors - self.missing_vendors
+        )
+        if unknown:
+            found = set(Vendor.objects.filter(pk__in=unknown).values_list('pk', flat=True))
+            self.known_vendors |= found
+            self.missing_vendors |= unknown - found
+            for vendor_id in unknown - found:
+                self.stderr.write(f'Vendedor {vendor_id} no existe; se omiten sus filas.')
+
+    def load_checkpoint(self, path):
+        if not os.path.exists(self.checkpoint_path):
+            raise CommandError(f'No hay checkpoint en {self.checkpoint_path}.')
+        with open(self.checkpoint_path) as fh:
+            state = json.load(fh)
+        if state.get('path') != os.path.abspath(path) or state.get('size') != self.file_size:
+            raise CommandError('El checkpoint corresponde a otro archivo o el archivo cambió.')
+        return state
+
+    def save_checkpoint(self, path, offset):
+        state = {
+            'path': os.path.abspath(path),
+            'size': self.file_size,
+            'offset': offset,
+            'rows': self.row_number,
+            'stats': dict(self.stats),
+        }
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w') as fh:
+            json.dump(state, fh)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def report_progress(self, offset):
+        elapsed = time.perf_counter() - self.started
+        rows = self.row_number - self.rows_at_start
+        rate = rows / elapsed if elapsed else 0
+        percent = offset * 100 / self.file_size if self.file_size else 100
+        self.stdout.write(
+            f'  {self.row_number} filas ({percent:.1f}%) - {rate:,.0f} filas/s - '
+            f"{self.stats['created']} creados"
+        )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.products import search
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda de texto completo de productos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Base de datos a reindexar (por defecto "default").'
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if not search.is_supported(using):
+            raise CommandError('La base de datos no soporta FTS5 (solo SQLite).')
+
+        with transaction.atomic(using=using):
+            search.create_index(using=using)
+            total = search.rebuild_index(using=using)
+
+        self.stdout.write(self.style.SUCCESS(f'Índice reconstruido: {total} productos.'))
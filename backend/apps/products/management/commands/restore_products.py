@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.products.archive import restore_products
+from apps.products.models import ArchivedProduct
+
+
+class Command(BaseCommand):
+    help = (
+        'Devuelve productos archivados a la tabla principal con su mismo id, por id o '
+        'todos los de un vendedor. Vuelven con el estado que tenían; --activate los reactiva.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', type=int, help='Ids de los productos archivados.')
+        parser.add_argument('--vendor', type=int, help='Restaurar todos los productos archivados de este vendedor.')
+        parser.add_argument('--activate', action='store_true', help='Reactivar los productos restaurados.')
+
+    def handle(self, *args, **options):
+        if not options['ids'] and options['vendor'] is None:
+            raise CommandError('Indica ids de productos archivados o --vendor.')
+
+        queryset = ArchivedProduct.objects.all()
+        if options['ids']:
+            queryset = queryset.filter(pk__in=options['ids'])
+        if options['vendor'] is not None:
+            queryset = queryset.filter(vendor_id=options['vendor'])
+
+        missing = set(options['ids']) - set(queryset.values_list('pk', flat=True))
+        if missing:
+            self.stderr.write(f"No están archivados: {', '.join(map(str, sorted(missing)))}.")
+        restored = restore_products(queryset, activate=options['activate'])
+        self.stdout.write(self.style.SUCCESS(f'{restored} productos restaurados.'))
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from apps.products import search
+
+    using = schema_editor.connection.alias
+    if search.is_supported(using):
+        # El índice se llena en 0006, con las categorías ya normalizadas
+        search.create_index(using=using)
+
+
+def drop_search_index(apps, schema_editor):
+    from apps.products import search
+
+    using = schema_editor.connection.alias
+    if search.is_supported(using):
+        search.drop_index(using=using)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_indexes'),
+        ('vendors', '0003_vendor_active_products_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['vendor', 'name'], name='product_vendor_name_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 6.0 on 2026-10-18 13:05
+
+from collections import Counter, defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fold_categories(apps, schema_editor):
+    """
+    Crear una Category por slug a partir de los textos existentes.
+
+    Las variantes que solo difieren en mayúsculas, tildes o signos
+    ("Artesanías", "artesanias") quedan en la misma categoría, con el nombre
+    más usado entre ellas.
+    """
+    Category = apps.get_model('products', 'Category')
+    Product = apps.get_model('products', 'Product')
+
+    spellings = defaultdict(Counter)
+    rows = Product.objects.values('category').annotate(total=models.Count('id'))
+    for row in rows:
+        name = row['category'].strip()
+        slug = slugify(name)[:100]
+        if slug:
+            spellings[slug][row['category']] += row['total']
+
+    for slug, counter in spellings.items():
+        name = min(counter, key=lambda spelling: (-counter[spelling], spelling)).strip()
+        category = Category.objects.create(name=name, slug=slug)
+        Product.objects.filter(category__in=list(counter)).update(category_ref=category)
+
+
+def unfold_categories(apps, schema_editor):
+    Category = apps.get_model('products', 'Category')
+    Product = apps.get_model('products', 'Product')
+    for category in Category.objects.all():
+        Product.objects.filter(category_ref=category).update(category=category.name)
+
+
+def rebuild_search_index(apps, schema_editor):
+    from apps.products import search
+
+    using = schema_editor.connection.alias
+    if search.is_supported(using):
+        search.rebuild_index(using=using)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_vendor_name_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Nombre')),
+                ('slug', models.SlugField(max_length=100, unique=True, verbose_name='Slug')),
+            ],
+            options={
+                'verbose_name': 'Categoría',
+                'verbose_name_plural': 'Categorías',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='category_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='products.category'),
+        ),
+        migrations.RunPython(fold_categories, unfold_categories),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_category_created_idx',
+        ),
+        migrations.RemoveField(
+            model_name='product',
+            name='category',
+        ),
+        migrations.RenameField(
+            model_name='product',
+            old_name='category_ref',
+            new_name='category',
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='products', to='products.category', verbose_name='Categoría'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'created_at', 'id'], name='product_category_created_idx'),
+        ),
+        migrations.RunPython(rebuild_search_index, migrations.RunPython.noop),
+    ]
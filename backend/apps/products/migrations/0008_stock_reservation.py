@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-10-18 15:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_product_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('active', 'Activa'), ('committed', 'Confirmada'), ('released', 'Liberada'), ('expired', 'Vencida')], default='active', max_length=10, verbose_name='Estado')),
+                ('expires_at', models.DateTimeField(verbose_name='Vence')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_reservations', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Reserva de stock',
+                'verbose_name_plural': 'Reservas de stock',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockReservationItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(verbose_name='Cantidad')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_items', to='products.product', verbose_name='Producto')),
+                ('reservation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='products.stockreservation', verbose_name='Reserva')),
+            ],
+            options={
+                'verbose_name': 'Producto reservado',
+                'verbose_name_plural': 'Productos reservados',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='stockreservation',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['expires_at'], name='reservation_active_expiry_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockreservationitem',
+            constraint=models.UniqueConstraint(fields=('reservation', 'product'), name='reservation_item_unique_product'),
+        ),
+    ]
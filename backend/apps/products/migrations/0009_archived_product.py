@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-18 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_stock_reservation'),
+        ('vendors', '0003_vendor_active_products_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProduct',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200, verbose_name='Nombre')),
+                ('description', models.TextField(verbose_name='Descripción')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Precio')),
+                ('stock', models.PositiveIntegerField(verbose_name='Stock')),
+                ('image', models.URLField(blank=True, verbose_name='Imagen URL')),
+                ('is_active', models.BooleanField(verbose_name='Activo')),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(verbose_name='Fecha de actualización')),
+                ('archived_at', models.DateTimeField(db_index=True, verbose_name='Fecha de archivo')),
+                ('reservation_items', models.JSONField(blank=True, default=list, verbose_name='Productos reservados')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='products.category', verbose_name='Categoría')),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_products', to='vendors.vendor', verbose_name='Vendedor')),
+            ],
+            options={
+                'verbose_name': 'Producto archivado',
+                'verbose_name_plural': 'Productos archivados',
+                'ordering': ['-archived_at'],
+            },
+        ),
+    ]
@@ -1,7 +1,26 @@
+from django.conf import settings
 from django.db import models
 from apps.vendors.models import Vendor
 
 
+class Category(models.Model):
+    """
+    Categoría de productos. El ``slug`` (sin tildes ni mayúsculas, ver
+    ``apps.products.categories``) identifica la categoría: "Artesanías" y
+    "artesanias" son la misma.
+    """
+    name = models.CharField('Nombre', max_length=100)
+    slug = models.SlugField('Slug', max_length=100, unique=True)
+
+    class Meta:
+        verbose_name = 'Categoría'
+        verbose_name_plural = 'Categorías'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
 class Product(models.Model):
     """
     Modelo de producto - representa un producto en el marketplace.
@@ -17,7 +36,17 @@ class Product(models.Model):
     price = models.DecimalField('Precio', max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField('Stock', default=0)
     image = models.URLField('Imagen URL', blank=True)
-    category = models.CharField('Categoría', max_length=100, blank=True)
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='products',
+        verbose_name='Categoría',
+        # Las lecturas por categoría usan product_category_created_idx; el
+        # índice propio de la FK solo competiría con él en el planificador
+        db_index=False
+    )
     is_active = models.BooleanField('Activo', default=True)
     created_at = models.DateTimeField('Fecha de creación', auto_now_add=True)
     updated_at = models.DateTimeField('Fecha de actualización', auto_now=True)
@@ -26,6 +55,172 @@ class Product(models.Model):
         verbose_name = 'Producto'
         verbose_name_plural = 'Productos'
         ordering = ['-created_at']
+        # Índices parciales sobre productos activos, alineados con los
+        # filtros y ordenamientos de ProductViewSet (el id desempata). Los de
+        # fecha, precio, stock y categoría llevan además las columnas de los
+        # demás filtros de ProductFilter y ``updated_at``: cualquier
+        # combinación de filtros, el COUNT de la paginación y el
+        # MAX(updated_at) del ETag se resuelven solo con el índice, sin leer
+        # las filas de la tabla.
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id', 'price', 'stock', 'category', 'updated_at'],
+                name='product_active_created_idx', condition=models.Q(is_active=True)
+            ),
+            models.Index(
+                fields=['vendor', 'created_at', 'id'], name='product_vendor_created_idx',
+                condition=models.Q(is_active=True)
+            ),
+            models.Index(
+                fields=['category', 'created_at', 'id', 'price', 'stock', 'updated_at'],
+                name='product_category_created_idx', condition=models.Q(is_active=True)
+            ),
+            models.Index(
+                fields=['price', 'id', 'stock', 'created_at', 'category', 'updated_at'],
+                name='product_active_price_idx', condition=models.Q(is_active=True)
+            ),
+            models.Index(
+                fields=['name', 'id'], name='product_active_name_idx',
+                condition=models.Q(is_active=True)
+            ),
+            models.Index(
+                fields=['stock', 'id', 'price', 'created_at', 'category', 'updated_at'],
+                name='product_active_stock_idx', condition=models.Q(is_active=True)
+            ),
+            models.Index(
+                fields=['updated_at', 'id', 'price', 'stock', 'created_at', 'category'],
+                name='product_active_updated_idx', condition=models.Q(is_active=True)
+            ),
+            # Deduplicación por (vendedor, nombre) en las importaciones
+            models.Index(fields=['vendor', 'name'], name='product_vendor_name_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Estado al cargar, para detectar activaciones/desactivaciones al guardar
+        instance._was_active = instance.__dict__.get('is_active')
+        return instance
 
     def __str__(self):
         return f"{self.name} - {self.vendor.business_name}"
+
+
+class StockReservation(models.Model):
+    """
+    Reserva temporal de unidades de uno o varios productos.
+
+    Las unidades se descuentan de ``Product.stock`` al reservar: el stock
+    publicado es siempre el disponible. Confirmar la reserva las deja
+    descontadas; liberarla o dejarla vencer las devuelve (ver
+    ``apps.products.stock``).
+    """
+
+    class Status(models.TextChoices):
+        ACTIVE = 'active', 'Activa'
+        COMMITTED = 'committed', 'Confirmada'
+        RELEASED = 'released', 'Liberada'
+        EXPIRED = 'expired', 'Vencida'
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='stock_reservations',
+        verbose_name='Usuario'
+    )
+    status = models.CharField(
+        'Estado', max_length=10, choices=Status.choices, default=Status.ACTIVE
+    )
+    expires_at = models.DateTimeField('Vence')
+    created_at = models.DateTimeField('Fecha de creación', auto_now_add=True)
+    updated_at = models.DateTimeField('Fecha de actualización', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Reserva de stock'
+        verbose_name_plural = 'Reservas de stock'
+        ordering = ['-created_at']
+        indexes = [
+            # Barrido de reservas vencidas
+            models.Index(
+                fields=['expires_at'], name='reservation_active_expiry_idx',
+                condition=models.Q(status='active')
+            ),
+        ]
+
+    def __str__(self):
+        return f"Reserva {self.pk} ({self.get_status_display()})"
+
+
+class StockReservationItem(models.Model):
+    """Unidades de un producto retenidas por una reserva."""
+
+    reservation = models.ForeignKey(
+        StockReservation,
+        on_delete=models.CASCADE,
+        related_name='items',
+        verbose_name='Reserva'
+    )
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='reservation_items',
+        verbose_name='Producto'
+    )
+    quantity = models.PositiveIntegerField('Cantidad')
+
+    class Meta:
+        verbose_name = 'Producto reservado'
+        verbose_name_plural = 'Productos reservados'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['reservation', 'product'], name='reservation_item_unique_product'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id}"
+
+
+class ArchivedProduct(models.Model):
+    """
+    Producto retirado de ``products_product`` por ``archive_products``.
+
+    Conserva el id y las columnas del producto, y en ``reservation_items``
+    las líneas de reservas que lo referenciaban. ``restore_products`` lo
+    devuelve a la tabla principal (ver ``apps.products.archive``).
+    """
+    id = models.BigIntegerField(primary_key=True)
+    vendor = models.ForeignKey(
+        Vendor,
+        on_delete=models.CASCADE,
+        related_name='archived_products',
+        verbose_name='Vendedor'
+    )
+    name = models.CharField('Nombre', max_length=200)
+    description = models.TextField('Descripción')
+    price = models.DecimalField('Precio', max_digits=10, decimal_places=2)
+    stock = models.PositiveIntegerField('Stock')
+    image = models.URLField('Imagen URL', blank=True)
+    # Una categoría borrada después de archivar no impide restaurar
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Categoría'
+    )
+    is_active = models.BooleanField('Activo')
+    created_at = models.DateTimeField('Fecha de creación')
+    updated_at = models.DateTimeField('Fecha de actualización')
+    archived_at = models.DateTimeField('Fecha de archivo', db_index=True)
+    # [{"reservation": id, "quantity": n}, ...]
+    reservation_items = models.JSONField('Productos reservados', default=list, blank=True)
+
+    class Meta:
+        verbose_name = 'Producto archivado'
+        verbose_name_plural = 'Productos archivados'
+        ordering = ['-archived_at']
+
+    def __str__(self):
+        return f"{self.name} (archivado)"
@@ -15,7 +15,6 @@ class IsProductVendorOwner(permissions.BasePermission):
         if not request.user.is_authenticated:
             return False
 
-        if not hasattr(request.user, 'vendor_profile'):
-            return False
-
-        return obj.vendor == request.user.vendor_profile
+        # Comparar ids: con StatelessJWTAuthentication no consulta la base
+        vendor_id = request.user.vendor_id
+        return vendor_id is not None and obj.vendor_id == vendor_id
@@ -0,0 +1,21 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class NDJSONRenderer(JSONRenderer):
+    """
+    Tipo de medio para la exportación en NDJSON.
+
+    El cuerpo de la exportación se transmite con StreamingHttpResponse; el
+    renderer solo participa en la negociación y en las respuestas de error,
+    que se devuelven como JSON.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class CSVRenderer(JSONRenderer):
+    """Tipo de medio para la exportación en CSV (errores como JSON)."""
+
+    media_type = 'text/csv'
+    format = 'csv'
@@ -0,0 +1,131 @@
+"""
+Índice de búsqueda de texto completo para productos.
+
+Usa una tabla virtual FTS5 de SQLite con el tokenizador ``unicode61`` y
+``remove_diacritics 2``, de modo que las búsquedas no distinguen mayúsculas
+ni tildes ("cafe" encuentra "Café"). Solo se indexan productos activos; el
+índice se mantiene sincronizado con las señales de ``Product``.
+"""
+
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'products_product_fts'
+
+# Pesos bm25 por columna: name, description, category
+RANK_WEIGHTS = (10.0, 1.0, 5.0)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def is_supported(using=DEFAULT_DB_ALIAS):
+    """Indica si la base de datos soporta el índice FTS5."""
+    return connections[using].vendor == 'sqlite'
+
+
+def create_index(using=DEFAULT_DB_ALIAS):
+    """Crear la tabla FTS5 y configurar el ranking por relevancia."""
+    weights = ', '.join(str(w) for w in RANK_WEIGHTS)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "name, description, category, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank) VALUES ('rank', %s)",
+            [f'bm25({weights})']
+        )
+
+
+def drop_index(using=DEFAULT_DB_ALIAS):
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def rebuild_index(using=DEFAULT_DB_ALIAS):
+    """Reconstruir el índice completo a partir de los productos activos."""
+    from .models import Category, Product
+
+    table = Product._meta.db_table
+    category_table = Category._meta.db_table
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description, category) '
+            f"SELECT p.id, p.name, p.description, COALESCE(c.name, '') FROM {table} p "
+            f'LEFT JOIN {category_table} c ON c.id = p.category_id WHERE p.is_active'
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def index_products(products, using=DEFAULT_DB_ALIAS):
+    """Agregar o actualizar productos en el índice; los inactivos se eliminan."""
+    products = list(products)
+    remove_products([p.pk for p in products], using=using)
+    rows = [
+        (p.pk, p.name, p.description, p.category.name if p.category_id else '')
+        for p in products if p.is_active
+    ]
+    if rows:
+        with connections[using].cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description, category) '
+                'VALUES (%s, %s, %s, %s)',
+                rows
+            )
+
+
+def remove_products(product_ids, using=DEFAULT_DB_ALIAS):
+    """Eliminar productos del índice."""
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(pk,) for pk in product_ids]
+        )
+
+
+def build_match_query(text):
+    """
+    Convertir el texto del usuario en una expresión MATCH segura.
+
+    Cada palabra se cita (para que no se interprete la sintaxis de FTS5)
+    y se busca como prefijo; todas las palabras deben aparecer.
+    """
+    tokens = _TOKEN_RE.findall(text or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search(queryset, text):
+    """
+    Filtrar un queryset de productos por el índice FTS.
+
+    Agrega la anotación ``search_rank`` (bm25, menor es más relevante).
+    Si el texto no contiene palabras, el queryset se devuelve sin cambios.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return queryset
+
+    table = queryset.model._meta.db_table
+    return queryset.filter(
+        id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,)
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f'SELECT rank FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+            (match,)
+        )
+    )
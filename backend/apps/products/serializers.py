@@ -1,12 +1,53 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Product
+from .categories import category_slug, get_or_create_category
+from .models import Product, StockReservation, StockReservationItem
+from apps.core.serializers import TimedSerializerMixin
 from apps.vendors.serializers import VendorSerializer
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class CategoryField(serializers.CharField):
+    """
+    Categoría por nombre. Al escribir se usa la categoría existente con el
+    mismo slug (sin distinguir mayúsculas ni tildes) o se crea una nueva;
+    vacío o ``null`` dejan el producto sin categoría.
+
+    La validación solo normaliza el nombre: la categoría se resuelve al
+    guardar (``resolve_category``), para que una petición rechazada no deje
+    categorías creadas.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('max_length', 100)
+        kwargs.setdefault('allow_blank', True)
+        kwargs.setdefault('allow_null', True)
+        kwargs.setdefault('required', False)
+        super().__init__(**kwargs)
+
+    def run_validation(self, data=serializers.empty):
+        name = super().run_validation(data)
+        if not name:
+            return None
+        if not category_slug(name):
+            raise serializers.ValidationError('La categoría debe contener letras o números.')
+        return name
+
+    def to_representation(self, value):
+        return value.name
+
+
+def resolve_category(validated_data):
+    """Cambiar el nombre validado de ``category`` por la categoría, creándola si no existe."""
+    if validated_data.get('category'):
+        validated_data['category'] = get_or_create_category(validated_data['category'])
+    return validated_data
+
+
+class ProductSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer para mostrar información del producto."""
 
     vendor = VendorSerializer(read_only=True)
+    category = serializers.CharField(source='category.name', read_only=True, allow_null=True)
     vendor_id = serializers.IntegerField(write_only=True, required=False)
 
     class Meta:
@@ -19,9 +60,11 @@ class ProductSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'vendor', 'created_at', 'updated_at']
 
 
-class ProductCreateSerializer(serializers.ModelSerializer):
+class ProductCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer para crear/actualizar productos."""
 
+    category = CategoryField()
+
     class Meta:
         model = Product
         fields = [
@@ -32,18 +75,41 @@ class ProductCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context['request'].user
         # Obtener el vendor del usuario autenticado
-        if not hasattr(user, 'vendor_profile'):
+        if user.vendor_id is None:
             raise serializers.ValidationError({
                 'vendor': 'Debes tener un perfil de vendedor para crear productos.'
             })
-        vendor = user.vendor_profile
-        product = Product.objects.create(vendor=vendor, **validated_data)
+        product = Product.objects.create(vendor_id=user.vendor_id, **resolve_category(validated_data))
         return product
 
+    def update(self, instance, validated_data):
+        return super().update(instance, resolve_category(validated_data))
+
+
+class ProductBulkItemSerializer(ProductCreateSerializer):
+    """Elemento de una carga masiva: sin ``id`` se crea, con ``id`` se actualiza."""
+
+    id = serializers.IntegerField(required=False)
+
+    class Meta(ProductCreateSerializer.Meta):
+        fields = ['id'] + ProductCreateSerializer.Meta.fields
+
+
+class ProductBulkSerializer(serializers.Serializer):
+    """Serializer para la carga masiva de productos de un vendedor."""
+
+    items = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.PRODUCT_BULK_MAX_ITEMS,
+        help_text='Productos a crear (sin id) o actualizar/desactivar (con id).'
+    )
+
 
 class ProductListSerializer(serializers.ModelSerializer):
     """Serializer simplificado para listados de productos."""
 
+    category = serializers.CharField(source='category.name', read_only=True, allow_null=True)
     vendor_name = serializers.CharField(source='vendor.business_name', read_only=True)
 
     class Meta:
@@ -52,3 +118,110 @@ class ProductListSerializer(serializers.ModelSerializer):
             'id', 'name', 'description', 'price', 'stock',
             'image', 'category', 'vendor_name', 'created_at'
         ]
+
+
+class CategoryFacetSerializer(serializers.Serializer):
+    value = serializers.CharField(allow_null=True, help_text='Categoría (null = sin categoría).')
+    count = serializers.IntegerField()
+
+
+class VendorFacetSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    business_name = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class PriceBucketSerializer(serializers.Serializer):
+    min = serializers.DecimalField(
+        max_digits=10, decimal_places=2, allow_null=True,
+        help_text='Límite inferior (incluido); null = sin límite.'
+    )
+    max = serializers.DecimalField(
+        max_digits=10, decimal_places=2, allow_null=True,
+        help_text='Límite superior (excluido); null = sin límite.'
+    )
+    count = serializers.IntegerField()
+
+
+class PriceFacetSerializer(serializers.Serializer):
+    min = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    max = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    histogram = PriceBucketSerializer(many=True)
+
+
+class ProductFacetsSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Facetas del listado de productos (ver ``apps.products.facets``)."""
+
+    total = serializers.IntegerField()
+    categories = CategoryFacetSerializer(many=True)
+    vendors = VendorFacetSerializer(many=True)
+    price = PriceFacetSerializer()
+
+
+class StockItemSerializer(serializers.Serializer):
+    product = serializers.IntegerField(min_value=1, help_text='ID del producto.')
+    quantity = serializers.IntegerField(min_value=1, max_value=2147483647, help_text='Unidades.')
+
+
+class StockOperationSerializer(serializers.Serializer):
+    """Productos y cantidades de una operación de stock (todo o nada)."""
+
+    items = StockItemSerializer(many=True, allow_empty=False, max_length=settings.STOCK_MAX_ITEMS)
+
+    def validate_items(self, items):
+        products = [item['product'] for item in items]
+        if len(set(products)) != len(products):
+            raise serializers.ValidationError('Producto repetido en la misma operación.')
+        return items
+
+    @property
+    def quantities(self):
+        """``{id de producto: cantidad}`` en el orden de la petición."""
+        return {item['product']: item['quantity'] for item in self.validated_data['items']}
+
+
+class StockReserveSerializer(StockOperationSerializer):
+    ttl = serializers.IntegerField(
+        min_value=1, max_value=settings.STOCK_RESERVATION_MAX_TTL,
+        default=settings.STOCK_RESERVATION_TTL,
+        help_text='Segundos que dura la reserva.'
+    )
+
+
+class StockLevelSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    stock = serializers.IntegerField(help_text='Stock disponible tras la operación.')
+
+
+class StockLevelsSerializer(TimedSerializerMixin, serializers.Serializer):
+    items = StockLevelSerializer(many=True)
+
+
+class StockShortageSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    requested = serializers.IntegerField()
+    available = serializers.IntegerField()
+
+
+class InsufficientStockSerializer(serializers.Serializer):
+    """Respuesta 409: disponible de cada producto pedido; no se descontó nada."""
+
+    detail = serializers.CharField()
+    items = StockShortageSerializer(many=True)
+
+
+class StockReservationItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StockReservationItem
+        fields = ['product', 'quantity']
+
+
+class StockReservationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Reserva de stock con sus productos."""
+
+    items = StockReservationItemSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = StockReservation
+        fields = ['id', 'status', 'expires_at', 'created_at', 'items']
+        read_only_fields = fields
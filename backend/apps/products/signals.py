@@ -0,0 +1,71 @@
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import search
+from .categories import invalidate_category_map
+from .models import Category, Product
+from apps.core.cache import bump_catalog_version
+from apps.vendors.models import Vendor
+
+
+def update_vendor_products_count(vendor_id, delta, using):
+    """Sumar ``delta`` al contador de productos activos del vendedor con F()."""
+    vendors = Vendor.objects.using(using).filter(pk=vendor_id)
+    if delta < 0:
+        # Nunca bajar de cero si el contador quedó desfasado
+        vendors = vendors.filter(active_products_count__gte=-delta)
+    vendors.update(active_products_count=F('active_products_count') + delta)
+
+
+@receiver(post_save, sender=Product)
+def sync_vendor_products_count(sender, instance, created, using, **kwargs):
+    """Actualizar Vendor.active_products_count al crear, desactivar o reactivar."""
+    was_active = False if created else getattr(instance, '_was_active', None)
+    if was_active is None:
+        return
+    delta = int(instance.is_active) - int(was_active)
+    if delta:
+        update_vendor_products_count(instance.vendor_id, delta, using)
+    instance._was_active = instance.is_active
+
+
+@receiver(post_save, sender=Product)
+def sync_product_search_index(sender, instance, using, **kwargs):
+    """Mantener el índice de búsqueda al crear, editar o desactivar productos."""
+    if search.is_supported(using):
+        search.index_products([instance], using=using)
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_from_vendor_count(sender, instance, using, **kwargs):
+    if getattr(instance, '_was_active', instance.is_active):
+        update_vendor_products_count(instance.vendor_id, -1, using)
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_search_index(sender, instance, using, **kwargs):
+    if search.is_supported(using):
+        search.remove_products([instance.pk], using=using)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_catalog_cache(sender, instance, **kwargs):
+    bump_catalog_version(instance.vendor_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cache(sender, instance, **kwargs):
+    """Recargar el mapa de categorías; los nombres aparecen en las respuestas cacheadas."""
+    invalidate_category_map()
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Category)
+def sync_category_search_index(sender, instance, created, using, **kwargs):
+    """El índice de búsqueda guarda el nombre de la categoría de cada producto."""
+    if not created and search.is_supported(using):
+        products = instance.products.using(using).filter(is_active=True).select_related('category')
+        search.index_products(products, using=using)
@@ -0,0 +1,250 @@
+"""
+Operaciones atómicas sobre ``Product.stock``: descuento directo, reservas con
+vencimiento, liberación y confirmación.
+
+Cada operación descuenta o devuelve las unidades de todos sus productos con
+un único ``UPDATE`` condicional (``stock = stock - CASE id ... END WHERE
+stock >= CASE id ... END``): la base de datos decide, fila por fila y sin
+lecturas previas, si alcanza el stock. Si algún producto no alcanza, la
+transacción se revierte completa y se informa el disponible de cada uno.
+
+Las transacciones empiezan siempre por una escritura (el ``UPDATE`` del stock
+o el cambio de estado de la reserva), de modo que en SQLite toman el bloqueo
+de escritura de entrada y dos peticiones no pueden actuar sobre la misma
+reserva. Dentro de cada proceso pasan además por la cola de escritura
+(``apps.core.writes``). Como ``update()`` no dispara señales, aquí se
+invalida la caché del catálogo de los vendedores afectados (el stock no está
+en el índice de búsqueda ni cambia el contador de productos activos).
+"""
+
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import Case, F, Sum, Value, When
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+
+from .models import Product, StockReservation, StockReservationItem
+from apps.core.cache import bump_catalog_version
+from apps.core.writes import serialized_write, write_turn
+
+# Reservas vencidas que se devuelven por transacción en el barrido
+EXPIRE_BATCH_SIZE = 100
+
+
+class InsufficientStock(APIException):
+    """409 con el disponible de cada producto pedido (``items``)."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Stock insuficiente.'
+    default_code = 'insufficient_stock'
+
+    def __init__(self, items):
+        super().__init__()
+        # Directo: APIException convertiría los números del detalle en texto
+        self.detail = {'detail': self.detail, 'items': items}
+
+
+class ReservationClosed(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'La reserva ya no está activa.'
+    default_code = 'reservation_closed'
+
+
+def _amount(quantities):
+    """``CASE id WHEN ... THEN cantidad END`` para un UPDATE de varios productos."""
+    return Case(
+        *[When(pk=pk, then=Value(quantity)) for pk, quantity in quantities.items()],
+        output_field=models.PositiveIntegerField(),
+    )
+
+
+def _take(quantities, now):
+    """Descontar las cantidades; devuelve cuántos productos tenían stock suficiente."""
+    amount = _amount(quantities)
+    return Product.objects.filter(
+        pk__in=quantities, is_active=True, stock__gte=amount
+    ).update(stock=F('stock') - amount, updated_at=now)
+
+
+def _give(quantities, now):
+    """Devolver las cantidades al stock (también de productos ya desactivados)."""
+    if quantities:
+        amount = _amount(quantities)
+        Product.objects.filter(pk__in=quantities).update(stock=F('stock') + amount, updated_at=now)
+
+
+def _invalidate_vendors(vendor_ids):
+    for vendor_id in sorted(set(vendor_ids)):
+        bump_catalog_version(vendor_id)
+
+
+def _stock_levels(quantities):
+    """``{id: stock}`` de los productos; invalida la caché de sus vendedores."""
+    rows = list(Product.objects.filter(pk__in=quantities).values_list('pk', 'vendor_id', 'stock'))
+    _invalidate_vendors(vendor_id for _, vendor_id, _ in rows)
+    return {pk: stock for pk, _, stock in rows}
+
+
+def _shortages(quantities):
+    """Detalle del 409: disponible de cada producto pedido (0 si no existe o está inactivo)."""
+    available = dict(
+        Product.objects.filter(pk__in=quantities, is_active=True).values_list('pk', 'stock')
+    )
+    return [
+        {'product': pk, 'requested': quantity, 'available': available.get(pk, 0)}
+        for pk, quantity in quantities.items()
+    ]
+
+
+@serialized_write
+def decrement_stock(quantities):
+    """
+    Descontar ``{id de producto: cantidad}`` de una vez (todo o nada).
+
+    Devuelve ``[{'product', 'stock'}]`` con el stock resultante; si algún
+    producto no alcanza, lanza ``InsufficientStock`` sin descontar nada.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        taken = _take(quantities, now) == len(quantities)
+        if taken:
+            levels = _stock_levels(quantities)
+        else:
+            transaction.set_rollback(True)
+    if not taken:
+        raise InsufficientStock(_shortages(quantities))
+    return [{'product': pk, 'stock': levels[pk]} for pk in quantities]
+
+
+@serialized_write
+def reserve_stock(user_id, quantities, ttl):
+    """
+    Reservar ``{id de producto: cantidad}`` durante ``ttl`` segundos (todo o nada).
+
+    Las unidades se descuentan del stock al reservar. Devuelve la
+    ``StockReservation`` creada con sus ``items`` ya cargados.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        taken = _take(quantities, now) == len(quantities)
+        if taken:
+            _stock_levels(quantities)
+            reservation = StockReservation.objects.create(
+                user_id=user_id, expires_at=now + timedelta(seconds=ttl)
+            )
+            items = StockReservationItem.objects.bulk_create([
+                StockReservationItem(reservation=reservation, product_id=pk, quantity=quantity)
+                for pk, quantity in quantities.items()
+            ])
+        else:
+            transaction.set_rollback(True)
+    if not taken:
+        raise InsufficientStock(_shortages(quantities))
+    # Sin volver a consultar los items para la respuesta
+    reservation._prefetched_objects_cache = {'items': items}
+    return reservation
+
+
+def _reserved_quantities(reservation_ids):
+    """``{id de producto: unidades}`` de las reservas e ids de sus vendedores."""
+    rows = list(
+        StockReservationItem.objects.filter(reservation_id__in=reservation_ids)
+        .values_list('product_id', 'product__vendor_id').annotate(total=Sum('quantity'))
+    )
+    return {pk: total for pk, _, total in rows}, {vendor_id for _, vendor_id, _ in rows}
+
+
+def _closed(reservation_id, user_id):
+    """Error para una reserva que no se pudo tomar: inexistente o ya cerrada."""
+    reservation = StockReservation.objects.filter(pk=reservation_id, user_id=user_id).first()
+    if reservation is None:
+        return NotFound('Reserva no encontrada.')
+    if reservation.status == StockReservation.Status.ACTIVE:
+        return ReservationClosed('La reserva venció.')
+    return ReservationClosed(
+        f'La reserva ya está {reservation.get_status_display().lower()}.'
+    )
+
+
+def _get_reservation(reservation_id):
+    return StockReservation.objects.prefetch_related('items').get(pk=reservation_id)
+
+
+@serialized_write
+def release_reservation(reservation_id, user_id):
+    """
+    Liberar una reserva activa del usuario ``user_id`` y devolver sus unidades al stock.
+
+    Una reserva vencida que el barrido aún no procesó también se puede
+    liberar. Devuelve la reserva actualizada.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # El cambio de estado es la primera escritura: solo una petición (o
+        # el barrido) toma la reserva y devuelve sus unidades
+        claimed = StockReservation.objects.filter(
+            pk=reservation_id, user_id=user_id, status=StockReservation.Status.ACTIVE
+        ).update(status=StockReservation.Status.RELEASED, updated_at=now)
+        if claimed:
+            quantities, vendor_ids = _reserved_quantities([reservation_id])
+            _give(quantities, now)
+            _invalidate_vendors(vendor_ids)
+    if not claimed:
+        raise _closed(reservation_id, user_id)
+    return _get_reservation(reservation_id)
+
+
+@serialized_write
+def commit_reservation(reservation_id, user_id):
+    """
+    Confirmar una reserva activa y vigente del usuario ``user_id``: sus unidades quedan
+    descontadas definitivamente. Devuelve la reserva actualizada.
+    """
+    now = timezone.now()
+    claimed = StockReservation.objects.filter(
+        pk=reservation_id, user_id=user_id, status=StockReservation.Status.ACTIVE, expires_at__gt=now
+    ).update(status=StockReservation.Status.COMMITTED, updated_at=now)
+    if not claimed:
+        raise _closed(reservation_id, user_id)
+    return _get_reservation(reservation_id)
+
+
+def expire_reservations(now=None, batch_size=EXPIRE_BATCH_SIZE):
+    """
+    Devolver al stock las unidades de las reservas activas ya vencidas.
+
+    Procesa lotes de ``batch_size`` reservas, cada uno en su transacción, y
+    devuelve cuántas reservas venció.
+    """
+    now = now or timezone.now()
+    expired = 0
+    while True:
+        candidates = list(
+            StockReservation.objects.filter(
+                status=StockReservation.Status.ACTIVE, expires_at__lte=now
+            ).order_by('expires_at').values_list('pk', flat=True)[:batch_size]
+        )
+        if not candidates:
+            return expired
+        with write_turn(), transaction.atomic():
+            # Una a una: las que se liberaron o confirmaron entretanto no se tocan
+            claimed = [
+                pk for pk in candidates
+                if StockReservation.objects.filter(
+                    pk=pk, status=StockReservation.Status.ACTIVE
+                ).update(status=StockReservation.Status.EXPIRED, updated_at=now)
+            ]
+            quantities, vendor_ids = _reserved_quantities(claimed)
+            _give(quantities, now)
+            _invalidate_vendors(vendor_ids)
+        expired += len(claimed)
+
+
+def purge_reservations(before):
+    """Borrar las reservas ya cerradas (y sus items) actualizadas antes de ``before``."""
+    _, deleted = StockReservation.objects.exclude(
+        status=StockReservation.Status.ACTIVE
+    ).filter(updated_at__lt=before).delete()
+    return deleted.get(StockReservation._meta.label, 0)
@@ -0,0 +1,180 @@
+"""
+Archivo de productos: qué se archiva, las líneas de reserva, el contador
+del vendedor y el índice de búsqueda al archivar y restaurar, y la
+compactación de la base.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from apps.products.archive import archivable_products, archive_products, restore_products
+from apps.products.models import (
+    ArchivedProduct, Category, Product, StockReservation, StockReservationItem,
+)
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+def _vendor(name):
+    user = User.objects.create_user(
+        email=f'{name}@example.com', username=name,
+        password='x', first_name='V', last_name='R'
+    )
+    return Vendor.objects.create(user=user, business_name=name.title())
+
+
+def _product(vendor, name, active=True, days_ago=0, **extra):
+    product = Product.objects.create(
+        vendor=vendor, name=name, description='Hecho en Colombia',
+        price=Decimal('10000'), stock=5, is_active=active, **extra
+    )
+    if days_ago:
+        # update(): save() volvería a fijar updated_at
+        changed = timezone.now() - timedelta(days=days_ago)
+        Product.objects.filter(pk=product.pk).update(updated_at=changed, created_at=changed)
+        product.refresh_from_db()
+    return product
+
+
+class ArchiveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = _vendor('cafetera')
+        cls.category = Category.objects.create(name='Café', slug='cafe')
+        cls.old = _product(cls.vendor, 'Café viejo', active=False, days_ago=120, category=cls.category)
+        cls.recent = _product(cls.vendor, 'Café reciente', active=False, days_ago=10)
+        cls.active = _product(cls.vendor, 'Café vigente', days_ago=200)
+        cls.buyer = User.objects.create_user(
+            email='buyer@example.com', username='buyer',
+            password='x', first_name='B', last_name='R'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.cutoff = timezone.now() - timedelta(days=90)
+
+    def reserve(self, product, status):
+        reservation = StockReservation.objects.create(
+            user=self.buyer, status=status, expires_at=timezone.now() + timedelta(minutes=5)
+        )
+        StockReservationItem.objects.create(reservation=reservation, product=product, quantity=2)
+        return reservation
+
+    def search(self, term):
+        response = self.client.get('/api/products/', {'search': term})
+        return [item['name'] for item in response.data['results']]
+
+    def test_archives_only_long_inactive_products(self):
+        reservation = self.reserve(self.old, StockReservation.Status.COMMITTED)
+
+        self.assertEqual(archive_products(self.cutoff, chunk_size=1), (1, 1))
+
+        self.assertFalse(Product.objects.filter(pk=self.old.pk).exists())
+        self.assertFalse(StockReservationItem.objects.filter(product_id=self.old.pk).exists())
+        archived = ArchivedProduct.objects.get(pk=self.old.pk)
+        self.assertEqual(archived.name, 'Café viejo')
+        self.assertEqual(archived.category, self.category)
+        self.assertEqual(archived.updated_at, self.old.updated_at)
+        self.assertEqual(archived.reservation_items, [{'reservation': reservation.pk, 'quantity': 2}])
+        self.assertCountEqual(
+            Product.objects.values_list('pk', flat=True), [self.recent.pk, self.active.pk]
+        )
+
+    def test_active_reservation_blocks_archive(self):
+        self.reserve(self.old, StockReservation.Status.ACTIVE)
+        self.assertFalse(archivable_products(self.cutoff).exists())
+
+    def test_products_of_inactive_vendor(self):
+        closed = _vendor('cerrada')
+        product = _product(closed, 'Ruana', days_ago=200)
+        Vendor.objects.filter(pk=closed.pk).update(
+            is_active=False, updated_at=timezone.now() - timedelta(days=100)
+        )
+        self.assertEqual(self.search('ruana'), ['Ruana'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            archive_products(self.cutoff)
+
+        self.assertTrue(ArchivedProduct.objects.filter(pk=product.pk, is_active=True).exists())
+        closed.refresh_from_db()
+        self.assertEqual(closed.active_products_count, 0)
+        self.assertEqual(self.search('ruana'), [])
+
+    def test_restore(self):
+        reservation = self.reserve(self.old, StockReservation.Status.COMMITTED)
+        purged = self.reserve(self.old, StockReservation.Status.EXPIRED)
+        archive_products(self.cutoff)
+        purged.delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restored = restore_products(ArchivedProduct.objects.filter(pk=self.old.pk), activate=True)
+
+        self.assertEqual(restored, 1)
+        self.assertFalse(ArchivedProduct.objects.exists())
+        product = Product.objects.get(pk=self.old.pk)
+        self.assertTrue(product.is_active)
+        self.assertEqual(product.created_at, self.old.created_at)
+        # El plazo de archivo vuelve a empezar
+        self.assertGreater(product.updated_at, self.cutoff)
+        self.assertEqual(
+            list(product.reservation_items.values_list('reservation_id', 'quantity')),
+            [(reservation.pk, 2)]
+        )
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.active_products_count, 2)
+        self.assertEqual(self.search('viejo'), ['Café viejo'])
+
+    def test_restore_keeps_inactive_state(self):
+        archive_products(self.cutoff)
+        restore_products(ArchivedProduct.objects.all())
+        self.assertFalse(Product.objects.get(pk=self.old.pk).is_active)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.active_products_count, 1)
+
+    def test_commands(self):
+        out = StringIO()
+        call_command('archive_products', dry_run=True, stdout=out)
+        self.assertIn('1 productos se archivarían', out.getvalue())
+        self.assertTrue(Product.objects.filter(pk=self.old.pk).exists())
+
+        call_command('archive_products', days=5, stdout=out)
+        self.assertEqual(ArchivedProduct.objects.count(), 2)
+
+        call_command('restore_products', str(self.recent.pk), stdout=out)
+        self.assertTrue(Product.objects.filter(pk=self.recent.pk).exists())
+        call_command('restore_products', vendor=self.vendor.pk, stdout=out)
+        self.assertFalse(ArchivedProduct.objects.exists())
+
+        with self.assertRaises(CommandError):
+            call_command('restore_products')
+
+
+class CompactionTests(TransactionTestCase):
+    """VACUUM no puede ejecutarse dentro de la transacción de un TestCase."""
+
+    def test_vacuum_reports_reclaimed_space(self):
+        vendor = _vendor('cafetera')
+        Product.objects.bulk_create([
+            Product(
+                vendor=vendor, name=f'Café {i}', description='x' * 2000,
+                price=Decimal('10000'), is_active=False
+            )
+            for i in range(200)
+        ])
+        Product.objects.update(updated_at=timezone.now() - timedelta(days=120))
+
+        out = StringIO()
+        call_command('archive_products', vacuum=True, analyze=True, stdout=out)
+
+        self.assertIn('200 productos archivados', out.getvalue())
+        self.assertIn('MiB recuperados', out.getvalue())
+        self.assertEqual(ArchivedProduct.objects.count(), 200)
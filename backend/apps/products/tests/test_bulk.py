@@ -0,0 +1,143 @@
+"""
+Carga masiva de productos: resultado por elemento, propiedad de los
+productos, contador del vendedor, índice de búsqueda y caché del catálogo.
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.products.bulk import bulk_upsert
+from apps.products.models import Product
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+def _vendor(name):
+    user = User.objects.create_user(
+        email=f'{name}@example.com', username=name, password='x',
+        first_name=name.title(), last_name='R'
+    )
+    return Vendor.objects.create(user=user, business_name=name.title())
+
+
+class BulkUpsertTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = _vendor('cafetera')
+        cls.other = _vendor('tejedora')
+        cls.coffee = Product.objects.create(
+            vendor=cls.vendor, name='Café de Huila', description='Tostión media',
+            price=Decimal('45000'), stock=3
+        )
+        cls.foreign = Product.objects.create(
+            vendor=cls.other, name='Mochila Wayuu', description='Tejida a mano',
+            price=Decimal('180000')
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.login(self.vendor.user)
+
+    def login(self, user):
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def bulk(self, items):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/products/bulk/', {'items': items}, format='json')
+
+    def search(self, term):
+        self.client.credentials()
+        response = self.client.get('/api/products/', {'search': term})
+        return [item['name'] for item in response.data['results']]
+
+    def test_mixed_batch(self):
+        response = self.bulk([
+            {'name': 'Panela', 'description': 'Orgánica', 'price': '8000', 'stock': 10},
+            {'id': self.coffee.pk, 'stock': 7},
+            {'name': 'Sin precio', 'description': 'x'},
+            {'id': self.foreign.pk, 'stock': 1},
+            {'id': self.coffee.pk, 'price': '1'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            (response.data['total'], response.data['created'], response.data['updated'], response.data['errors']),
+            (5, 1, 1, 3)
+        )
+        results = response.data['results']
+        self.assertEqual(
+            [r['status'] for r in results], ['created', 'updated', 'error', 'error', 'error']
+        )
+        self.assertIn('price', results[2]['errors'])
+        self.assertIn('no pertenece', results[3]['errors']['id'][0])
+        self.assertIn('repetido', results[4]['errors']['id'][0])
+
+        self.coffee.refresh_from_db()
+        self.assertEqual((self.coffee.stock, self.coffee.price), (7, Decimal('45000')))
+        self.assertTrue(Product.objects.filter(pk=results[0]['id'], vendor=self.vendor).exists())
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.stock, 0)
+
+    def test_counter_and_search_index(self):
+        self.bulk([
+            {'name': 'Panela', 'description': 'Orgánica', 'price': '8000'},
+            {'name': 'Bocadillo', 'description': 'Veleño', 'price': '5000', 'is_active': False},
+            {'id': self.coffee.pk, 'is_active': False},
+        ])
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.active_products_count, 1)
+        self.assertEqual(self.search('panela'), ['Panela'])
+        self.assertEqual(self.search('bocadillo'), [])
+        self.assertEqual(self.search('huila'), [])
+
+    def test_invalidates_catalog_cache(self):
+        self.client.credentials()
+        url = f'/api/products/by-vendor/{self.vendor.pk}/'
+        self.client.get(url)
+        self.login(self.vendor.user)
+        self.bulk([{'id': self.coffee.pk, 'stock': 9}])
+
+        self.client.credentials()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['stock'], 9)
+
+    def test_chunks_are_written_separately(self):
+        items = [
+            {'name': f'Café {i}', 'description': 'Tostión media', 'price': '45000'} for i in range(5)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk_upsert(self.vendor, items, chunk_size=2)
+        self.assertEqual(result['created'], 5)
+        self.assertEqual(len({r['id'] for r in result['results']}), 5)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.active_products_count, 6)
+
+    def test_requires_vendor_profile(self):
+        buyer = User.objects.create_user(
+            email='buyer@example.com', username='buyer', password='x',
+            first_name='B', last_name='R'
+        )
+        self.login(buyer)
+        response = self.client.post('/api/products/bulk/', {'items': [{'id': 1}]}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_deleted_vendor_in_token(self):
+        Vendor.objects.filter(pk=self.other.pk).delete()
+        self.login(self.other.user)
+        response = self.client.post(
+            '/api/products/bulk/', {'items': [{'name': 'Ruana', 'price': '1000'}]}, format='json'
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_rejects_empty_payload(self):
+        response = self.client.post('/api/products/bulk/', {'items': []}, format='json')
+        self.assertEqual(response.status_code, 400)
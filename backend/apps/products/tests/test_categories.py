@@ -0,0 +1,170 @@
+"""
+Categorías normalizadas: los nombres se comparan sin mayúsculas ni tildes,
+``?category=`` sigue aceptando nombres y se resuelve a un id sin consultar
+la tabla de categorías.
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.products.categories import category_map
+from apps.products.models import Category, Product
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+class CategoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='x',
+            first_name='María', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(user=user, business_name='Café del Eje')
+        cls.crafts = Category.objects.create(name='Artesanías', slug='artesanias')
+        Product.objects.create(
+            vendor=cls.vendor, name='Mochila Wayuu', description='Tejida a mano',
+            price=Decimal('180000'), category=cls.crafts
+        )
+        Product.objects.create(
+            vendor=cls.vendor, name='Café de Huila', description='Tostión media',
+            price=Decimal('45000')
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        token = CustomTokenObtainPairSerializer.get_token(self.vendor.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def create(self, category):
+        return self.client.post('/api/products/', {
+            'name': 'Sombrero vueltiao', 'description': 'Caña flecha',
+            'price': '150000.00', 'stock': 2, 'category': category,
+        }, format='json')
+
+    def test_names_fold_to_existing_category(self):
+        for spelling in ('artesanias', ' ARTESANÍAS ', 'Artesanias!'):
+            with self.subTest(spelling=spelling):
+                response = self.create(spelling)
+                self.assertEqual(response.status_code, 201)
+                self.assertEqual(response.data['category'], 'Artesanías')
+        self.assertEqual(Category.objects.count(), 1)
+        self.assertEqual(self.crafts.products.count(), 4)
+
+    def test_new_and_empty_categories(self):
+        response = self.create('Sombreros')
+        self.assertEqual(response.data['category'], 'Sombreros')
+        self.assertTrue(Category.objects.filter(slug='sombreros').exists())
+
+        self.assertIsNone(self.create('').data['category'])
+        self.assertIsNone(self.create(None).data['category'])
+        response = self.create('¿?')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('category', response.data)
+
+    def test_rejected_writes_leave_no_categories(self):
+        response = self.client.post('/api/products/', {
+            'name': 'Sombrero vueltiao', 'description': 'Caña flecha',
+            'price': 'abc', 'category': 'Sombreros',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post('/api/products/bulk/', {'items': [
+            {'name': 'Ruana', 'description': 'Lana', 'price': 'abc', 'category': 'Ropa'},
+            {'name': 'Hamaca', 'description': 'Algodón', 'price': '90000', 'category': 'Hogar'},
+            {'name': 'Chinchorro', 'description': 'Algodón', 'price': '70000', 'category': 'HOGAR'},
+        ]}, format='json')
+        self.assertEqual(
+            [item['status'] for item in response.data['results']], ['error', 'created', 'created']
+        )
+        self.assertEqual(
+            sorted(Category.objects.values_list('slug', flat=True)), ['artesanias', 'hogar']
+        )
+
+    def test_update_resolves_category(self):
+        product = Product.objects.get(name='Café de Huila')
+        response = self.client.patch(
+            f'/api/products/{product.pk}/', {'category': 'Alimentos'}, format='json'
+        )
+        self.assertEqual(response.data['category'], 'Alimentos')
+        product.refresh_from_db()
+        self.assertEqual(product.category.slug, 'alimentos')
+
+        response = self.client.patch(
+            f'/api/products/{product.pk}/', {'stock': 'x', 'category': 'Bebidas'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Category.objects.filter(slug='bebidas').exists())
+
+    def test_filter_by_name_uses_category_id(self):
+        category_map()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/', {'category': 'ARTESANIAS'})
+        self.assertEqual([p['name'] for p in response.data['results']], ['Mochila Wayuu'])
+        self.assertEqual(response.data['results'][0]['category'], 'Artesanías')
+        sql = '\n'.join(q['sql'] for q in queries)
+        self.assertIn(f'"category_id" = {self.crafts.pk}', sql)
+        self.assertNotIn('FROM "products_category"', sql)
+
+        response = self.client.get('/api/products/', {'category': 'Zapatos'})
+        self.assertEqual(response.data['count'], 0)
+
+    def test_rename_updates_search_and_listing(self):
+        self.crafts.name = 'Artesanías colombianas'
+        self.crafts.save()
+        response = self.client.get('/api/products/', {'search': 'colombianas'})
+        self.assertEqual([p['name'] for p in response.data['results']], ['Mochila Wayuu'])
+        self.assertEqual(response.data['results'][0]['category'], 'Artesanías colombianas')
+
+
+class FoldCategoriesMigrationTests(TransactionTestCase):
+
+    migrate_from = [('products', '0005_product_vendor_name_idx')]
+    migrate_to = [('products', '0006_category')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_spellings_fold_into_one_category(self):
+        apps = self.migrate(self.migrate_from)
+        user = apps.get_model('users', 'User').objects.create(email='v@example.com', username='v')
+        vendor = apps.get_model('vendors', 'Vendor').objects.create(user=user, business_name='Tienda')
+        OldProduct = apps.get_model('products', 'Product')
+        for name, category in [
+            ('Mochila', 'Artesanías'), ('Hamaca', 'Artesanías'), ('Canasto', 'artesanias'),
+            ('Ruana', ' ROPA '), ('Kit', ''), ('Combo', '¿?'),
+        ]:
+            OldProduct.objects.create(
+                vendor=vendor, name=name, description='', price=Decimal('1000'), category=category
+            )
+
+        apps = self.migrate(self.migrate_to)
+        NewProduct = apps.get_model('products', 'Product')
+        self.assertEqual(
+            list(apps.get_model('products', 'Category').objects.values_list('slug', 'name')),
+            [('artesanias', 'Artesanías'), ('ropa', 'ROPA')]
+        )
+        self.assertEqual(
+            dict(NewProduct.objects.values_list('name', 'category__slug')),
+            {
+                'Mochila': 'artesanias', 'Hamaca': 'artesanias', 'Canasto': 'artesanias',
+                'Ruana': 'ropa', 'Kit': None, 'Combo': None,
+            }
+        )
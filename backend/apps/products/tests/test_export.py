@@ -0,0 +1,94 @@
+"""
+Exportación del catálogo en streaming: NDJSON y CSV con los mismos valores
+que el listado, filtros del listado y solo productos activos.
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.products.export import EXPORT_FIELDS
+from apps.products.models import Category, Product
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+class ExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='x',
+            first_name='María', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(user=user, business_name='Café del Eje')
+        food = Category.objects.create(name='Alimentos', slug='alimentos')
+        cls.coffee = Product.objects.create(
+            vendor=cls.vendor, name='Café de Huila', description='Tostión "media", molido',
+            price=Decimal('45000'), stock=3, category=food
+        )
+        Product.objects.create(
+            vendor=cls.vendor, name='Mochila Wayuu', description='Tejida a mano',
+            price=Decimal('180000')
+        )
+        Product.objects.create(
+            vendor=cls.vendor, name='Panela retirada', description='Agotada',
+            price=Decimal('8000'), is_active=False
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def export(self, **params):
+        response = self.client.get('/api/products/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response, body = self.export(ordering='name')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertIn('productos.ndjson', response['Content-Disposition'])
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Café de Huila', 'Mochila Wayuu'])
+        self.assertCountEqual(rows[0], EXPORT_FIELDS)
+        self.assertEqual(rows[0]['category'], 'Alimentos')
+        self.assertIsNone(rows[1]['category'])
+        self.assertEqual(rows[0]['vendor_name'], 'Café del Eje')
+
+    def test_values_match_listing(self):
+        _, body = self.export(ordering='name')
+        exported = json.loads(body.splitlines()[0])
+        listed = self.client.get('/api/products/?search=huila').data['results'][0]
+        for field in ('id', 'name', 'description', 'price', 'stock', 'category', 'vendor_name', 'created_at'):
+            with self.subTest(field=field):
+                self.assertEqual(exported[field], listed[field])
+
+    def test_csv(self):
+        response, body = self.export(format='csv', ordering='name')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], EXPORT_FIELDS)
+        self.assertEqual(len(rows), 3)
+        row = dict(zip(rows[0], rows[1]))
+        self.assertEqual(row['description'], 'Tostión "media", molido')
+        self.assertEqual(row['price'], '45000.00')
+
+    def test_csv_by_accept_header(self):
+        response = self.client.get('/api/products/export/', HTTP_ACCEPT='text/csv')
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+
+    def test_filters(self):
+        _, body = self.export(category='alimentos')
+        self.assertEqual([json.loads(line)['id'] for line in body.splitlines()], [self.coffee.pk])
+        _, body = self.export(search='wayuu', format='csv')
+        self.assertEqual(len(body.splitlines()), 2)
@@ -0,0 +1,133 @@
+"""
+Facetas del catálogo: los conteos deben coincidir con los del listado y
+calcularse con agregaciones (un número fijo de consultas).
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.products.facets import compute_facets, price_buckets
+from apps.products.models import Category, Product
+from apps.products.search import search
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+class ProductFacetsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendors = []
+        for name in ['Café del Eje', 'Artesanías Wayuu']:
+            user = User.objects.create_user(
+                email=f'{len(cls.vendors)}@example.com', username=f'v{len(cls.vendors)}',
+                password='x', first_name='V', last_name='R'
+            )
+            cls.vendors.append(Vendor.objects.create(user=user, business_name=name))
+        cafe, wayuu = cls.vendors
+        food = Category.objects.create(name='Alimentos', slug='alimentos')
+        crafts = Category.objects.create(name='Artesanías', slug='artesanias')
+        for vendor, name, price, category, active in [
+            (cafe, 'Café de Huila', '9999.99', food, True),
+            (cafe, 'Café del Tolima', '10000', food, True),
+            (cafe, 'Panela orgánica', '19999.99', food, True),
+            (cafe, 'Café inactivo', '15000', food, False),
+            (wayuu, 'Mochila Wayuu', '250000', crafts, True),
+            (wayuu, 'Sombrero vueltiao', '1500000', None, True),
+        ]:
+            Product.objects.create(
+                vendor=vendor, name=name, description='Hecho en Colombia',
+                price=Decimal(price), category=category, is_active=active
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def histogram(self, data):
+        return {bucket['min']: bucket['count'] for bucket in data['price']['histogram']}
+
+    def test_facets(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/facets/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 3)
+
+        data = response.data
+        self.assertEqual(data['total'], 5)
+        self.assertEqual(data['categories'], [
+            {'value': 'Alimentos', 'count': 3},
+            {'value': None, 'count': 1},
+            {'value': 'Artesanías', 'count': 1},
+        ])
+        self.assertEqual(data['vendors'], [
+            {'id': self.vendors[0].pk, 'business_name': 'Café del Eje', 'count': 3},
+            {'id': self.vendors[1].pk, 'business_name': 'Artesanías Wayuu', 'count': 2},
+        ])
+        self.assertEqual((data['price']['min'], data['price']['max']), ('9999.99', '1500000.00'))
+        # El mínimo de cada franja se incluye y el máximo se excluye
+        self.assertEqual(self.histogram(data), {
+            None: 1, '10000.00': 2, '20000.00': 0, '50000.00': 0, '100000.00': 0,
+            '200000.00': 1, '500000.00': 0, '1000000.00': 1,
+        })
+        self.assertEqual(data['price']['histogram'][-1]['max'], None)
+
+    def test_facets_follow_list_filters(self):
+        response = self.client.get('/api/products/facets/', {'search': 'cafe'})
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['categories'], [{'value': 'Alimentos', 'count': 2}])
+        listed = self.client.get('/api/products/', {'search': 'cafe'}).data['count']
+        self.assertEqual(response.data['total'], listed)
+
+        response = self.client.get('/api/products/facets/', {'vendor': self.vendors[1].pk})
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(len(response.data['vendors']), 1)
+
+        response = self.client.get('/api/products/facets/', {'category': 'Ropa'})
+        self.assertEqual(response.data['total'], 0)
+        self.assertEqual(response.data['categories'], [])
+        self.assertEqual(response.data['price']['min'], None)
+        self.assertEqual(set(self.histogram(response.data).values()), {0})
+
+    def test_facets_cached_per_catalog_version(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.vendors[0].user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self.client.get('/api/products/facets/')['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/facets/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(len(queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/products/', {
+                'name': 'Arequipe', 'description': 'Dulce de leche', 'price': '12000.00',
+                'stock': 4, 'category': 'Postres',
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.get('/api/products/facets/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['total'], 6)
+
+    def test_custom_edges(self):
+        self.assertEqual(price_buckets([Decimal('5'), Decimal('1'), Decimal('5')]), [
+            (None, Decimal('1')), (Decimal('1'), Decimal('5')), (Decimal('5'), None),
+        ])
+        facets = compute_facets(Product.objects.filter(is_active=True), edges=[Decimal('20000')])
+        self.assertEqual([bucket['count'] for bucket in facets['price']['histogram']], [3, 2])
+
+    def test_listing_queryset_is_not_modified(self):
+        listing = search(Product.objects.filter(is_active=True), 'cafe').order_by('search_rank')
+        facets = compute_facets(listing)
+        self.assertEqual(facets['total'], 2)
+        self.assertEqual(facets['vendors'][0]['count'], 2)
+        self.assertIn('search_rank', listing.query.annotations)
+        self.assertEqual(listing.query.order_by, ('search_rank',))
+        self.assertEqual(len(listing), 2)
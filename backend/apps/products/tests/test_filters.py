@@ -0,0 +1,132 @@
+"""
+Filtros del listado de productos (``ProductFilter``): rangos de precio y de
+fechas, ``in_stock`` y ``category__in``, solos y combinados, también en las
+facetas y la exportación.
+"""
+
+import json
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.products.models import Category, Product
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class ProductFilterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='vendor@example.com', username='vendor',
+            password='x', first_name='V', last_name='R'
+        )
+        vendor = Vendor.objects.create(user=user, business_name='Café del Eje')
+        food = Category.objects.create(name='Alimentos', slug='alimentos')
+        crafts = Category.objects.create(name='Artesanías', slug='artesanias')
+        clothes = Category.objects.create(name='Ropa', slug='ropa')
+
+        cls.products = {}
+        for name, price, stock, category, created_at, updated_at, active in [
+            ('Café', '9999.99', 10, food, _utc(2025, 1, 10), _utc(2025, 6, 1), True),
+            ('Panela', '10000', 0, food, _utc(2025, 2, 10), _utc(2025, 2, 10), True),
+            ('Mochila', '250000', 3, crafts, _utc(2025, 3, 10, 12), _utc(2025, 3, 10), True),
+            ('Ruana', '80000', 0, clothes, _utc(2025, 4, 10), _utc(2025, 7, 1), True),
+            ('Sombrero', '1500000', 1, None, _utc(2025, 5, 10), _utc(2025, 5, 10), True),
+            ('Café inactivo', '10000', 5, food, _utc(2025, 5, 10), _utc(2025, 8, 1), False),
+        ]:
+            product = Product.objects.create(
+                vendor=vendor, name=name, description='Hecho en Colombia',
+                price=Decimal(price), stock=stock, category=category, is_active=active
+            )
+            Product.objects.filter(pk=product.pk).update(created_at=created_at, updated_at=updated_at)
+            cls.products[name] = product
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def names(self, params):
+        response = self.client.get('/api/products/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return {row['name'] for row in response.data['results']}
+
+    def test_price_range(self):
+        self.assertEqual(self.names({'min_price': '10000'}), {'Panela', 'Mochila', 'Ruana', 'Sombrero'})
+        self.assertEqual(self.names({'max_price': '10000'}), {'Café', 'Panela'})
+        self.assertEqual(
+            self.names({'min_price': '10000.00', 'max_price': '250000'}), {'Panela', 'Mochila', 'Ruana'}
+        )
+        self.assertEqual(self.names({'min_price': '300000', 'max_price': '100'}), set())
+
+    def test_in_stock(self):
+        self.assertEqual(self.names({'in_stock': 'true'}), {'Café', 'Mochila', 'Sombrero'})
+        self.assertEqual(self.names({'in_stock': 'false'}), {'Panela', 'Ruana'})
+
+    def test_dates(self):
+        self.assertEqual(self.names({'created_after': '2025-03-10'}), {'Mochila', 'Ruana', 'Sombrero'})
+        self.assertEqual(
+            self.names({'created_after': '2025-03-10T12:00:01Z'}), {'Ruana', 'Sombrero'}
+        )
+        # Las fechas sin zona se interpretan en TIME_ZONE (Bogotá, UTC-5)
+        self.assertEqual(self.names({'created_after': '2025-03-10T07:00:01'}), {'Ruana', 'Sombrero'})
+        self.assertEqual(self.names({'updated_since': '2025-05-15'}), {'Café', 'Ruana'})
+
+    def test_category_in(self):
+        self.assertEqual(
+            self.names({'category__in': 'alimentos, ARTESANÍAS'}), {'Café', 'Panela', 'Mochila'}
+        )
+        self.assertEqual(self.names({'category__in': 'Ropa,Juguetes'}), {'Ruana'})
+        self.assertEqual(self.names({'category__in': 'Juguetes'}), set())
+
+    def test_combined(self):
+        self.assertEqual(
+            self.names({
+                'category__in': 'Alimentos,Artesanías,Ropa', 'max_price': '100000', 'in_stock': 'false',
+            }),
+            {'Panela', 'Ruana'}
+        )
+        self.assertEqual(
+            self.names({'min_price': '50000', 'in_stock': 'true', 'created_after': '2025-04-01'}),
+            {'Sombrero'}
+        )
+        response = self.client.get(
+            '/api/products/', {'in_stock': 'true', 'ordering': 'price', 'pagination': 'cursor'}
+        )
+        self.assertEqual(
+            [row['name'] for row in response.data['results']], ['Café', 'Mochila', 'Sombrero']
+        )
+
+    def test_invalid_values(self):
+        for params in [
+            {'min_price': 'barato'},
+            {'created_after': 'ayer'},
+            {'updated_since': '2025-13-01'},
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get('/api/products/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(params)), response.data)
+
+    def test_facets_and_export_apply_filters(self):
+        params = {'max_price': '100000', 'in_stock': 'false'}
+        response = self.client.get('/api/products/facets/', params)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(
+            {row['value']: row['count'] for row in response.data['categories']},
+            {'Alimentos': 1, 'Ropa': 1}
+        )
+
+        response = self.client.get('/api/products/export/', {**params, 'format': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual({row['name'] for row in rows}, {'Panela', 'Ruana'})
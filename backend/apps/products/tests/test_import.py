@@ -0,0 +1,188 @@
+"""
+Importación de productos desde CSV/NDJSON con ``import_products``: lectura
+de ambos formatos, duplicados entre bloques, reanudación desde el checkpoint
+y actualización del contador, el índice de búsqueda y la caché.
+"""
+
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.products.management.commands.import_products import Command
+from apps.products.models import Category, Product
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+class ImportProductsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='x',
+            first_name='María', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(user=user, business_name='Café del Eje')
+        cls.food = Category.objects.create(name='Alimentos', slug='alimentos')
+
+    def setUp(self):
+        cache.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        return path
+
+    def run_import(self, path, **options):
+        out, err = StringIO(), StringIO()
+        call_command('import_products', path, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_categories(self):
+        path = self.write('productos.csv', (
+            'vendor_id,name,description,price,stock,category\n'
+            f'{self.vendor.pk},Café,Tostión media,1000,5,ALIMENTOS\n'
+            f'{self.vendor.pk},Mochila,Tejida a mano,90000,1,Artesanías\n'
+            f'{self.vendor.pk},Hamaca,Algodón,70000,1,artesanias\n'
+            f'{self.vendor.pk},Panela,Orgánica,8000,3,\n'
+        ))
+        self.run_import(path)
+
+        categories = dict(Product.objects.values_list('name', 'category__slug'))
+        self.assertEqual(categories, {
+            'Café': 'alimentos', 'Mochila': 'artesanias', 'Hamaca': 'artesanias', 'Panela': None,
+        })
+        self.assertEqual(Category.objects.count(), 2)
+        self.assertEqual(Category.objects.get(slug='artesanias').name, 'Artesanías')
+
+    def test_csv(self):
+        path = self.write('productos.csv', (
+            '\ufeffname,description,price,stock,image\n'
+            'Café,"Tostión media, molido",1000,5,\n'
+            '"Mochila ""Wayuu""","Tejida\na mano",90000,,https://cdn.example.com/m.jpg\n'
+            'Sin precio,x,,1,\n'
+        ))
+        out, err = self.run_import(path, vendor=self.vendor.pk)
+
+        self.assertIn('2 creados', out)
+        self.assertIn('1 con errores', out)
+        self.assertIn('Fila 3', err)
+        coffee = Product.objects.get(name='Café')
+        self.assertEqual(
+            (coffee.vendor_id, coffee.description, coffee.price, coffee.stock),
+            (self.vendor.pk, 'Tostión media, molido', Decimal('1000'), 5)
+        )
+        bag = Product.objects.get(name='Mochila "Wayuu"')
+        self.assertEqual((bag.description, bag.stock), ('Tejida\na mano', 0))
+        self.assertFalse(os.path.exists(f'{path}.checkpoint.json'))
+
+    def test_ndjson(self):
+        rows = [
+            {'vendor_id': self.vendor.pk, 'name': 'Café', 'description': 'Tostión media', 'price': '1000'},
+            {'vendor_id': 999, 'name': 'Huérfano', 'description': 'x', 'price': '1'},
+            {'name': 'Panela', 'description': 'Orgánica', 'price': 8000, 'is_active': False},
+        ]
+        path = self.write('productos.ndjson', '\n'.join(
+            [json.dumps(rows[0]), '', '{no es json', '[1, 2]', json.dumps(rows[1]), json.dumps(rows[2])]
+        ) + '\n')
+        out, err = self.run_import(path, vendor=self.vendor.pk)
+
+        self.assertIn('2 creados', out)
+        self.assertIn('3 con errores', out)
+        self.assertIn('JSON inválido', err)
+        self.assertIn('Vendedor 999 no existe', err)
+        self.assertFalse(Product.objects.get(name='Panela').is_active)
+
+    def test_format_option_and_missing_file(self):
+        path = self.write('productos.txt', f'vendor_id,name,description,price\n{self.vendor.pk},Café,x,1\n')
+        self.run_import(path, format='csv')
+        self.assertTrue(Product.objects.filter(name='Café').exists())
+        with self.assertRaises(CommandError):
+            self.run_import(os.path.join(self.tmp.name, 'no-existe.csv'))
+
+    def test_duplicates_across_chunks(self):
+        Product.objects.create(
+            vendor=self.vendor, name='Café', description='Ya existía', price=Decimal('1000')
+        )
+        names = ['Café', 'Panela', 'Arepa', 'Panela', 'Bocadillo', 'Arepa']
+        path = self.write('productos.csv', 'name,description,price\n' + ''.join(
+            f'{name},x,1000\n' for name in names
+        ))
+        out, _ = self.run_import(path, vendor=self.vendor.pk, batch_size=2)
+
+        self.assertIn('3 creados, 3 duplicados', out)
+        self.assertEqual(Product.objects.filter(name='Panela').count(), 1)
+        self.assertEqual(Product.objects.get(name='Café').description, 'Ya existía')
+
+    def interrupted_import(self, path, **options):
+        """Importar hasta confirmar el primer bloque y fallar justo después."""
+        with mock.patch.object(Command, 'report_progress', side_effect=RuntimeError('corte')):
+            with self.assertRaises(RuntimeError):
+                self.run_import(path, **options)
+
+    def test_resume_from_checkpoint(self):
+        names = ['Café', 'Panela', 'Arepa', 'Bocadillo', 'Ruana']
+        path = self.write('productos.csv', 'name,description,price\n' + ''.join(
+            f'{name},x,1000\n' for name in names
+        ))
+        self.interrupted_import(path, vendor=self.vendor.pk, batch_size=2)
+        self.assertEqual(sorted(Product.objects.values_list('name', flat=True)), ['Café', 'Panela'])
+        with open(f'{path}.checkpoint.json') as fh:
+            self.assertEqual(json.load(fh)['rows'], 2)
+
+        out, _ = self.run_import(path, vendor=self.vendor.pk, batch_size=2, resume=True)
+        self.assertIn('Reanudando desde la fila 2', out)
+        self.assertIn('5 creados, 0 duplicados', out)
+        self.assertCountEqual(Product.objects.values_list('name', flat=True), names)
+        self.assertFalse(os.path.exists(f'{path}.checkpoint.json'))
+
+    def test_resume_skips_csv_header(self):
+        path = self.write('productos.csv', 'name,description,price\nCafé,x,1000\n')
+        # Checkpoint guardado antes de leer el encabezado
+        with open(f'{path}.checkpoint.json', 'w') as fh:
+            json.dump({
+                'path': os.path.abspath(path), 'size': os.path.getsize(path),
+                'offset': 0, 'rows': 0, 'stats': {},
+            }, fh)
+        out, err = self.run_import(path, vendor=self.vendor.pk, resume=True)
+        self.assertIn('1 creados', out)
+        self.assertEqual(err, '')
+
+    def test_resume_rejects_changed_file(self):
+        path = self.write('productos.csv', 'name,description,price\nCafé,x,1000\nPanela,x,1\n')
+        self.interrupted_import(path, vendor=self.vendor.pk, batch_size=1)
+        with open(path, 'a') as fh:
+            fh.write('Arepa,x,1\n')
+        with self.assertRaisesMessage(CommandError, 'el archivo cambió'):
+            self.run_import(path, vendor=self.vendor.pk, resume=True)
+
+    def test_counter_search_and_cache(self):
+        url = f'/api/products/by-vendor/{self.vendor.pk}/'
+        self.assertEqual(self.client.get(url).data['count'], 0)
+        path = self.write('productos.csv', 'name,description,price,is_active\n' + ''.join(
+            f'Café {i},Tostión media,1000,{i != 2}\n' for i in range(3)
+        ))
+
+        # Cada bloque confirmado invalida la caché aunque la importación no termine
+        with self.captureOnCommitCallbacks(execute=True):
+            self.interrupted_import(path, vendor=self.vendor.pk, batch_size=2)
+        self.assertEqual(self.client.get(url).data['count'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_import(path, vendor=self.vendor.pk, batch_size=2, resume=True)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.active_products_count, 2)
+        response = self.client.get('/api/products/', {'search': 'tostion'})
+        self.assertEqual(sorted(p['name'] for p in response.data['results']), ['Café 0', 'Café 1'])
@@ -0,0 +1,154 @@
+"""
+Contrato de la ruta rápida de listados: las filas de ``ValuesSerializer``
+deben producir el mismo JSON, byte a byte, que ``ProductListSerializer``.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.core.pagination import CatalogPagination
+from apps.core.renderers import ORJSONRenderer
+from apps.products.listing import product_list
+from apps.products.models import Category, Product
+from apps.products.serializers import ProductListSerializer
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+# Precios y fechas en los bordes del formato: centavos, ceros a la derecha,
+# microsegundos en cero y medianoche UTC (día anterior en Bogotá)
+ROWS = [
+    ('Café de Huila', 'Tostión media', Decimal('45000.00'), datetime(2025, 3, 1, 0, 0, 0, 0)),
+    ('Mochila Wayuu', 'Tejida a mano "tradicional"', Decimal('0.10'), datetime(2025, 3, 1, 4, 59, 59, 999999)),
+    ('Panela orgánica', 'Línea 1 línea 2', Decimal('9999999.99'), datetime(2024, 12, 31, 23, 0, 0, 120)),
+    ('Hamaca', '', Decimal('125000.50'), datetime(2025, 6, 15, 12, 30, 0, 500000)),
+    ('Ruana', 'Lana de Boyacá', Decimal('80000'), datetime(2025, 6, 15, 12, 30, 0, 500000)),
+]
+
+
+class ProductListingContractTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendors = []
+        for i, name in enumerate(['Café del Eje', 'Artesanías Ñuñoa']):
+            user = User.objects.create_user(
+                email=f'vendor{i}@example.com', username=f'vendor{i}',
+                password='x', first_name='V', last_name=str(i)
+            )
+            cls.vendors.append(Vendor.objects.create(user=user, business_name=name))
+        cls.owner = cls.vendors[0].user
+        food = Category.objects.create(name='Alimentos', slug='alimentos')
+
+        for n in range(3):
+            for i, (name, description, price, created_at) in enumerate(ROWS):
+                product = Product.objects.create(
+                    vendor=cls.vendors[i % 2], name=f'{name} {n}', description=description,
+                    price=price + n, stock=i * n, category=food if i % 2 else None,
+                    image='' if i % 3 else f'https://cdn.example.com/{n}-{i}.jpg',
+                )
+                Product.objects.filter(pk=product.pk).update(
+                    created_at=created_at.replace(tzinfo=dt_timezone.utc, year=created_at.year - n)
+                )
+        Product.objects.filter(name__startswith='Ruana 2').update(is_active=False)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def assertSameAsSerializer(self, queryset):
+        fast = product_list.to_representation(product_list.values(queryset))
+        expected = ProductListSerializer(queryset.select_related('vendor', 'category'), many=True).data
+        self.assertEqual(fast, expected)
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            self.assertEqual(renderer.render(fast), renderer.render(expected))
+
+    def test_rows_match_serializer(self):
+        active = Product.objects.filter(is_active=True)
+        for ordering in ([], ['price'], ['-name'], ['stock', '-created_at']):
+            with self.subTest(ordering=ordering):
+                self.assertSameAsSerializer(active.order_by(*ordering) if ordering else active)
+
+    def test_rows_follow_active_timezone(self):
+        for zone in ('UTC', 'Asia/Kolkata'):
+            with self.subTest(zone=zone), timezone.override(zone):
+                self.assertSameAsSerializer(Product.objects.all())
+
+    def assertEndpointMatches(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        data = response.data
+        results = data['results'] if isinstance(data, dict) else data
+        self.assertTrue(results, url)
+        ids = [row['id'] for row in results]
+        objects = Product.objects.select_related('vendor', 'category').in_bulk(ids)
+        expected = ProductListSerializer([objects[pk] for pk in ids], many=True).data
+        if isinstance(data, dict):
+            expected = {**data, 'results': expected}
+        self.assertEqual(response.content, JSONRenderer().render(expected), url)
+        return response
+
+    def test_endpoints_are_byte_identical(self):
+        vendor = self.vendors[0]
+        for url in (
+            '/api/products/',
+            '/api/products/?page=2',
+            '/api/products/?ordering=price',
+            '/api/products/?ordering=-stock&category=Alimentos',
+            '/api/products/?search=cafe',
+            '/api/products/?pagination=cursor&ordering=-price',
+            f'/api/products/by-vendor/{vendor.pk}/',
+            f'/api/products/by-vendor/{vendor.pk}/?ordering=name',
+        ):
+            with self.subTest(url=url):
+                self.assertEndpointMatches(url)
+
+        token = CustomTokenObtainPairSerializer.get_token(self.owner).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.assertEndpointMatches('/api/products/my_products/')
+        self.assertEqual(len(response.data), Product.objects.filter(vendor=vendor, is_active=True).count())
+
+    def test_keyset_cursor_matches_model_instances(self):
+        factory = APIRequestFactory()
+        queryset = Product.objects.filter(is_active=True)
+        for ordering in ('-created_at', 'price', '-name'):
+            with self.subTest(ordering=ordering):
+                request = Request(factory.get('/api/products/', {'pagination': 'cursor'}))
+                ordered = queryset.order_by(ordering)
+                links = []
+                for rows in (ordered, product_list.values(ordered)):
+                    paginator = CatalogPagination()
+                    paginator.paginate_queryset(rows, request)
+                    links.append((paginator.get_next_link(), paginator.get_previous_link()))
+                self.assertEqual(links[0], links[1])
+                self.assertIsNotNone(links[0][0])
+
+    def test_cursor_walk_covers_every_product_once(self):
+        seen = []
+        url = '/api/products/?pagination=cursor&ordering=price'
+        while url:
+            response = self.client.get(url)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(
+            seen, list(Product.objects.filter(is_active=True).order_by('price', 'id').values_list('id', flat=True))
+        )
+
+    def test_page_count_skips_vendor_join(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/?ordering=price')
+        self.assertEqual(response.data['count'], Product.objects.filter(is_active=True).count())
+        counts = [q['sql'] for q in queries if 'COUNT(*)' in q['sql'] and 'MAX(' not in q['sql']]
+        self.assertEqual(len(counts), 1)
+        self.assertNotIn('JOIN', counts[0])
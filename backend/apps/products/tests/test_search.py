@@ -0,0 +1,111 @@
+"""
+Búsqueda de texto completo: sin mayúsculas ni tildes, por prefijo, ordenada
+por relevancia y sincronizada con los cambios de los productos.
+"""
+
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from apps.products.models import Category, Product
+from apps.products.search import build_match_query
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+class MatchQueryTests(SimpleTestCase):
+
+    def test_words_are_quoted_prefixes(self):
+        self.assertEqual(build_match_query('café  Huila'), '"café"* "Huila"*')
+
+    def test_fts_syntax_is_ignored(self):
+        self.assertEqual(build_match_query('mochila OR "wayuu* (NEAR'), '"mochila"* "OR"* "wayuu"* "NEAR"*')
+        self.assertIsNone(build_match_query(' -*" '))
+        self.assertIsNone(build_match_query(None))
+
+
+class ProductSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='x',
+            first_name='María', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(user=user, business_name='Café del Eje')
+        food = Category.objects.create(name='Alimentos', slug='alimentos')
+        cls.coffee = Product.objects.create(
+            vendor=cls.vendor, name='Café de Huila', description='Tostión media',
+            price=Decimal('45000'), category=food
+        )
+        cls.mug = Product.objects.create(
+            vendor=cls.vendor, name='Taza de cerámica', description='Ideal para el CAFÉ de la mañana',
+            price=Decimal('30000')
+        )
+        cls.bag = Product.objects.create(
+            vendor=cls.vendor, name='Mochila Wayuu', description='Tejida a mano',
+            price=Decimal('180000')
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def search(self, term, **params):
+        response = self.client.get('/api/products/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['name'] for item in response.data['results']]
+
+    def test_ignores_case_and_accents(self):
+        self.assertEqual(self.search('cafe'), ['Café de Huila', 'Taza de cerámica'])
+        self.assertEqual(self.search('CERAMICA'), ['Taza de cerámica'])
+
+    def test_prefixes_and_all_words(self):
+        self.assertEqual(self.search('moch'), ['Mochila Wayuu'])
+        self.assertEqual(self.search('cafe huila'), ['Café de Huila'])
+        self.assertEqual(self.search('cafe wayuu'), [])
+
+    def test_matches_category_name(self):
+        self.assertEqual(self.search('alimentos'), ['Café de Huila'])
+
+    def test_explicit_ordering_overrides_relevance(self):
+        self.assertEqual(self.search('cafe', ordering='price'), ['Taza de cerámica', 'Café de Huila'])
+
+    def test_fts_syntax_does_not_fail(self):
+        self.assertEqual(self.search('"cafe* NEAR('), [])
+        self.assertEqual(self.search('cafe* ('), ['Café de Huila', 'Taza de cerámica'])
+        self.assertEqual(len(self.search('***')), 3)
+
+    def test_index_follows_product_changes(self):
+        # La versión del catálogo cambia al confirmar: sin eso, la caché
+        # devolvería la búsqueda anterior
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bag.name = 'Hamaca Wayuu'
+            self.bag.save()
+        self.assertEqual(self.search('hamaca'), ['Hamaca Wayuu'])
+        self.assertEqual(self.search('mochila'), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bag.is_active = False
+            self.bag.save()
+        self.assertEqual(self.search('hamaca'), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.coffee.delete()
+        self.assertEqual(self.search('huila'), [])
+
+    def test_rebuild_command(self):
+        Product.objects.filter(pk=self.bag.pk).update(name='Ruana de lana')
+        self.assertEqual(self.search('ruana'), [])
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('3 productos', out.getvalue())
+        cache.clear()
+        self.assertEqual(self.search('ruana'), ['Ruana de lana'])
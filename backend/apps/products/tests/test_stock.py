@@ -0,0 +1,330 @@
+"""
+Operaciones de stock: descuento atómico de varios productos, reservas con
+vencimiento y una prueba de carga con cientos de peticiones concurrentes que
+no deben vender más unidades de las que hay.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core.cache import get_catalog_version
+from apps.products.models import Product, StockReservation
+from apps.products.stock import expire_reservations, purge_reservations
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+def _client(user):
+    client = APIClient()
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def _items(*pairs):
+    return {'items': [{'product': product.pk, 'quantity': quantity} for product, quantity in pairs]}
+
+
+class StockOperationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        vendor_user = User.objects.create_user(
+            email='vendor@example.com', username='vendor',
+            password='x', first_name='V', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(user=vendor_user, business_name='Café del Eje')
+        cls.buyer = User.objects.create_user(
+            email='buyer@example.com', username='buyer',
+            password='x', first_name='B', last_name='R'
+        )
+        cls.other = User.objects.create_user(
+            email='other@example.com', username='other',
+            password='x', first_name='O', last_name='R'
+        )
+        cls.coffee, cls.panela, cls.inactive = [
+            Product.objects.create(
+                vendor=cls.vendor, name=name, description='Hecho en Colombia',
+                price=Decimal('10000'), stock=stock, is_active=active
+            )
+            for name, stock, active in [('Café', 5, True), ('Panela', 2, True), ('Ruana', 9, False)]
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = _client(self.buyer)
+
+    def stock(self, product):
+        return Product.objects.values_list('stock', flat=True).get(pk=product.pk)
+
+    def reserve(self, *pairs, client=None, **extra):
+        response = (client or self.client).post(
+            '/api/products/stock/reservations/', {**_items(*pairs), **extra}, format='json'
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data
+
+    def test_decrement_several_products_in_one_update(self):
+        version = get_catalog_version(self.vendor.pk)
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/products/stock/decrement/', _items((self.coffee, 2), (self.panela, 2)), format='json'
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['items'], [
+            {'product': self.coffee.pk, 'stock': 3}, {'product': self.panela.pk, 'stock': 0},
+        ])
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual((self.stock(self.coffee), self.stock(self.panela)), (3, 0))
+        self.assertNotEqual(get_catalog_version(self.vendor.pk), version)
+
+    def test_decrement_is_all_or_nothing(self):
+        response = self.client.post(
+            '/api/products/stock/decrement/',
+            _items((self.coffee, 1), (self.panela, 3), (self.inactive, 1)), format='json'
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['items'], [
+            {'product': self.coffee.pk, 'requested': 1, 'available': 5},
+            {'product': self.panela.pk, 'requested': 3, 'available': 2},
+            {'product': self.inactive.pk, 'requested': 1, 'available': 0},
+        ])
+        self.assertEqual((self.stock(self.coffee), self.stock(self.panela)), (5, 2))
+
+    def test_invalid_requests(self):
+        for data in [
+            {'items': []},
+            _items((self.coffee, 0)),
+            _items((self.coffee, 1), (self.coffee, 1)),
+            {**_items((self.coffee, 1)), 'ttl': 10 ** 6},
+        ]:
+            with self.subTest(data=data):
+                response = self.client.post('/api/products/stock/reservations/', data, format='json')
+                self.assertEqual(response.status_code, 400)
+        response = APIClient().post('/api/products/stock/decrement/', _items((self.coffee, 1)), format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_reserve_and_commit(self):
+        reservation = self.reserve((self.coffee, 2), (self.panela, 1), ttl=60)
+        self.assertEqual(reservation['status'], 'active')
+        self.assertEqual(
+            reservation['items'],
+            [{'product': self.coffee.pk, 'quantity': 2}, {'product': self.panela.pk, 'quantity': 1}]
+        )
+        # Las unidades reservadas dejan de estar disponibles
+        self.assertEqual((self.stock(self.coffee), self.stock(self.panela)), (3, 1))
+
+        url = f"/api/products/stock/reservations/{reservation['id']}/commit/"
+        self.assertEqual(_client(self.other).post(url).status_code, 404)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'committed')
+        self.assertEqual((self.stock(self.coffee), self.stock(self.panela)), (3, 1))
+
+        response = self.client.post(f"/api/products/stock/reservations/{reservation['id']}/release/")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.stock(self.coffee), 3)
+
+    def test_release_returns_units_once(self):
+        reservation = self.reserve((self.coffee, 4))
+        url = f"/api/products/stock/reservations/{reservation['id']}/release/"
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'released')
+        self.assertEqual(self.stock(self.coffee), 5)
+        self.assertEqual(self.client.post(url).status_code, 409)
+        self.assertEqual(self.stock(self.coffee), 5)
+
+    def test_reservation_beyond_stock(self):
+        self.reserve((self.panela, 2))
+        response = self.client.post(
+            '/api/products/stock/reservations/', _items((self.panela, 1)), format='json'
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['items'][0]['available'], 0)
+
+    def test_expired_reservations_are_swept(self):
+        expired = self.reserve((self.coffee, 2), ttl=1)
+        kept = self.reserve((self.coffee, 1), (self.panela, 1), ttl=600)
+        later = timezone.now() + timedelta(seconds=5)
+
+        StockReservation.objects.filter(pk=expired['id']).update(expires_at=timezone.now())
+        response = self.client.post(f"/api/products/stock/reservations/{expired['id']}/commit/")
+        self.assertEqual(response.status_code, 409)
+
+        self.assertEqual(expire_reservations(later), 1)
+        self.assertEqual(expire_reservations(later), 0)
+        self.assertEqual((self.stock(self.coffee), self.stock(self.panela)), (4, 1))
+        statuses = dict(StockReservation.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {expired['id']: 'expired', kept['id']: 'active'})
+
+        # Solo se purgan las reservas ya cerradas
+        self.assertEqual(purge_reservations(later + timedelta(seconds=1)), 1)
+        self.assertEqual(list(StockReservation.objects.values_list('pk', flat=True)), [kept['id']])
+
+    def test_sweeper_command(self):
+        reservation = self.reserve((self.panela, 2))
+        StockReservation.objects.filter(pk=reservation['id']).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        call_command('expire_stock_reservations', stdout=open('/dev/null', 'w'))
+        self.assertEqual(self.stock(self.panela), 2)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class StockConcurrencyTests(TransactionTestCase):
+    """
+    Cientos de compradores a la vez sobre pocas unidades: nunca se vende de más.
+
+    La base de pruebas de SQLite en memoria (caché compartida) no espera a los
+    bloqueos sino que falla con "database table is locked", así que estas
+    pruebas usan un archivo temporal, con el bloqueo de escritura real.
+    """
+
+    BUYERS = 200
+    STOCK = 60
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.mkdtemp()
+        settings_dict = connection.settings_dict
+        cls.original_name = settings_dict['NAME']
+        # close() no cierra una base en memoria (la destruiría): se aparta la
+        # conexión y se restaura al terminar
+        cls.memory_connection, connection.connection = connection.connection, None
+        settings_dict['NAME'] = os.path.join(cls.directory, 'stock.sqlite3')
+        call_command('migrate', verbosity=0, interactive=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        connection.close()
+        connection.settings_dict['NAME'] = cls.original_name
+        connection.connection = cls.memory_connection
+        shutil.rmtree(cls.directory, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        vendor_user = User.objects.create_user(
+            email='vendor@example.com', username='vendor',
+            password='x', first_name='V', last_name='R'
+        )
+        vendor = Vendor.objects.create(user=vendor_user, business_name='Café del Eje')
+        self.products = [
+            Product.objects.create(
+                vendor=vendor, name=f'Café {i}', description='Edición limitada',
+                price=Decimal('10000'), stock=self.STOCK
+            )
+            for i in range(2)
+        ]
+        self.buyers = [
+            User.objects.create_user(
+                email=f'buyer{i}@example.com', username=f'buyer{i}',
+                password='x', first_name='B', last_name=str(i)
+            )
+            for i in range(10)
+        ]
+
+    def run_concurrently(self, requests):
+        """Ejecutar ``requests`` (funciones sin argumentos) en hilos que arrancan juntos."""
+        barrier = threading.Barrier(len(requests))
+        results = [None] * len(requests)
+
+        def run(index, request):
+            try:
+                barrier.wait()
+                results[index] = request()
+            except Exception as exc:  # reportado abajo
+                results[index] = exc
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=pair) for pair in enumerate(requests)]
+        # Los 409 se registran como advertencias de django.request
+        with self.assertLogs('django.request', 'WARNING'):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return results
+
+    def test_parallel_purchases_never_oversell(self):
+        first, second = self.products
+
+        def purchase(buyer, quantity):
+            client = _client(buyer)
+            return lambda: (client.post(
+                '/api/products/stock/decrement/', _items((first, quantity), (second, 1)), format='json'
+            ).status_code, quantity)
+
+        results = self.run_concurrently([
+            purchase(self.buyers[i % len(self.buyers)], 1 + i % 2) for i in range(self.BUYERS)
+        ])
+        self.assertEqual(set(map(type, results)), {tuple}, results)
+        self.assertEqual({status for status, _ in results}, {200, 409})
+
+        # Cada compra confirmada descontó sus unidades de los dos productos;
+        # las rechazadas, ninguna
+        sold = [quantity for status, quantity in results if status == 200]
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.stock, self.STOCK - sum(sold))
+        self.assertEqual(second.stock, self.STOCK - len(sold))
+        self.assertGreaterEqual(min(first.stock, second.stock), 0)
+
+    def test_parallel_reservations_never_oversell(self):
+        product = self.products[0]
+
+        def reserve(buyer):
+            client = _client(buyer)
+
+            def request():
+                response = client.post(
+                    '/api/products/stock/reservations/', _items((product, 1)), format='json'
+                )
+                if response.status_code != 201:
+                    return response.status_code, None
+                # La mitad de las reservas se libera: esas unidades vuelven a venderse
+                reservation = response.data['id']
+                action = 'release' if reservation % 2 else 'commit'
+                response = client.post(f'/api/products/stock/reservations/{reservation}/{action}/')
+                return response.status_code, action
+            return request
+
+        results = self.run_concurrently([reserve(self.buyers[i % len(self.buyers)]) for i in range(self.BUYERS)])
+        self.assertEqual(set(map(type, results)), {tuple}, results)
+        self.assertEqual({status for status, _ in results}, {200, 409})
+
+        product.refresh_from_db()
+        committed = StockReservation.objects.filter(status='committed').count()
+        released = StockReservation.objects.filter(status='released').count()
+        self.assertEqual(committed, sum(1 for status, action in results if action == 'commit'))
+        self.assertEqual(released, sum(1 for status, action in results if action == 'release'))
+        self.assertLessEqual(committed, self.STOCK)
+        self.assertEqual(product.stock, self.STOCK - committed)
+
+
+@override_settings(DB_SERIALIZE_WRITES=False)
+class StockConcurrencyWithoutWriteQueueTests(StockConcurrencyTests):
+    """
+    Las mismas compras y reservas sin ``write_queue``: los hilos compiten por
+    el bloqueo de SQLite (``BEGIN IMMEDIATE`` y ``busy_timeout``) y la
+    garantía de no vender de más no debe depender de la cola.
+    """
@@ -1,16 +1,33 @@
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 
 from .models import Product
-from .serializers import ProductSerializer, ProductCreateSerializer, ProductListSerializer
+from .serializers import (
+    ProductSerializer, ProductCreateSerializer, ProductListSerializer, ProductBulkSerializer,
+    ProductFacetsSerializer, StockOperationSerializer, StockReserveSerializer,
+    StockLevelsSerializer, StockReservationSerializer, InsufficientStockSerializer
+)
+from .bulk import bulk_upsert
+from . import stock
+from .facets import VENDOR_FACET_LIMIT, compute_facets
+from .listing import product_list
+from .export import export_rows, stream_csv, stream_ndjson
+from .renderers import CSVRenderer, NDJSONRenderer
 from .permissions import IsProductVendorOwner
+from .filters import ProductFilter, ProductSearchFilter
+from apps.core.cache import cache_catalog_response
+from apps.core.fieldsets import SparseFieldsetMixin, fieldset_parameters
+from apps.core.conditional import conditional_catalog_response
+from apps.core.replicas import ReplicaReadMixin
 from apps.vendors.models import Vendor
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ReplicaReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar productos.
 
@@ -19,40 +36,70 @@ class ProductViewSet(viewsets.ModelViewSet):
     create: Crear producto (solo vendedores).
     update/partial_update: Actualizar producto (solo vendedor dueño).
     destroy: Desactivar producto (solo vendedor dueño).
+    stock_*: Descontar, reservar, confirmar y liberar stock (ver ``apps.products.stock``).
+
+    Las lecturas aceptan ``?fields=`` y ``?omit=`` (ver ``apps.core.fieldsets``)
+    y se sirven desde una réplica si hay (ver ``apps.core.replicas``).
     """
 
-    queryset = Product.objects.filter(is_active=True).select_related('vendor', 'vendor__user')
+    queryset = Product.objects.filter(is_active=True).select_related('vendor', 'vendor__user', 'category')
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsProductVendorOwner]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['category', 'vendor']
-    search_fields = ['name', 'description', 'category']
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, ProductSearchFilter]
+    filterset_class = ProductFilter
+    search_fields = ['name', 'description', 'category__name']
     ordering_fields = ['price', 'created_at', 'name', 'stock']
     ordering = ['-created_at']
+    sparse_fieldset_actions = ('list', 'retrieve', 'my_products', 'by_vendor')
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ('list', 'my_products', 'by_vendor'):
             return ProductListSerializer
         if self.action in ['create', 'update', 'partial_update']:
             return ProductCreateSerializer
         return ProductSerializer
 
+    def list_response(self, queryset, paginate=True):
+        """
+        Listado con la salida de ProductListSerializer sin instanciar modelos.
+
+        Lee filas de ``.values()`` con el nombre del vendedor en la misma
+        consulta (ver ``apps.products.listing``); se pagina antes de convertir
+        para que el cursor keyset use los valores crudos.
+        """
+        fields = self.get_sparse_fields()
+        rows = product_list.values(queryset, fields)
+        page = self.paginate_queryset(rows) if paginate else None
+        if page is not None:
+            return self.get_paginated_response(product_list.to_representation(page, fields))
+        return Response(product_list.to_representation(rows, fields))
+
     @extend_schema(
         summary="Listar productos",
-        description="Obtener lista de todos los productos activos. Soporta filtros, búsqueda y ordenamiento.",
+        description=(
+            "Obtener lista de todos los productos activos. Soporta filtros (categoría o "
+            "`category__in`, vendedor, rango de precio, `in_stock`, `created_after`, "
+            "`updated_since`), búsqueda y ordenamiento."
+        ),
         parameters=[
             OpenApiParameter(name='category', description='Filtrar por categoría', type=str),
             OpenApiParameter(name='vendor', description='Filtrar por ID de vendedor', type=int),
             OpenApiParameter(name='search', description='Buscar por nombre, descripción o categoría', type=str),
             OpenApiParameter(name='ordering', description='Ordenar por: price, created_at, name, stock', type=str),
+            *fieldset_parameters(ProductListSerializer),
         ]
     )
+    @conditional_catalog_response()
+    @cache_catalog_response()
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return self.list_response(self.filter_queryset(self.get_queryset()))
 
     @extend_schema(
         summary="Detalle de producto",
         description="Obtener información detallada de un producto.",
+        parameters=fieldset_parameters(ProductSerializer),
     )
+    @conditional_catalog_response()
+    @cache_catalog_response()
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -64,7 +111,7 @@ class ProductViewSet(viewsets.ModelViewSet):
     )
     def create(self, request, *args, **kwargs):
         # Verificar que el usuario es vendedor
-        if not hasattr(request.user, 'vendor_profile'):
+        if request.user.vendor_id is None:
             return Response(
                 {'detail': 'Debes tener un perfil de vendedor para crear productos.'},
                 status=status.HTTP_403_FORBIDDEN
@@ -104,49 +151,207 @@ class ProductViewSet(viewsets.ModelViewSet):
         product.save()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @extend_schema(
+        summary="Carga masiva de productos",
+        description=(
+            "Crear, actualizar o desactivar muchos productos del vendedor autenticado en una "
+            "sola petición. Los elementos sin `id` se crean; con `id` se actualizan "
+            "(`is_active: false` los desactiva). Devuelve el resultado de cada elemento."
+        ),
+        request=ProductBulkSerializer,
+        responses={200: OpenApiResponse(description="Resumen y resultado por elemento")}
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Crear/actualizar productos en bloque."""
+        # vendor_id sale del token: el vendedor pudo borrarse después de emitirlo
+        vendor = (
+            Vendor.objects.filter(pk=request.user.vendor_id).first()
+            if request.user.vendor_id is not None else None
+        )
+        if vendor is None:
+            return Response(
+                {'detail': 'Debes tener un perfil de vendedor para crear productos.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = ProductBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = bulk_upsert(vendor, serializer.validated_data['items'])
+        return Response(result)
+
+    @extend_schema(
+        summary="Descontar stock",
+        description=(
+            "Descontar unidades de uno o varios productos en una sola operación atómica "
+            "(todo o nada), sin leer antes el stock. Si algún producto no tiene stock "
+            "suficiente responde 409 con el disponible de cada uno y no descuenta nada."
+        ),
+        request=StockOperationSerializer,
+        responses={200: StockLevelsSerializer, 409: InsufficientStockSerializer}
+    )
+    @action(
+        detail=False, methods=['post'], url_path='stock/decrement',
+        permission_classes=[permissions.IsAuthenticated]
+    )
+    def stock_decrement(self, request):
+        """Descontar stock de varios productos."""
+        serializer = StockOperationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        levels = stock.decrement_stock(serializer.quantities)
+        return Response(StockLevelsSerializer({'items': levels}).data)
+
+    @extend_schema(
+        summary="Reservar stock",
+        description=(
+            "Reservar unidades de uno o varios productos durante `ttl` segundos (todo o "
+            "nada). Las unidades dejan de estar disponibles hasta que la reserva se "
+            "confirma, se libera o vence. Sin stock suficiente responde 409."
+        ),
+        request=StockReserveSerializer,
+        responses={201: StockReservationSerializer, 409: InsufficientStockSerializer}
+    )
+    @action(
+        detail=False, methods=['post'], url_path='stock/reservations',
+        permission_classes=[permissions.IsAuthenticated]
+    )
+    def stock_reserve(self, request):
+        """Crear una reserva de stock."""
+        serializer = StockReserveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        reservation = stock.reserve_stock(
+            request.user.pk, serializer.quantities, serializer.validated_data['ttl']
+        )
+        return Response(StockReservationSerializer(reservation).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Liberar reserva de stock",
+        description=(
+            "Devolver al stock las unidades de una reserva activa del usuario autenticado. "
+            "Responde 409 si la reserva ya se confirmó, liberó o venció."
+        ),
+        request=None,
+        responses={200: StockReservationSerializer}
+    )
+    @action(
+        detail=False, methods=['post'],
+        url_path=r'stock/reservations/(?P<reservation_id>[0-9]+)/release',
+        permission_classes=[permissions.IsAuthenticated]
+    )
+    def stock_release(self, request, reservation_id=None):
+        """Liberar una reserva de stock."""
+        reservation = stock.release_reservation(int(reservation_id), request.user.pk)
+        return Response(StockReservationSerializer(reservation).data)
+
+    @extend_schema(
+        summary="Confirmar reserva de stock",
+        description=(
+            "Confirmar una reserva activa y vigente del usuario autenticado: sus unidades "
+            "quedan descontadas definitivamente. Responde 409 si la reserva venció o ya "
+            "se cerró."
+        ),
+        request=None,
+        responses={200: StockReservationSerializer}
+    )
+    @action(
+        detail=False, methods=['post'],
+        url_path=r'stock/reservations/(?P<reservation_id>[0-9]+)/commit',
+        permission_classes=[permissions.IsAuthenticated]
+    )
+    def stock_commit(self, request, reservation_id=None):
+        """Confirmar una reserva de stock."""
+        reservation = stock.commit_reservation(int(reservation_id), request.user.pk)
+        return Response(StockReservationSerializer(reservation).data)
+
+    @extend_schema(
+        summary="Exportar catálogo",
+        description=(
+            "Exportar todos los productos activos en NDJSON (`?format=ndjson`, por defecto) "
+            "o CSV (`?format=csv`). Acepta los mismos filtros que el listado "
+            "(`category`, `vendor`, rangos de precio y fecha, `in_stock`, `search`, `ordering`) "
+            "y se transmite en streaming."
+        ),
+        responses={
+            (200, 'application/x-ndjson'): OpenApiTypes.STR,
+            (200, 'text/csv'): OpenApiTypes.STR,
+        }
+    )
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """Exportar el catálogo filtrado sin cargarlo completo en memoria."""
+        rows = export_rows(self.filter_queryset(self.get_queryset()))
+        renderer = request.accepted_renderer
+        stream = stream_csv(rows) if renderer.format == 'csv' else stream_ndjson(rows)
+
+        response = StreamingHttpResponse(
+            stream, content_type=f'{renderer.media_type}; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'attachment; filename="productos.{renderer.format}"'
+        return response
+
+    @extend_schema(
+        summary="Facetas del catálogo",
+        description=(
+            f"Conteos por categoría, por vendedor (los {VENDOR_FACET_LIMIT} con más productos) e histograma de "
+            "precios de los productos activos que cumplen los mismos filtros que el listado "
+            "(`category`, `vendor`, rangos de precio y fecha, `in_stock`, `search`). Las franjas del histograma incluyen su mínimo "
+            "y excluyen su máximo."
+        ),
+        parameters=[
+            OpenApiParameter(name='category', description='Filtrar por categoría', type=str),
+            OpenApiParameter(name='vendor', description='Filtrar por ID de vendedor', type=int),
+            OpenApiParameter(name='search', description='Buscar por nombre, descripción o categoría', type=str),
+        ],
+        responses={200: ProductFacetsSerializer}
+    )
+    @action(detail=False, methods=['get'])
+    @cache_catalog_response(anonymous_only=False)
+    def facets(self, request):
+        """Facetas del listado filtrado, cacheadas por versión del catálogo."""
+        facets = compute_facets(self.filter_queryset(self.get_queryset()))
+        return Response(ProductFacetsSerializer(facets).data)
+
     @extend_schema(
         summary="Mis productos",
         description="Obtener los productos del vendedor autenticado.",
+        parameters=fieldset_parameters(ProductListSerializer),
         responses={200: ProductListSerializer(many=True)}
     )
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def my_products(self, request):
         """Obtener productos del vendedor autenticado."""
-        if not hasattr(request.user, 'vendor_profile'):
+        if request.user.vendor_id is None:
             return Response(
                 {'detail': 'No tienes un perfil de vendedor.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
         products = Product.objects.filter(
-            vendor=request.user.vendor_profile,
+            vendor_id=request.user.vendor_id,
             is_active=True
         )
-        serializer = ProductListSerializer(products, many=True)
-        return Response(serializer.data)
+        return self.list_response(products, paginate=False)
 
     @extend_schema(
         summary="Productos por vendedor",
-        description="Obtener todos los productos de un vendedor específico.",
+        description="Obtener todos los productos de un vendedor específico. Soporta búsqueda y ordenamiento.",
+        parameters=fieldset_parameters(ProductListSerializer),
         responses={200: ProductListSerializer(many=True)}
     )
     @action(detail=False, methods=['get'], url_path='by-vendor/(?P<vendor_id>[^/.]+)')
+    @conditional_catalog_response(vendor_kwarg='vendor_id')
+    @cache_catalog_response(vendor_kwarg='vendor_id')
     def by_vendor(self, request, vendor_id=None):
         """Obtener productos de un vendedor específico."""
         try:
             vendor = Vendor.objects.get(pk=vendor_id, is_active=True)
-        except Vendor.DoesNotExist:
+        except (Vendor.DoesNotExist, ValueError):
             return Response(
                 {'detail': 'Vendedor no encontrado.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        products = Product.objects.filter(vendor=vendor, is_active=True)
-        page = self.paginate_queryset(products)
-
-        if page is not None:
-            serializer = ProductListSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = ProductListSerializer(products, many=True)
-        return Response(serializer.data)
+        products = self.filter_queryset(
+            Product.objects.filter(vendor=vendor, is_active=True)
+        )
+        return self.list_response(products)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import RevokedToken, User
 
 
 @admin.register(User)
@@ -19,3 +19,18 @@ class UserAdmin(BaseUserAdmin):
     add_fieldsets = BaseUserAdmin.add_fieldsets + (
         ('Información adicional', {'fields': ('email', 'first_name', 'last_name', 'phone')}),
     )
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    """Solo lectura: las revocaciones se agregan al renovar tokens."""
+
+    list_display = ['jti', 'revoked_at', 'expires_at']
+    search_fields = ['jti']
+    date_hierarchy = 'revoked_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,122 @@
+"""
+Autenticación JWT sin consultar la tabla de usuarios en cada petición.
+
+El access token lleva el id del usuario y los claims ``is_vendor``,
+``vendor_id`` y ``business_name`` (ver ``CustomTokenObtainPairSerializer``).
+Con ellos se arma un usuario perezoso: las vistas que solo necesitan saber
+quién es el usuario o su tienda no tocan la base de datos, y la fila
+completa se carga (una vez por petición) solo si se pide otro atributo.
+
+Que el usuario siga existiendo y activo se verifica contra un estado
+cacheado por poco tiempo (``AUTH_USER_CACHE_TIMEOUT``) que se borra al
+guardar o eliminar el usuario, así que una desactivación se respeta de
+inmediato con caché compartida y en segundos en el peor caso.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import LazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.core.authentication import TimedJWTAuthentication
+
+User = get_user_model()
+
+USER_STATE_KEY = 'auth:user:{}'
+USER_ACTIVE = 'active'
+USER_INACTIVE = 'inactive'
+USER_MISSING = 'missing'
+
+
+def get_user_state(user_id):
+    """Estado del usuario (activo, inactivo o inexistente), cacheado poco tiempo."""
+    key = USER_STATE_KEY.format(user_id)
+    state = cache.get(key)
+    if state is None:
+        is_active = (
+            User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list('is_active', flat=True).first()
+        )
+        if is_active is None:
+            state = USER_MISSING
+        else:
+            state = USER_ACTIVE if is_active else USER_INACTIVE
+        cache.set(key, state, settings.AUTH_USER_CACHE_TIMEOUT)
+    return state
+
+
+def forget_user_state(user_id):
+    cache.delete(USER_STATE_KEY.format(user_id))
+
+
+class LazyTokenUser(LazyObject):
+    """
+    Usuario respaldado por los claims del token.
+
+    ``pk``/``id``, ``is_authenticated`` e ``is_active`` salen del token, y
+    ``vendor_id`` también cuando el token dice que es vendedor. Cualquier
+    otro atributo (o un ``vendor_id`` desconocido, p. ej. un usuario que
+    creó su tienda después de iniciar sesión) carga el ``User`` real junto
+    con su perfil de vendedor en una sola consulta.
+    """
+
+    def __init__(self, token):
+        super().__init__()
+        # simplejwt guarda el id como texto
+        user_id = User._meta.get_field(api_settings.USER_ID_FIELD).to_python(
+            token[api_settings.USER_ID_CLAIM]
+        )
+        # Directo en __dict__: LazyObject redirige __setattr__ al objeto real
+        self.__dict__.update(
+            pk=user_id, id=user_id,
+            is_authenticated=True, is_anonymous=False, is_active=True,
+        )
+        if token.get('is_vendor') and token.get('vendor_id'):
+            self.__dict__['vendor_id'] = token['vendor_id']
+
+    def _setup(self):
+        try:
+            self._wrapped = User.objects.select_related('vendor_profile').get(
+                **{api_settings.USER_ID_FIELD: self.pk}
+            )
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+    @property
+    def is_loaded(self):
+        return self._wrapped is not empty
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, LazyTokenUser):
+            return self.pk == other.pk
+        # Comparar con un User sin cargar la fila
+        if type(other) is User:
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class StatelessJWTAuthentication(TimedJWTAuthentication):
+    """JWTAuthentication que devuelve un ``LazyTokenUser`` en lugar de leer el usuario."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from exc
+
+        state = get_user_state(user_id)
+        if state == USER_MISSING:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if state == USER_INACTIVE and api_settings.CHECK_USER_IS_ACTIVE:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return LazyTokenUser(validated_token)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.revocation import store
+
+
+class Command(BaseCommand):
+    help = (
+        'Borra las revocaciones de refresh tokens ya vencidos. Útil desde cron '
+        'si TOKEN_REVOCATION_COMPACT_INTERVAL=0 desactiva la compactación en segundo plano.'
+    )
+
+    def handle(self, *args, **options):
+        deleted = store.compact()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} revocaciones vencidas eliminadas.'))
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(max_length=255, unique=True, verbose_name='JTI')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Expira')),
+                ('revoked_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Revocado')),
+            ],
+            options={
+                'verbose_name': 'Token revocado',
+                'verbose_name_plural': 'Tokens revocados',
+            },
+        ),
+    ]
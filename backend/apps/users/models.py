@@ -20,3 +20,29 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.email
+
+    @property
+    def vendor_id(self):
+        """id del perfil de vendedor, o None si el usuario no es vendedor."""
+        vendor = getattr(self, 'vendor_profile', None)
+        return vendor.pk if vendor is not None else None
+
+
+class RevokedToken(models.Model):
+    """
+    Refresh token revocado (tabla de solo inserción).
+
+    Se identifica por su ``jti``; la restricción única hace que revocar el
+    mismo token dos veces falle aunque ocurra en procesos distintos. Las
+    filas vencidas ya no sirven (el token expiró) y se compactan.
+    """
+    jti = models.CharField('JTI', max_length=255, unique=True)
+    expires_at = models.DateTimeField('Expira', db_index=True)
+    revoked_at = models.DateTimeField('Revocado', auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = 'Token revocado'
+        verbose_name_plural = 'Tokens revocados'
+
+    def __str__(self):
+        return self.jti
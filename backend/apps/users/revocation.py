@@ -0,0 +1,157 @@
+"""
+Revocación de refresh tokens rotados.
+
+Con ``ROTATE_REFRESH_TOKENS`` y ``BLACKLIST_AFTER_ROTATION`` cada renovación
+revoca el refresh token usado. En lugar de ``token_blacklist`` de simplejwt
+(que escribe el token emitido y consulta la lista negra en cada petición),
+la revocación es una inserción en ``RevokedToken`` y la verificación se hace
+contra un conjunto en memoria del proceso:
+
+- ``is_revoked`` es una búsqueda en un ``dict``. Cada
+  ``TOKEN_REVOCATION_SYNC_INTERVAL`` segundos se leen las filas nuevas de
+  otros procesos, y las vencidas salen de memoria en orden de expiración.
+- ``revoke`` inserta el ``jti`` (``INSERT ... ON CONFLICT DO NOTHING``); la
+  restricción única hace que dos usos del mismo token fallen aunque el
+  conjunto en memoria aún no se haya sincronizado, así que el intervalo no
+  abre una ventana de reutilización.
+- Las filas vencidas se borran en un hilo de fondo cada
+  ``TOKEN_REVOCATION_COMPACT_INTERVAL`` segundos (0 lo desactiva; queda el
+  comando ``purge_revoked_tokens`` para ejecutarlo desde cron).
+"""
+
+import heapq
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import RevokedToken
+
+# Margen al releer filas: una transacción lenta puede confirmar una fila con
+# ``revoked_at`` anterior a la última sincronización
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class RevocationStore:
+    """``jti`` revocados y aún vigentes, sincronizados con ``RevokedToken``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._expires = {}
+        # (exp, jti) ordenado por expiración para desalojar los vencidos
+        self._heap = []
+        self._synced_at = None
+        self._since = None
+        self._compacted_at = time.monotonic()
+        self._compacting = False
+
+    def is_revoked(self, jti):
+        self._maybe_sync()
+        return jti in self._expires
+
+    def revoke(self, jti, exp):
+        """
+        Revocar el token ``jti`` que vence en ``exp`` (epoch).
+
+        Lanza ``TokenError`` si ya estaba revocado, también cuando lo revocó
+        otro proceso en paralelo.
+        """
+        # Una sola sentencia, sin savepoint: si el jti ya existe no inserta nada
+        ops = connection.ops
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {ops.quote_name(RevokedToken._meta.db_table)} '
+                '(jti, expires_at, revoked_at) VALUES (%s, %s, %s) ON CONFLICT (jti) DO NOTHING',
+                [
+                    jti,
+                    ops.adapt_datetimefield_value(datetime_from_epoch(exp)),
+                    ops.adapt_datetimefield_value(timezone.now()),
+                ],
+            )
+            inserted = cursor.rowcount == 1
+        self._remember(jti, exp)
+        if not inserted:
+            raise TokenError(_('Token is blacklisted'))
+
+    def compact(self):
+        """Borrar las filas de tokens ya vencidos. Devuelve cuántas se borraron."""
+        deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+    def clear(self):
+        """Olvidar el estado en memoria (la próxima consulta relee la tabla)."""
+        with self._lock:
+            self._expires.clear()
+            self._heap.clear()
+            self._synced_at = None
+            self._since = None
+
+    def _remember(self, jti, exp):
+        with self._lock:
+            if jti not in self._expires:
+                self._expires[jti] = exp
+                heapq.heappush(self._heap, (exp, jti))
+
+    def _maybe_sync(self):
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < settings.TOKEN_REVOCATION_SYNC_INTERVAL:
+            return
+        started = timezone.now()
+        rows = RevokedToken.objects.filter(expires_at__gt=started)
+        if self._since is not None:
+            rows = rows.filter(revoked_at__gte=self._since)
+        rows = list(rows.values_list('jti', 'expires_at'))
+
+        epoch = started.timestamp()
+        with self._lock:
+            for jti, expires_at in rows:
+                if jti not in self._expires:
+                    exp = int(expires_at.timestamp())
+                    self._expires[jti] = exp
+                    heapq.heappush(self._heap, (exp, jti))
+            while self._heap and self._heap[0][0] <= epoch:
+                _, jti = heapq.heappop(self._heap)
+                self._expires.pop(jti, None)
+            self._synced_at = now
+            self._since = started - SYNC_OVERLAP
+        self._maybe_compact(now)
+
+    def _maybe_compact(self, now):
+        interval = settings.TOKEN_REVOCATION_COMPACT_INTERVAL
+        if not interval or self._compacting or now - self._compacted_at < interval:
+            return
+        self._compacting = True
+        self._compacted_at = now
+        threading.Thread(target=self._compact_in_background, daemon=True).start()
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        finally:
+            self._compacting = False
+            # La conexión es del hilo: cerrarla para no dejarla abierta
+            connection.close()
+
+
+store = RevocationStore()
+
+
+class RevocableRefreshToken(RefreshToken):
+    """``RefreshToken`` que consulta y alimenta ``RevocationStore``."""
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if store.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        # Lo llama TokenRefreshSerializer con BLACKLIST_AFTER_ROTATION
+        store.revoke(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import forget_user_state
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_state(sender, instance, **kwargs):
+    """Una desactivación o eliminación debe rechazar los tokens ya emitidos."""
+    forget_user_state(instance.pk)
+    transaction.on_commit(lambda: forget_user_state(instance.pk))
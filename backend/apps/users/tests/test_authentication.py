@@ -0,0 +1,106 @@
+"""
+Autenticación JWT sin estado: claims del token, usuario perezoso y
+respeto de la desactivación.
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.products.models import Category, Product
+from apps.users.authentication import get_user_state
+from apps.users.views import CustomTokenObtainPairSerializer
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class StatelessJWTAuthenticationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor_user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='Colombia2024!',
+            first_name='María', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(user=cls.vendor_user, business_name='Café del Eje')
+        cls.buyer = User.objects.create_user(
+            email='ana@example.com', username='ana', password='Colombia2024!',
+            first_name='Ana', last_name='G'
+        )
+        Product.objects.create(
+            vendor=cls.vendor, name='Café', description='Café de origen',
+            price=Decimal('45000'), category=Category.objects.create(name='Alimentos', slug='alimentos')
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def authenticate(self, user):
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return token
+
+    def test_login_token_claims(self):
+        response = self.client.post('/api/users/token/', {
+            'email': 'maria@example.com', 'password': 'Colombia2024!'
+        })
+        self.assertEqual(response.status_code, 200)
+        access = CustomTokenObtainPairSerializer.token_class(response.data['refresh']).access_token
+        self.assertIs(access['is_vendor'], True)
+        self.assertEqual(access['vendor_id'], self.vendor.pk)
+        self.assertEqual(access['business_name'], 'Café del Eje')
+
+    def test_authenticated_reads_do_not_load_the_user(self):
+        self.authenticate(self.vendor_user)
+        get_user_state(self.vendor_user.pk)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/products/my_products/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        auth_queries = [q['sql'] for q in ctx.captured_queries if 'users_user' in q['sql']]
+        self.assertEqual(auth_queries, [])
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate(self.vendor_user)
+        self.assertEqual(self.client.get('/api/products/my_products/').status_code, 200)
+
+        self.vendor_user.is_active = False
+        self.vendor_user.save()
+        self.assertEqual(self.client.get('/api/products/my_products/').status_code, 401)
+
+    def test_user_who_became_vendor_after_login(self):
+        # El token se emitió sin vendor_id: se consulta la base
+        self.authenticate(self.buyer)
+        response = self.client.post('/api/vendors/', {'business_name': 'Tienda de Ana'})
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.post('/api/products/', {
+            'name': 'Panela', 'description': 'Panela orgánica', 'price': '8000.00',
+        })
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_profile_loads_full_user(self):
+        self.authenticate(self.vendor_user)
+        response = self.client.get('/api/users/profile/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], 'maria@example.com')
+        self.assertEqual(response.data['vendor_id'], self.vendor.pk)
+
+    def test_owner_permissions_compare_ids(self):
+        product = Product.objects.get()
+        self.authenticate(self.buyer)
+        response = self.client.patch(f'/api/products/{product.pk}/', {'stock': 1})
+        self.assertEqual(response.status_code, 403)
+
+        self.authenticate(self.vendor_user)
+        response = self.client.patch(f'/api/products/{product.pk}/', {'stock': 1})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,92 @@
+"""
+Revocación de refresh tokens al rotar: un token usado no vuelve a servir,
+la verificación no consulta la base y las revocaciones vencidas se compactan.
+"""
+
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.users.models import RevokedToken
+from apps.users.revocation import store
+from apps.users.views import CustomTokenObtainPairSerializer
+
+User = get_user_model()
+
+REFRESH_URL = '/api/users/token/refresh/'
+
+
+@override_settings(TOKEN_REVOCATION_SYNC_INTERVAL=60, TOKEN_REVOCATION_COMPACT_INTERVAL=0)
+class RefreshTokenRevocationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='Colombia2024!',
+            first_name='María', last_name='R'
+        )
+
+    def setUp(self):
+        store.clear()
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post(REFRESH_URL, {'refresh': str(token)}, format='json')
+
+    def test_rotated_token_cannot_be_reused(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.user)
+        first = self.refresh(token)
+        self.assertEqual(first.status_code, 200)
+        self.assertNotEqual(first.data['refresh'], str(token))
+        self.assertTrue(RevokedToken.objects.filter(jti=token['jti']).exists())
+
+        self.assertEqual(self.refresh(token).status_code, 401)
+        # El token nuevo sí sirve, una vez
+        self.assertEqual(self.refresh(first.data['refresh']).status_code, 200)
+
+    def test_revoked_check_is_in_memory(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.assertEqual(self.refresh(token).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertTrue(store.is_revoked(token['jti']))
+            self.assertFalse(store.is_revoked(str(uuid4())))
+
+    def test_revocation_by_another_process_is_enforced_before_sync(self):
+        token = CustomTokenObtainPairSerializer.get_token(self.user)
+        store.is_revoked(token['jti'])
+        # Otro proceso revocó el token; este aún no sincroniza
+        RevokedToken.objects.create(
+            jti=token['jti'], expires_at=timezone.now() + timedelta(days=1)
+        )
+        self.assertFalse(store.is_revoked(token['jti']))
+
+        self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertTrue(store.is_revoked(token['jti']))
+
+    def test_sync_loads_revocations_from_other_processes(self):
+        jti = str(uuid4())
+        RevokedToken.objects.create(jti=jti, expires_at=timezone.now() + timedelta(days=1))
+        self.assertTrue(store.is_revoked(jti))
+
+    def test_expired_revocations_are_compacted(self):
+        now = timezone.now()
+        expired = RevokedToken.objects.create(jti='vencido', expires_at=now - timedelta(minutes=1))
+        current = RevokedToken.objects.create(jti='vigente', expires_at=now + timedelta(days=1))
+
+        self.assertFalse(store.is_revoked(expired.jti))
+        call_command('purge_revoked_tokens', stdout=open('/dev/null', 'w'))
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), [current.jti])
+
+    def test_expired_entries_leave_memory(self):
+        jti = str(uuid4())
+        store.revoke(jti, int(time.time()) + 1)
+        self.assertTrue(store.is_revoked(jti))
+        with override_settings(TOKEN_REVOCATION_SYNC_INTERVAL=0):
+            time.sleep(1.1)
+            self.assertFalse(store.is_revoked(jti))
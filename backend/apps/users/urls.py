@@ -1,8 +1,8 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
     CustomTokenObtainPairView,
+    CustomTokenRefreshView,
     RegisterView,
     UserProfileView,
 )
@@ -10,7 +10,7 @@ from .views import (
 urlpatterns = [
     # Autenticación JWT
     path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
 
     # Registro y perfil
     path('register/', RegisterView.as_view(), name='register'),
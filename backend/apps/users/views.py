@@ -1,11 +1,12 @@
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from django.contrib.auth import get_user_model
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
+from .revocation import RevocableRefreshToken
 from .serializers import UserSerializer, UserRegistrationSerializer
 
 User = get_user_model()
@@ -14,22 +15,34 @@ User = get_user_model()
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Serializer personalizado para incluir datos del usuario en el token."""
 
+    @classmethod
+    def get_token(cls, user):
+        # Claims que usa StatelessJWTAuthentication para no leer el usuario
+        token = super().get_token(user)
+        vendor = getattr(user, 'vendor_profile', None)
+        token['is_vendor'] = vendor is not None
+        if vendor is not None:
+            token['vendor_id'] = vendor.id
+            token['business_name'] = vendor.business_name
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
 
         # Agregar información del usuario
+        vendor = getattr(self.user, 'vendor_profile', None)
         data['user'] = {
             'id': self.user.id,
             'email': self.user.email,
             'username': self.user.username,
             'first_name': self.user.first_name,
             'last_name': self.user.last_name,
-            'is_vendor': hasattr(self.user, 'vendor_profile'),
+            'is_vendor': vendor is not None,
         }
 
-        if hasattr(self.user, 'vendor_profile'):
-            data['user']['vendor_id'] = self.user.vendor_profile.id
-            data['user']['business_name'] = self.user.vendor_profile.business_name
+        if vendor is not None:
+            data['user']['vendor_id'] = vendor.id
+            data['user']['business_name'] = vendor.business_name
 
         return data
 
@@ -51,6 +64,32 @@ class CustomTokenObtainPairView(TokenObtainPairView):
         return super().post(request, *args, **kwargs)
 
 
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """Renovación que revoca el refresh token usado (ver ``apps.users.revocation``)."""
+
+    token_class = RevocableRefreshToken
+
+
+class CustomTokenRefreshView(TokenRefreshView):
+    """Vista de renovación: cada refresh token sirve una sola vez."""
+
+    serializer_class = RevocableTokenRefreshSerializer
+
+    @extend_schema(
+        summary="Renovar token",
+        description=(
+            "Obtener un nuevo access token y un nuevo refresh token. "
+            "El refresh token enviado queda revocado."
+        ),
+        responses={
+            200: OpenApiResponse(description="Tokens renovados"),
+            401: OpenApiResponse(description="Refresh token inválido, vencido o ya usado"),
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
+
+
 class RegisterView(generics.CreateAPIView):
     """Vista para registro de nuevos usuarios."""
 
@@ -92,10 +131,11 @@ class UserProfileView(APIView):
         data = serializer.data
 
         # Agregar información del vendor si existe
-        if hasattr(request.user, 'vendor_profile'):
+        vendor = getattr(request.user, 'vendor_profile', None)
+        if vendor is not None:
             data['is_vendor'] = True
-            data['vendor_id'] = request.user.vendor_profile.id
-            data['business_name'] = request.user.vendor_profile.business_name
+            data['vendor_id'] = vendor.id
+            data['business_name'] = vendor.business_name
         else:
             data['is_vendor'] = False
 
@@ -6,7 +6,7 @@ from .models import Vendor
 class VendorAdmin(admin.ModelAdmin):
     """Admin para el modelo Vendor."""
 
-    list_display = ['business_name', 'user', 'city', 'is_verified', 'is_active', 'created_at']
+    list_display = ['business_name', 'user', 'city', 'active_products_count', 'is_verified', 'is_active', 'created_at']
     list_filter = ['is_verified', 'is_active', 'city', 'created_at']
     search_fields = ['business_name', 'user__email', 'user__username', 'city']
     ordering = ['-created_at']
@@ -5,3 +5,6 @@ class VendorsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.vendors'
     verbose_name = 'Vendedores'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.products.models import Product
+from apps.vendors.models import Vendor
+
+
+class Command(BaseCommand):
+    help = 'Recalcula Vendor.active_products_count y corrige los contadores desfasados.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo reportar diferencias, sin corregirlas.'
+        )
+
+    def handle(self, *args, **options):
+        active_counts = (
+            Product.objects
+            .filter(vendor=OuterRef('pk'), is_active=True)
+            .values('vendor')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        actual = Coalesce(Subquery(active_counts), Value(0))
+
+        with transaction.atomic():
+            drifted = list(
+                Vendor.objects
+                .select_for_update()
+                .annotate(actual=actual)
+                .filter(~Q(active_products_count=F('actual')))
+                .values_list('pk', 'business_name', 'active_products_count', 'actual')
+            )
+            for pk, name, stored, real in drifted:
+                self.stdout.write(f'  {name} (id={pk}): {stored} -> {real}')
+
+            if drifted and not options['dry_run']:
+                Vendor.objects.filter(pk__in=[row[0] for row in drifted]).update(
+                    active_products_count=actual
+                )
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('Todos los contadores están al día.'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} vendedores con diferencias (dry-run).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(drifted)} vendedores corregidos.'))
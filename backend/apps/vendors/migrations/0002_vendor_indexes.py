@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 08:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at', 'id'], name='vendor_active_created_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-18 09:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_active_products_count(apps, schema_editor):
+    Vendor = apps.get_model('vendors', 'Vendor')
+    Product = apps.get_model('products', 'Product')
+    using = schema_editor.connection.alias
+
+    active_counts = (
+        Product.objects.using(using)
+        .filter(vendor=OuterRef('pk'), is_active=True)
+        .values('vendor')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Vendor.objects.using(using).update(
+        active_products_count=Coalesce(Subquery(active_counts), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0002_vendor_indexes'),
+        ('products', '0004_product_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='active_products_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Productos activos'),
+        ),
+        migrations.RunPython(backfill_active_products_count, migrations.RunPython.noop),
+    ]
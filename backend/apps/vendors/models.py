@@ -20,6 +20,10 @@ class Vendor(models.Model):
     phone = models.CharField('Teléfono del negocio', max_length=15, blank=True)
     is_verified = models.BooleanField('Verificado', default=False)
     is_active = models.BooleanField('Activo', default=True)
+    # Contador mantenido por las señales de Product (ver reconcile_products_count)
+    active_products_count = models.PositiveIntegerField(
+        'Productos activos', default=0, editable=False
+    )
     created_at = models.DateTimeField('Fecha de creación', auto_now_add=True)
     updated_at = models.DateTimeField('Fecha de actualización', auto_now=True)
 
@@ -27,6 +31,12 @@ class Vendor(models.Model):
         verbose_name = 'Vendedor'
         verbose_name_plural = 'Vendedores'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'], name='vendor_active_created_idx',
+                condition=models.Q(is_active=True)
+            ),
+        ]
 
     def __str__(self):
         return self.business_name
@@ -12,7 +12,7 @@ class IsVendorOwner(permissions.BasePermission):
             return True
 
         # Escritura solo para el dueño
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
 
 
 class IsVendor(permissions.BasePermission):
@@ -23,4 +23,4 @@ class IsVendor(permissions.BasePermission):
     def has_permission(self, request, view):
         if not request.user.is_authenticated:
             return False
-        return hasattr(request.user, 'vendor_profile')
+        return request.user.vendor_id is not None
@@ -1,13 +1,14 @@
 from rest_framework import serializers
 from .models import Vendor
+from apps.core.serializers import TimedListSerializer, TimedSerializerMixin
 from apps.users.serializers import UserSerializer
 
 
-class VendorSerializer(serializers.ModelSerializer):
+class VendorSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer para mostrar información del vendedor."""
 
     user = UserSerializer(read_only=True)
-    products_count = serializers.SerializerMethodField()
+    products_count = serializers.IntegerField(source='active_products_count', read_only=True)
 
     class Meta:
         model = Vendor
@@ -17,12 +18,10 @@ class VendorSerializer(serializers.ModelSerializer):
             'products_count', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'is_verified', 'created_at', 'updated_at']
+        list_serializer_class = TimedListSerializer
 
-    def get_products_count(self, obj):
-        return obj.products.filter(is_active=True).count()
 
-
-class VendorCreateSerializer(serializers.ModelSerializer):
+class VendorCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer para crear/actualizar vendedor."""
 
     class Meta:
@@ -35,7 +34,7 @@ class VendorCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context['request'].user
         # Verificar si el usuario ya tiene un perfil de vendedor
-        if hasattr(user, 'vendor_profile'):
+        if user.vendor_id is not None:
             raise serializers.ValidationError({
                 'user': 'Este usuario ya tiene un perfil de vendedor.'
             })
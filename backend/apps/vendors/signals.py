@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Vendor
+from apps.core.cache import bump_catalog_version
+
+
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+def invalidate_catalog_cache(sender, instance, **kwargs):
+    bump_catalog_version(instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_vendor_user_cache(sender, instance, created, update_fields=None, **kwargs):
+    """Los datos del usuario se anidan en VendorSerializer."""
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    vendor_id = Vendor.objects.filter(user_id=instance.pk).values_list('pk', flat=True).first()
+    if vendor_id is not None:
+        bump_catalog_version(vendor_id)
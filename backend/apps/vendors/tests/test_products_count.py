@@ -0,0 +1,105 @@
+"""
+Contador de productos activos del vendedor: se mantiene al crear, desactivar,
+reactivar y borrar productos, y ``reconcile_products_count`` corrige los
+desfases.
+"""
+
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.products.models import Product
+from apps.vendors.models import Vendor
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ProductsCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='maria@example.com', username='maria', password='x',
+            first_name='María', last_name='R'
+        )
+        cls.vendor = Vendor.objects.create(user=user, business_name='Café del Eje')
+
+    def setUp(self):
+        cache.clear()
+
+    def product(self, name='Café de Huila', **extra):
+        return Product.objects.create(
+            vendor=self.vendor, name=name, description='Tostión media',
+            price=Decimal('45000'), **extra
+        )
+
+    def count(self):
+        self.vendor.refresh_from_db()
+        return self.vendor.active_products_count
+
+    def test_counter_follows_product_lifecycle(self):
+        product = self.product()
+        self.product('Panela', is_active=False)
+        self.assertEqual(self.count(), 1)
+
+        product.is_active = False
+        product.save()
+        self.assertEqual(self.count(), 0)
+        # Guardar sin cambiar el estado no vuelve a descontar
+        product.save()
+        self.assertEqual(self.count(), 0)
+
+        product = Product.objects.get(pk=product.pk)
+        product.is_active = True
+        product.save()
+        self.assertEqual(self.count(), 1)
+
+        product.delete()
+        Product.objects.get(name='Panela').delete()
+        self.assertEqual(self.count(), 0)
+
+    def test_counter_never_goes_negative(self):
+        product = self.product()
+        Vendor.objects.filter(pk=self.vendor.pk).update(active_products_count=0)
+        product.delete()
+        self.assertEqual(self.count(), 0)
+
+    def test_listing_reads_counter_without_counting(self):
+        for i in range(3):
+            other = User.objects.create_user(
+                email=f'v{i}@example.com', username=f'v{i}', password='x',
+                first_name='V', last_name=str(i)
+            )
+            Vendor.objects.create(user=other, business_name=f'Tienda {i}')
+        self.product()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get('/api/vendors/')
+        counts = {v['business_name']: v['products_count'] for v in response.data['results']}
+        self.assertEqual(counts['Café del Eje'], 1)
+        self.assertNotIn('products_product', '\n'.join(q['sql'] for q in queries))
+
+    def test_reconcile_command(self):
+        self.product()
+        self.product('Panela')
+        Vendor.objects.filter(pk=self.vendor.pk).update(active_products_count=7)
+
+        out = StringIO()
+        call_command('reconcile_products_count', dry_run=True, stdout=out)
+        self.assertIn(f'Café del Eje (id={self.vendor.pk}): 7 -> 2', out.getvalue())
+        self.assertEqual(self.count(), 7)
+
+        call_command('reconcile_products_count', stdout=out)
+        self.assertEqual(self.count(), 2)
+
+        out = StringIO()
+        call_command('reconcile_products_count', stdout=out)
+        self.assertIn('al día', out.getvalue())
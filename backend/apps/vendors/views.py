@@ -6,9 +6,13 @@ from drf_spectacular.utils import extend_schema, OpenApiResponse
 from .models import Vendor
 from .serializers import VendorSerializer, VendorCreateSerializer
 from .permissions import IsVendorOwner
+from apps.core.cache import cache_catalog_response
+from apps.core.fieldsets import SparseFieldsetMixin, fieldset_parameters
+from apps.core.conditional import conditional_catalog_response
+from apps.core.replicas import ReplicaReadMixin
 
 
-class VendorViewSet(viewsets.ModelViewSet):
+class VendorViewSet(ReplicaReadMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar vendedores.
 
@@ -17,10 +21,14 @@ class VendorViewSet(viewsets.ModelViewSet):
     create: Crear perfil de vendedor (usuario autenticado).
     update/partial_update: Actualizar perfil (solo dueño).
     destroy: Desactivar perfil (solo dueño).
+
+    Las lecturas aceptan ``?fields=`` y ``?omit=`` (ver ``apps.core.fieldsets``)
+    y se sirven desde una réplica si hay (ver ``apps.core.replicas``).
     """
 
-    queryset = Vendor.objects.filter(is_active=True)
+    queryset = Vendor.objects.filter(is_active=True).select_related('user')
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsVendorOwner]
+    sparse_fieldset_actions = ('list', 'retrieve', 'me')
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
@@ -30,14 +38,20 @@ class VendorViewSet(viewsets.ModelViewSet):
     @extend_schema(
         summary="Listar vendedores",
         description="Obtener lista de todos los vendedores activos.",
+        parameters=fieldset_parameters(VendorSerializer),
     )
+    @conditional_catalog_response()
+    @cache_catalog_response()
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
     @extend_schema(
         summary="Detalle de vendedor",
         description="Obtener información detallada de un vendedor.",
+        parameters=fieldset_parameters(VendorSerializer),
     )
+    @conditional_catalog_response(vendor_kwarg='pk')
+    @cache_catalog_response(vendor_kwarg='pk')
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -81,16 +95,20 @@ class VendorViewSet(viewsets.ModelViewSet):
     @extend_schema(
         summary="Mi perfil de vendedor",
         description="Obtener el perfil de vendedor del usuario autenticado.",
+        parameters=fieldset_parameters(VendorSerializer),
         responses={200: VendorSerializer}
     )
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def me(self, request):
         """Obtener el perfil de vendedor del usuario autenticado."""
-        if not hasattr(request.user, 'vendor_profile'):
+        if request.user.vendor_id is None:
             return Response(
                 {'detail': 'No tienes un perfil de vendedor.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = VendorSerializer(request.user.vendor_profile)
+        vendor = self.apply_sparse_fieldset(
+            Vendor.objects.select_related('user')
+        ).get(pk=request.user.vendor_id)
+        serializer = self.get_serializer(vendor)
         return Response(serializer.data)
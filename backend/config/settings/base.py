@@ -4,8 +4,11 @@ Django base settings for Full Colombiano API.
 
 from pathlib import Path
 from datetime import timedelta
+from decimal import Decimal
 from decouple import config, Csv
 
+from .sqlite import DB_SERIALIZE_WRITES, SQLITE_OPTIONS, SQLITE_PRAGMAS  # noqa: F401
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -36,6 +39,7 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    'apps.core',
     'apps.users',
     'apps.vendors',
     'apps.products',
@@ -44,6 +48,10 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    # Primero: mide el tiempo total incluyendo el resto de middleware
+    'apps.core.middleware.ServerTimingMiddleware',
+    # Estado de enrutamiento a réplicas por petición (ver apps.core.replicas)
+    'apps.core.replicas.DatabaseRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -74,14 +82,74 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
-# Database - SQLite por defecto
+# Database - SQLite por defecto, ajustada para varios workers (ver sqlite.py)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': config('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+        'OPTIONS': SQLITE_OPTIONS,
+    }
+}
+
+# Réplicas de lectura para el catálogo: copias de la base principal que
+# actualiza `manage.py sync_replicas` (ver apps.core.replicas)
+DATABASES.update({
+    f'replica{index}': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'OPTIONS': SQLITE_OPTIONS,
+        # En pruebas, la réplica es la misma base de pruebas
+        'TEST': {'MIRROR': 'default'},
+    }
+    for index, path in enumerate(config('SQLITE_REPLICA_PATHS', default='', cast=Csv()), start=1)
+})
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['apps.core.replicas.PrimaryReplicaRouter']
+# Segundos que un usuario lee de la principal después de escribir; debe
+# cubrir el intervalo de sincronización de las réplicas
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=15, cast=int)
+
+# Cache - memoria local por defecto; con varios workers usar un backend
+# compartido (FileBasedCache, Redis, Memcached) para que la invalidación
+# por versión del catálogo llegue a todos los procesos.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='full-colombiano'),
     }
 }
 
+# Segundos que vive una respuesta cacheada del catálogo (se invalida por versión)
+CATALOG_CACHE_TIMEOUT = config('CATALOG_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Carga masiva de productos (POST /api/products/bulk/)
+PRODUCT_BULK_MAX_ITEMS = config('PRODUCT_BULK_MAX_ITEMS', default=5000, cast=int)
+PRODUCT_BULK_CHUNK_SIZE = config('PRODUCT_BULK_CHUNK_SIZE', default=500, cast=int)
+
+# Límites (en pesos) de las franjas del histograma de precios de /api/products/facets/
+PRODUCT_PRICE_HISTOGRAM_EDGES = config(
+    'PRODUCT_PRICE_HISTOGRAM_EDGES', default='10000,20000,50000,100000,200000,500000,1000000',
+    cast=Csv(cast=Decimal)
+)
+
+# Operaciones de stock (/api/products/stock/...): productos por operación,
+# duración por defecto y máxima de una reserva (segundos) y días que se
+# conservan las reservas ya cerradas antes de purgarlas
+STOCK_MAX_ITEMS = config('STOCK_MAX_ITEMS', default=100, cast=int)
+STOCK_RESERVATION_TTL = config('STOCK_RESERVATION_TTL', default=900, cast=int)
+STOCK_RESERVATION_MAX_TTL = config('STOCK_RESERVATION_MAX_TTL', default=3600, cast=int)
+STOCK_RESERVATION_RETENTION_DAYS = config('STOCK_RESERVATION_RETENTION_DAYS', default=30, cast=int)
+
+# Archivo de productos (manage.py archive_products): días que un producto
+# desactivado (o de un vendedor desactivado) sigue en la tabla principal y
+# productos por transacción
+PRODUCT_ARCHIVE_AFTER_DAYS = config('PRODUCT_ARCHIVE_AFTER_DAYS', default=90, cast=int)
+PRODUCT_ARCHIVE_CHUNK_SIZE = config('PRODUCT_ARCHIVE_CHUNK_SIZE', default=500, cast=int)
+
+# Token de /api/metrics/ (vacío = sin autenticación con DEBUG, 404 sin DEBUG)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -121,21 +189,34 @@ AUTH_USER_MODEL = 'users.User'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ),
+    # JSON con orjson (misma salida que JSONRenderer/JSONParser de DRF)
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.CatalogPagination',
     'PAGE_SIZE': 10,
 }
 
+# Segundos que se cachea si el usuario de un token sigue activo
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=60, cast=int)
+
 # Simple JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('ACCESS_TOKEN_LIFETIME_MINUTES', default=60, cast=int)),
@@ -146,6 +227,11 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
 }
 
+# Revocación de refresh tokens rotados (apps.users.revocation): cada cuántos
+# segundos se leen las revocaciones de otros procesos y se borran las vencidas
+TOKEN_REVOCATION_SYNC_INTERVAL = config('TOKEN_REVOCATION_SYNC_INTERVAL', default=5, cast=int)
+TOKEN_REVOCATION_COMPACT_INTERVAL = config('TOKEN_REVOCATION_COMPACT_INTERVAL', default=3600, cast=int)
+
 # DRF Spectacular (Swagger/OpenAPI)
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Full Colombiano API',
@@ -154,6 +240,8 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
     'COMPONENT_SPLIT_REQUEST': True,
     'SCHEMA_PATH_PREFIX': '/api/',
+    # Con ?fields=/?omit= cualquier campo de lectura puede faltar en la respuesta
+    'COMPONENT_NO_READ_ONLY_REQUIRED': True,
 }
 
 # CORS Configuration
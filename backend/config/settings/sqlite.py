@@ -0,0 +1,43 @@
+"""
+Configuración de SQLite para varios workers.
+
+- WAL: las lecturas no esperan a las escrituras (ni al revés); solo las
+  escrituras se turnan entre sí.
+- ``synchronous=NORMAL``: con WAL, un commit no espera al fsync (solo los
+  checkpoints); ante un corte de luz se pueden perder los últimos commits,
+  nunca corromper la base.
+- ``mmap_size`` y ``cache_size``: páginas leídas por mmap y caché de páginas
+  por conexión más grande que la de 2 MiB por defecto.
+- ``busy_timeout``: un escritor espera el bloqueo en lugar de fallar de
+  inmediato con "database is locked".
+- ``transaction_mode=IMMEDIATE``: ``transaction.atomic()`` toma el bloqueo
+  de escritura al empezar, así que una transacción no puede fallar a mitad
+  de camino al pasar de lectura a escritura.
+
+Los PRAGMA se aplican a cada conexión nueva en ``apps.core.sqlite``;
+``base.py`` usa ``SQLITE_OPTIONS`` en ``DATABASES``.
+"""
+
+from decouple import config
+
+SQLITE_PRAGMAS = {
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    # Bytes (256 MiB)
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=268435456, cast=int),
+    # Negativo = KiB (64 MiB)
+    'cache_size': config('SQLITE_CACHE_SIZE', default=-65536, cast=int),
+    # Milisegundos
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),
+}
+
+SQLITE_OPTIONS = {
+    'transaction_mode': config('SQLITE_TRANSACTION_MODE', default='IMMEDIATE'),
+    # Segundos; el mismo límite que busy_timeout
+    'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+}
+
+# Serializar en cada proceso las escrituras pesadas (cargas masivas, stock):
+# los hilos esperan su turno en una cola en lugar de reintentar contra el
+# bloqueo de SQLite (ver apps.core.writes)
+DB_SERIALIZE_WRITES = config('DB_SERIALIZE_WRITES', default=True, cast=bool)
@@ -12,6 +12,8 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from apps.core.views import MetricsView
+
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
@@ -25,6 +27,9 @@ urlpatterns = [
     path('api/users/', include('apps.users.urls')),
     path('api/vendors/', include('apps.vendors.urls')),
     path('api/products/', include('apps.products.urls')),
+
+    # Métricas de rendimiento (Prometheus)
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
 
 # Serve media files in development